@@ -14,6 +14,7 @@ arc = _drawBotDrawingTool.arc
 arcTo = _drawBotDrawingTool.arcTo
 baselineShift = _drawBotDrawingTool.baselineShift
 blendMode = _drawBotDrawingTool.blendMode
+cacheStats = _drawBotDrawingTool.cacheStats
 clipPath = _drawBotDrawingTool.clipPath
 closePath = _drawBotDrawingTool.closePath
 cmykFill = _drawBotDrawingTool.cmykFill
@@ -23,6 +24,7 @@ cmykShadow = _drawBotDrawingTool.cmykShadow
 cmykStroke = _drawBotDrawingTool.cmykStroke
 colorSpace = _drawBotDrawingTool.colorSpace
 curveTo = _drawBotDrawingTool.curveTo
+defineSymbol = _drawBotDrawingTool.defineSymbol
 drawPath = _drawBotDrawingTool.drawPath
 drawing = _drawBotDrawingTool.drawing
 endDrawing = _drawBotDrawingTool.endDrawing
@@ -50,8 +52,10 @@ imagePixelColor = _drawBotDrawingTool.imagePixelColor
 imageResolution = _drawBotDrawingTool.imageResolution
 imageSize = _drawBotDrawingTool.imageSize
 installFont = _drawBotDrawingTool.installFont
+installHyphenationPatterns = _drawBotDrawingTool.installHyphenationPatterns
 installedFonts = _drawBotDrawingTool.installedFonts
 language = _drawBotDrawingTool.language
+layoutText = _drawBotDrawingTool.layoutText
 line = _drawBotDrawingTool.line
 lineCap = _drawBotDrawingTool.lineCap
 lineDash = _drawBotDrawingTool.lineDash
@@ -77,9 +81,11 @@ numberOfPages = _drawBotDrawingTool.numberOfPages
 opacity = _drawBotDrawingTool.opacity
 openTypeFeatures = _drawBotDrawingTool.openTypeFeatures
 oval = _drawBotDrawingTool.oval
+pageCacheStats = _drawBotDrawingTool.pageCacheStats
 pageCount = _drawBotDrawingTool.pageCount
 pages = _drawBotDrawingTool.pages
 pdfImage = _drawBotDrawingTool.pdfImage
+placeSymbol = _drawBotDrawingTool.placeSymbol
 polygon = _drawBotDrawingTool.polygon
 printImage = _drawBotDrawingTool.printImage
 qCurveTo = _drawBotDrawingTool.qCurveTo
@@ -89,6 +95,7 @@ restore = _drawBotDrawingTool.restore
 rotate = _drawBotDrawingTool.rotate
 save = _drawBotDrawingTool.save
 saveImage = _drawBotDrawingTool.saveImage
+saveImages = _drawBotDrawingTool.saveImages
 savedState = _drawBotDrawingTool.savedState
 scale = _drawBotDrawingTool.scale
 shadow = _drawBotDrawingTool.shadow
@@ -103,6 +110,7 @@ text = _drawBotDrawingTool.text
 textBox = _drawBotDrawingTool.textBox
 textBoxBaselines = _drawBotDrawingTool.textBoxBaselines
 textBoxCharacterBounds = _drawBotDrawingTool.textBoxCharacterBounds
+textFlow = _drawBotDrawingTool.textFlow
 textOverflow = _drawBotDrawingTool.textOverflow
 textProperties = _drawBotDrawingTool.textProperties
 textSize = _drawBotDrawingTool.textSize
@@ -111,6 +119,7 @@ transform = _drawBotDrawingTool.transform
 translate = _drawBotDrawingTool.translate
 underline = _drawBotDrawingTool.underline
 uninstallFont = _drawBotDrawingTool.uninstallFont
+uninstallHyphenationPatterns = _drawBotDrawingTool.uninstallHyphenationPatterns
 url = _drawBotDrawingTool.url
 width = _drawBotDrawingTool.width
 writingDirection = _drawBotDrawingTool.writingDirection
@@ -1,5 +1,7 @@
 import math
 import os
+from array import array
+from collections import namedtuple
 from typing import Any, Self
 
 import AppKit  # type: ignore
@@ -16,9 +18,22 @@ from drawBot.aliases import (
     TransformTuple,
 )
 from drawBot.macOSVersion import macOSVersion
-from drawBot.misc import DrawBotError, cmyk2rgb, memoize, transformationAtCenter, validateLanguageCode, warnings
+from drawBot.misc import (
+    DrawBotError,
+    LRUCache,
+    cmyk2rgb,
+    memoize,
+    transformationAtCenter,
+    validateLanguageCode,
+    warnings,
+)
 
-from .tools import SFNTLayoutTypes, openType, variation
+from .tools import SFNTLayoutTypes, fontIndex, openType, variation
+from .tools.coverageIndex import CoverageIndex, FontCoverage
+from .tools.glyphOutlines import placeGlyphOutline
+from .tools.hyphenator import getHyphenator
+from .tools.pageCache import PageCache
+from .tools.pathData import CLOSEPATH, CURVETO, LINETO, MOVETO, PathData, segmentPointCount
 
 _FALLBACKFONT = "LucidaGrande"
 _LINEJOINSTYLESMAP = dict(
@@ -144,6 +159,135 @@ class BezierContour(list):
     )
 
 
+_nsBezierPathElementSegmentTypeMap = {
+    AppKit.NSMoveToBezierPathElement: MOVETO,
+    AppKit.NSLineToBezierPathElement: LINETO,
+    AppKit.NSCurveToBezierPathElement: CURVETO,
+    AppKit.NSClosePathBezierPathElement: CLOSEPATH,
+}
+
+_cgPathElementSegmentTypeMap = {
+    Quartz.kCGPathElementMoveToPoint: MOVETO,
+    Quartz.kCGPathElementAddLineToPoint: LINETO,
+    Quartz.kCGPathElementAddCurveToPoint: CURVETO,
+    Quartz.kCGPathElementCloseSubpath: CLOSEPATH,
+}
+
+
+# counts how often a BezierPath could reuse its converted CGPath
+_cgPathCacheStats = dict(hits=0, misses=0)
+
+
+def getCGPathCacheStats():
+    return dict(_cgPathCacheStats)
+
+
+def _pathDataToNSBezierPath(pathData):
+    nsBezierPath = AppKit.NSBezierPath.alloc().init()
+    for segmentType, points in pathData.elements():
+        if segmentType == MOVETO:
+            nsBezierPath.moveToPoint_(points[0])
+        elif segmentType == LINETO:
+            nsBezierPath.lineToPoint_(points[0])
+        elif segmentType == CURVETO:
+            nsBezierPath.curveToPoint_controlPoint1_controlPoint2_(points[2], points[0], points[1])
+        elif segmentType == CLOSEPATH:
+            nsBezierPath.closePath()
+    return nsBezierPath
+
+
+def _nsBezierPathToPathData(nsBezierPath):
+    segmentTypes = array("B")
+    coordinates = array("d")
+    for index in range(nsBezierPath.elementCount()):
+        instruction, points = nsBezierPath.elementAtIndex_associatedPoints_(index)
+        segmentType = _nsBezierPathElementSegmentTypeMap[instruction]
+        segmentTypes.append(segmentType)
+        for point in points[: segmentPointCount[segmentType]]:
+            coordinates.append(point.x)
+            coordinates.append(point.y)
+    return PathData(segmentTypes, coordinates)
+
+
+def _cgPathToPathData(cgPath):
+    segmentTypes = array("B")
+    coordinates = array("d")
+    # index in coordinates of the first point of the current subpath
+    subpathStart = [0]
+
+    def _addPoints(arg, element):
+        if element.type == Quartz.kCGPathElementAddQuadCurveToPoint:
+            # convert to a cubic curve
+            if segmentTypes[-1] == CLOSEPATH:
+                x0, y0 = coordinates[subpathStart[0]], coordinates[subpathStart[0] + 1]
+            else:
+                x0, y0 = coordinates[-2], coordinates[-1]
+            (x1, y1), (x2, y2) = element.points[0], element.points[1]
+            segmentTypes.append(CURVETO)
+            coordinates.extend(
+                (
+                    x0 + (x1 - x0) * 2 / 3,
+                    y0 + (y1 - y0) * 2 / 3,
+                    x2 + (x1 - x2) * 2 / 3,
+                    y2 + (y1 - y2) * 2 / 3,
+                    x2,
+                    y2,
+                )
+            )
+            return
+        segmentType = _cgPathElementSegmentTypeMap.get(element.type)
+        if segmentType is None:
+            return
+        if segmentType == MOVETO:
+            subpathStart[0] = len(coordinates)
+        segmentTypes.append(segmentType)
+        for i in range(segmentPointCount[segmentType]):
+            point = element.points[i]
+            coordinates.append(point.x)
+            coordinates.append(point.y)
+
+    Quartz.CGPathApply(cgPath, None, _addPoints)
+    return PathData(segmentTypes, coordinates)
+
+
+# glyph outlines in font units, keyed by the font and the glyph
+_glyphOutlineCache = LRUCache(maxSize=4096, name="glyphOutlines")
+
+
+def _glyphOutlineFontKey(font):
+    # an outline in font units is shared by all sizes of a font, the font file, the postscript name
+    # and the variation location identify the outline, return None when the outline can not be shared
+    if not Quartz.CGAffineTransformIsIdentity(CoreText.CTFontGetMatrix(font)):
+        return None
+    url = CoreText.CTFontCopyAttribute(font, CoreText.kCTFontURLAttribute)
+    if url is None:
+        return None
+    if "opsz" in variation.getVariationAxesForFont(font):
+        # the outline depends on the font size
+        return None
+    variations = CoreText.CTFontCopyVariation(font)
+    location = tuple(sorted(variations.items())) if variations else None
+    return url.path(), CoreText.CTFontCopyPostScriptName(font), location
+
+
+def getGlyphOutline(font, glyph, fontKey=None):
+    """
+    Return the outline of a glyph in font units as path data, the returned path data is cached and must not be changed.
+    """
+    if fontKey is None:
+        fontKey = _glyphOutlineFontKey(font)
+    key = (fontKey, glyph)
+    outline = _glyphOutlineCache.get(key) if fontKey is not None else None
+    if outline is None:
+        unitsPerEm = CoreText.CTFontGetUnitsPerEm(font)
+        unitsPerEmFont = CoreText.CTFontCreateCopyWithAttributes(font, unitsPerEm, None, None)
+        cgPath = CoreText.CTFontCreatePathForGlyph(unitsPerEmFont, glyph, None)
+        outline = PathData() if cgPath is None else _cgPathToPathData(cgPath)
+        if fontKey is not None:
+            _glyphOutlineCache.set(key, outline)
+    return outline
+
+
 class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
     """
     Return a BezierPath object.
@@ -203,6 +347,10 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
 
     contourClass = BezierContour
 
+    # bookkeeping attributes, not part of the geometry
+    # the page cache only hashes the path data, the NSBezierPath is built lazily
+    _unhashedAttributes = ("_nsBezierPath", "_sharedPathData", "_version", "_cgPathCache")
+
     _instructionSegmentTypeMap = {
         AppKit.NSMoveToBezierPathElement: "move",
         AppKit.NSLineToBezierPathElement: "line",
@@ -210,15 +358,74 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
     }
 
     def __init__(self, path=None, glyphSet=None):
+        # the geometry is stored as path data, a NSBezierPath is only build when required
+        # at least one of both is always set, both are set when they are equal
         if path is None:
-            self._path = AppKit.NSBezierPath.alloc().init()
+            self._pathData = PathData()
+            self._nsBezierPath = None
         else:
-            self._path = path
+            self._pathData = None
+            self._nsBezierPath = path
+        # copies share the path data until one of them changes it
+        self._sharedPathData = False
+        # increased on every change of the geometry
+        self._version = 0
+        # a (version, CGPath) tuple, the CGPath is valid as long as the version is unchanged
+        self._cgPathCache = None
         BasePen.__init__(self, glyphSet)
 
     def __repr__(self):
         return "<BezierPath>"
 
+    # path storage
+
+    def _getNSBezierPathForReading(self):
+        if self._nsBezierPath is None:
+            self._nsBezierPath = _pathDataToNSBezierPath(self._pathData)
+        return self._nsBezierPath
+
+    def _getPathData(self):
+        if self._pathData is None:
+            self._pathData = _nsBezierPathToPathData(self._nsBezierPath)
+        return self._pathData
+
+    def _setPathData(self, pathData):
+        self._pathData = pathData
+        self._nsBezierPath = None
+        self._sharedPathData = False
+        self._version += 1
+
+    def _getHashState(self):
+        # the geometry is hashed as path data, also when the path is built with the NSBezierPath
+        self._getPathData()
+        return vars(self)
+
+    def _editPathData(self):
+        pathData = self._getPathData()
+        if self._sharedPathData:
+            # copy on write
+            pathData = self._pathData = pathData.copy()
+            self._sharedPathData = False
+        self._nsBezierPath = None
+        self._version += 1
+        return pathData
+
+    def _get_path(self):
+        # the NSBezierPath can be changed by the caller, the path data is not valid anymore
+        nsBezierPath = self._getNSBezierPathForReading()
+        self._pathData = None
+        self._sharedPathData = False
+        self._version += 1
+        return nsBezierPath
+
+    def _set_path(self, nsBezierPath):
+        self._nsBezierPath = nsBezierPath
+        self._pathData = None
+        self._sharedPathData = False
+        self._version += 1
+
+    _path = property(_get_path, _set_path)
+
     # pen support
 
     def moveTo(self, point: Point):
@@ -228,7 +435,8 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         super(BezierPath, self).moveTo(point)
 
     def _moveTo(self, pt):
-        self._path.moveToPoint_(pt)
+        x, y = pt
+        self._editPathData().moveTo(x, y)
 
     def lineTo(self, point: Point):
         """
@@ -237,7 +445,8 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         super(BezierPath, self).lineTo(point)
 
     def _lineTo(self, pt):
-        self._path.lineToPoint_(pt)
+        x, y = pt
+        self._editPathData().lineTo(x, y)
 
     def curveTo(self, *points: Point):
         """
@@ -262,13 +471,14 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         Curve to a point `x3`, `y3`.
         With given bezier handles `x1`, `y1` and `x2`, `y2`.
         """
-        self._path.curveToPoint_controlPoint1_controlPoint2_(pt3, pt1, pt2)
+        (x1, y1), (x2, y2), (x3, y3) = pt1, pt2, pt3
+        self._editPathData().curveTo(x1, y1, x2, y2, x3, y3)
 
     def closePath(self) -> None:
         """
         Close the path.
         """
-        self._path.closePath()
+        self._editPathData().closePath()
 
     def beginPath(self, identifier: str | None = None) -> None:
         """
@@ -377,7 +587,12 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         """
         Add a rectangle at possition `x`, `y` with a size of `w`, `h`
         """
-        self._path.appendBezierPathWithRect_(((x, y), (w, h)))
+        pathData = self._editPathData()
+        pathData.moveTo(x, y)
+        pathData.lineTo(x + w, y)
+        pathData.lineTo(x + w, y + h)
+        pathData.lineTo(x, y + h)
+        pathData.closePath()
 
     def oval(self, x: float, y: float, w: float, h: float):
         """
@@ -443,9 +658,13 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
             x, y = offset
         else:
             x = y = 0
-        for subTxt, box in makeTextBoxes(
-            attributedString, (x, y), align=align, plainText=not isinstance(txt, FormattedString)
-        ):
+        plainText = not isinstance(txt, FormattedString)
+        if isSingleLineText(attributedString.string()):
+            textBox = makeTextBox(attributedString, (x, y), align=align, plainText=plainText)
+            textBoxes = [textBox] if textBox else []
+        else:
+            textBoxes = makeTextBoxes(attributedString, (x, y), align=align, plainText=plainText)
+        for subTxt, box in textBoxes:
             self.textBox(subTxt, box, font=font, fontSize=fontSize, align=align)
 
     def textBox(
@@ -480,14 +699,13 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         context.font(font, fontSize, fontNumber)
         context.hyphenation(hyphenation)
 
-        path, (x, y) = context._getPathForFrameSetter(box)
-        attributedString = context.attributedString(txt, align)
-
-        setter = newFramesetterWithAttributedString(attributedString)
-        frame = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
-        ctLines = CoreText.CTFrameGetLines(frame)
-        origins = CoreText.CTFrameGetLineOrigins(frame, (0, len(ctLines)), None)
+        layout = context.layoutText(txt, box, align)
+        textFrame = layout._textFrame
+        x, y = textFrame.origin
+        ctLines = textFrame.lines
+        origins = textFrame.lineOrigins
 
+        pathData = self._editPathData()
         for i, (originX, originY) in enumerate(origins):
             ctLine = ctLines[i]
             ctRuns = CoreText.CTLineGetGlyphRuns(ctLine)
@@ -496,14 +714,27 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
                 font = attributes.get(AppKit.NSFontAttributeName)
                 baselineShift = attributes.get(AppKit.NSBaselineOffsetAttributeName, 0)
                 glyphCount = CoreText.CTRunGetGlyphCount(ctRun)
-                for i in range(glyphCount):
-                    glyph = CoreText.CTRunGetGlyphs(ctRun, (i, 1), None)[0]
-                    ax, ay = CoreText.CTRunGetPositions(ctRun, (i, 1), None)[0]
-                    if glyph:
-                        self._path.moveToPoint_((x + originX + ax, y + originY + ay + baselineShift))
-                        self._path.appendBezierPathWithGlyph_inFont_(glyph, font)
+                glyphs = CoreText.CTRunGetGlyphs(ctRun, (0, glyphCount), None)
+                positions = CoreText.CTRunGetPositions(ctRun, (0, glyphCount), None)
+                # place the cached outlines in font units
+                fontKey = _glyphOutlineFontKey(font)
+                fontSize = font.pointSize()
+                unitsPerEm = CoreText.CTFontGetUnitsPerEm(font)
+                for glyph, (ax, ay) in zip(glyphs, positions):
+                    if not glyph:
+                        continue
+                    glyphX = x + originX + ax
+                    glyphY = y + originY + ay + baselineShift
+                    if fontKey is None:
+                        glyphPath = AppKit.NSBezierPath.bezierPath()
+                        glyphPath.moveToPoint_((glyphX, glyphY))
+                        glyphPath.appendBezierPathWithGlyph_inFont_(glyph, font)
+                        pathData.extend(_nsBezierPathToPathData(glyphPath))
+                    else:
+                        outline = getGlyphOutline(font, glyph, fontKey)
+                        placeGlyphOutline(pathData, outline, fontSize, unitsPerEm, glyphX, glyphY)
         self.optimizePath()
-        return context.clippedText(txt, box, align)
+        return layout.overflow
 
     def traceImage(
         self,
@@ -538,37 +769,30 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         return self._path
 
     def _getCGPath(self):
+        # the returned CGPath is cached, it must not be changed
+        cache = self._cgPathCache
+        if cache is not None and cache[0] == self._version:
+            _cgPathCacheStats["hits"] += 1
+            return cache[1]
+        _cgPathCacheStats["misses"] += 1
         path = Quartz.CGPathCreateMutable()
-        count = self._path.elementCount()
-        for i in range(count):
-            instruction, points = self._path.elementAtIndex_associatedPoints_(i)
-            if instruction == AppKit.NSMoveToBezierPathElement:
-                Quartz.CGPathMoveToPoint(path, None, points[0].x, points[0].y)
-            elif instruction == AppKit.NSLineToBezierPathElement:
-                Quartz.CGPathAddLineToPoint(path, None, points[0].x, points[0].y)
-            elif instruction == AppKit.NSCurveToBezierPathElement:
-                Quartz.CGPathAddCurveToPoint(
-                    path, None, points[0].x, points[0].y, points[1].x, points[1].y, points[2].x, points[2].y
-                )
-            elif instruction == AppKit.NSClosePathBezierPathElement:
+        for segmentType, points in self._getPathData().elements():
+            if segmentType == MOVETO:
+                Quartz.CGPathMoveToPoint(path, None, *points[0])
+            elif segmentType == LINETO:
+                Quartz.CGPathAddLineToPoint(path, None, *points[0])
+            elif segmentType == CURVETO:
+                (x1, y1), (x2, y2), (x3, y3) = points
+                Quartz.CGPathAddCurveToPoint(path, None, x1, y1, x2, y2, x3, y3)
+            elif segmentType == CLOSEPATH:
                 Quartz.CGPathCloseSubpath(path)
+        self._cgPathCache = (self._version, path)
         return path
 
     def _setCGPath(self, cgpath):
-        self._path = AppKit.NSBezierPath.alloc().init()
-
-        def _addPoints(arg, element):
-            instruction, points = element.type, element.points
-            if instruction == Quartz.kCGPathElementMoveToPoint:
-                self._path.moveToPoint_(points[0])
-            elif instruction == Quartz.kCGPathElementAddLineToPoint:
-                self._path.lineToPoint_(points[0])
-            elif instruction == Quartz.kCGPathElementAddCurveToPoint:
-                self._path.curveToPoint_controlPoint1_controlPoint2_(points[2], points[0], points[1])
-            elif instruction == Quartz.kCGPathElementCloseSubpath:
-                self._path.closePath()
-
-        Quartz.CGPathApply(cgpath, None, _addPoints)
+        self._setPathData(_cgPathToPathData(cgpath))
+        # converting back to a CGPath is not required
+        self._cgPathCache = (self._version, cgpath)
 
     def setNSBezierPath(self, path: AppKit.NSBezierPath):
         """
@@ -581,7 +805,7 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         Check if a point `x`, `y` is inside a path.
         """
         x, y = xy
-        return self._path.containsPoint_((x, y))
+        return self._getNSBezierPathForReading().containsPoint_((x, y))
 
     def bounds(self) -> BoundingBox | None:
         """
@@ -589,10 +813,7 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         `(x minimum, y minimum, x maximum, y maximum)`` or,
         in the case of empty path `None`.
         """
-        if self._path.isEmpty():
-            return None
-        (x, y), (w, h) = self._path.bounds()
-        return x, y, x + w, y + h
+        return self._getPathData().bounds()
 
     def controlPointBounds(self) -> BoundingBox | None:
         """
@@ -600,33 +821,31 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         in the form `(x minimum, y minimum, x maximum, y maximum)`` or,
         in the case of empty path `None`.
         """
-        (x, y), (w, h) = self._path.controlPointBounds()
-        return x, y, x + w, y + h
+        bounds = self._getPathData().controlPointBounds()
+        if bounds is None:
+            return 0, 0, 0, 0
+        return bounds
 
     def optimizePath(self) -> None:
-        count = self._path.elementCount()
-        if not count or self._path.elementAtIndex_(count - 1) != AppKit.NSMoveToBezierPathElement:
-            return
-        optimizedPath = AppKit.NSBezierPath.alloc().init()
-        for i in range(count - 1):
-            instruction, points = self._path.elementAtIndex_associatedPoints_(i)
-            if instruction == AppKit.NSMoveToBezierPathElement:
-                optimizedPath.moveToPoint_(*points)
-            elif instruction == AppKit.NSLineToBezierPathElement:
-                optimizedPath.lineToPoint_(*points)
-            elif instruction == AppKit.NSCurveToBezierPathElement:
-                p1, p2, p3 = points
-                optimizedPath.curveToPoint_controlPoint1_controlPoint2_(p3, p1, p2)
-            elif instruction == AppKit.NSClosePathBezierPathElement:
-                optimizedPath.closePath()
-        self._path = optimizedPath
+        pathData = self._getPathData()
+        if pathData.segmentTypes and pathData.segmentTypes[-1] == MOVETO:
+            self._editPathData().removeTrailingMoveTo()
 
     def copy(self) -> Self:
         """
         Copy the bezier path.
         """
         new = self.__class__()
-        new._path = self._path.copy()
+        if self._pathData is not None:
+            # share the path data until one of both paths changes
+            # the NSBezierPath is not shared, it could be changed by the caller
+            new._pathData = self._pathData
+            new._sharedPathData = self._sharedPathData = True
+        else:
+            new._pathData = None
+            new._nsBezierPath = self._nsBezierPath.copy()
+        if self._cgPathCache is not None and self._cgPathCache[0] == self._version:
+            new._cgPathCache = (new._version, self._cgPathCache[1])
         new.copyContextProperties(self)
         return new
 
@@ -640,7 +859,7 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         """
         Append a path.
         """
-        self._path.appendBezierPath_(otherPath.getNSBezierPath())
+        self._editPathData().extend(otherPath._getPathData())
 
     def __add__(self, otherPath: Self) -> Self:
         new = self.copy()
@@ -698,9 +917,50 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         """
         if center != (0, 0):
             transformMatrix = transformationAtCenter(transformMatrix, center)
-        aT = AppKit.NSAffineTransform.alloc().init()
-        aT.setTransformStruct_(transformMatrix[:])
-        self._path.transformUsingAffineTransform_(aT)
+        self._editPathData().transform(transformMatrix)
+
+    @classmethod
+    def transformMany(
+        cls, paths: Self | list[Self], transformMatrices: list[TransformTuple], center: Point = (0, 0)
+    ) -> list[Self]:
+        """
+        Return a list of transformed copies, one for each transform matrix (xy, xx, yy, yx, x, y).
+
+        `paths` can be a single bezier path, transformed by each matrix,
+        or a list of bezier paths with the same length as the list of transform matrices.
+
+        This is a lot faster than copying and transforming each path.
+
+        .. downloadcode:: bezierPathTransformMany.py
+
+            path = BezierPath()
+            path.rect(0, 0, 20, 20)
+            matrices = [(1, 0, 0, 1, x * 50, y * 50) for x in range(10) for y in range(10)]
+            for tile in BezierPath.transformMany(path, matrices):
+                drawPath(tile)
+        """
+        if center != (0, 0):
+            transformMatrices = [
+                transformationAtCenter(transformMatrix, center) for transformMatrix in transformMatrices
+            ]
+        if isinstance(paths, BezierPath):
+            sourcePaths = [paths] * len(transformMatrices)
+            pathDatas = paths._getPathData().transformMany(transformMatrices)
+        else:
+            sourcePaths = list(paths)
+            if len(sourcePaths) != len(transformMatrices):
+                raise DrawBotError("transformMany() expects the same amount of paths and transform matrices")
+            pathDatas = [
+                path._getPathData().transformMany([transformMatrix])[0]
+                for path, transformMatrix in zip(sourcePaths, transformMatrices)
+            ]
+        result = []
+        for sourcePath, pathData in zip(sourcePaths, pathDatas):
+            new = sourcePath.__class__()
+            new._setPathData(pathData)
+            new.copyContextProperties(sourcePath)
+            result.append(new)
+        return result
 
     # boolean operations
 
@@ -735,7 +995,7 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
         contours = self._contoursForBooleanOperations()
         result = self.__class__()
         booleanOperations.union(contours, result)
-        self.setNSBezierPath(result.getNSBezierPath())
+        self._setPathData(result._getPathData())
         return self
 
     def difference(self, other: Self) -> Self:
@@ -837,7 +1097,7 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
 
     def __imod__(self, other: Self) -> Self:
         result = self.difference(other)
-        self.setNSBezierPath(result.getNSBezierPath())
+        self._setPathData(result._getPathData())
         return self
 
     def __or__(self, other: Self) -> Self:
@@ -847,7 +1107,7 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
 
     def __ior__(self, other: Self) -> Self:
         result = self.union(other)
-        self.setNSBezierPath(result.getNSBezierPath())
+        self._setPathData(result._getPathData())
         return self
 
     def __and__(self, other: Self) -> Self:
@@ -857,7 +1117,7 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
 
     def __iand__(self, other: Self) -> Self:
         result = self.intersection(other)
-        self.setNSBezierPath(result.getNSBezierPath())
+        self._setPathData(result._getPathData())
         return self
 
     def __xor__(self, other: Self) -> Self:
@@ -867,21 +1127,13 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
 
     def __ixor__(self, other: Self) -> Self:
         result = self.xor(other)
-        self.setNSBezierPath(result.getNSBezierPath())
+        self._setPathData(result._getPathData())
         return self
 
     def _points(self, onCurve=True, offCurve=True):
-        points = []
         if not onCurve and not offCurve:
-            return points
-        for index in range(self._path.elementCount()):
-            instruction, pts = self._path.elementAtIndex_associatedPoints_(index)
-            if not onCurve:
-                pts = pts[:-1]
-            elif not offCurve:
-                pts = pts[-1:]
-            points.extend([(p.x, p.y) for p in pts])
-        return tuple(points)
+            return []
+        return self._getPathData().points(onCurve=onCurve, offCurve=offCurve)
 
     def _get_points(self):
         return self._points()
@@ -908,14 +1160,10 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
 
     def _get_contours(self):
         contours = []
-        for index in range(self._path.elementCount()):
-            instruction, pts = self._path.elementAtIndex_associatedPoints_(index)
-            if instruction == AppKit.NSMoveToBezierPathElement:
-                contours.append(self.contourClass())
-            if instruction == AppKit.NSClosePathBezierPathElement:
-                contours[-1].open = False
-            if pts:
-                contours[-1].append([(p.x, p.y) for p in pts])
+        for segments, isOpen in self._getPathData().contours():
+            contour = self.contourClass(segments)
+            contour.open = isOpen
+            contours.append(contour)
         if len(contours) >= 2 and len(contours[-1]) == 1 and contours[-1][0] == contours[-2][0]:
             contours.pop()
         return tuple(contours)
@@ -941,6 +1189,19 @@ class BezierPath(BasePen, SVGContextPropertyMixin, ContextPropertyMixin):
             index += 1
 
 
+class Symbol:
+    """
+    A path with the graphics state at the moment of `defineSymbol()`.
+    A context writes the symbol once and refers to it for every `placeSymbol()`.
+    """
+
+    def __init__(self, path):
+        self.path = path.copy()
+
+    def __repr__(self):
+        return "<Symbol %s>" % id(self)
+
+
 class Color:
     colorSpace = AppKit.NSColorSpace.genericRGBColorSpace()
 
@@ -1067,25 +1328,84 @@ class Gradient:
         return new
 
 
-def makeTextBoxes(attributedString, xy, align, plainText):
-    extraPadding = 20
+_textBoxPadding = 20
+
+# characters ending a line in a text drawn at a position
+_lineBreakCharacters = frozenset("\n\r\x85\u2028\u2029")
+
+
+def isSingleLineText(txt):
+    return _lineBreakCharacters.isdisjoint(txt)
+
+
+def alignAttributedString(attributedString, align):
+    # overwrite all align settings in each paragraph style
+    attributedString = attributedString.mutableCopy()
+
+    def block(value, rng, stop):
+        value = value.mutableCopy()
+        value.setAlignment_(FormattedString._textAlignMap[align])
+        attributedString.addAttribute_value_range_(AppKit.NSParagraphStyleAttributeName, value, rng)
+
+    attributedString.enumerateAttribute_inRange_options_usingBlock_(
+        AppKit.NSParagraphStyleAttributeName, (0, len(attributedString)), 0, block
+    )
+    return attributedString
+
+
+def _alignedOriginX(attributedString, width):
+    para, _ = attributedString.attribute_atIndex_effectiveRange_(AppKit.NSParagraphStyleAttributeName, 0, None)
+    if para is not None:
+        if para.alignment() == AppKit.NSTextAlignmentCenter:
+            return -width * 0.5
+        elif para.alignment() == AppKit.NSTextAlignmentRight:
+            return -width
+    return 0
+
+
+def _firstLineOriginY(setter, stringRange, box):
+    path = Quartz.CGPathCreateMutable()
+    Quartz.CGPathAddRect(path, None, Quartz.CGRectMake(*box))
+    frame = CoreText.CTFramesetterCreateFrame(setter, stringRange, path, None)
+    origins = CoreText.CTFrameGetLineOrigins(frame, (0, 1), None)
+    if origins:
+        return origins[0].y
+    return None
+
+
+def makeTextBox(attributedString, xy, align, plainText):
+    """
+    Return a `(substring, box)` tuple for a text without line breaks, with the baseline at the given position.
+    Returns None for an empty text.
+    """
+    if not attributedString.length():
+        return None
     x, y = xy
     w, h = attributedString.size()
-    w += extraPadding
-
+    width = w + _textBoxPadding
     if align is not None:
-        attributedString = attributedString.mutableCopy()
+        attributedString = alignAttributedString(attributedString, align)
+    setter = newFramesetterWithAttributedString(attributedString)
+    originY = _firstLineOriginY(setter, (0, 0), (x, y, width, h * 2))
+    if originY is None:
+        return None
+    if plainText:
+        substring = attributedString.string()
+    else:
+        substring = FormattedString()
+        substring.getNSObject().appendAttributedString_(attributedString)
+    return substring, (x + _alignedOriginX(attributedString, width), y - originY, width, h * 2)
 
-        # overwrite all align settings in each paragraph style
-        def block(value, rng, stop):
-            value = value.mutableCopy()
-            value.setAlignment_(FormattedString._textAlignMap[align])
-            attributedString.addAttribute_value_range_(AppKit.NSParagraphStyleAttributeName, value, rng)
 
-        attributedString.enumerateAttribute_inRange_options_usingBlock_(
-            AppKit.NSParagraphStyleAttributeName, (0, len(attributedString)), 0, block
-        )
+def makeTextBoxes(attributedString, xy, align, plainText):
+    x, y = xy
+    w, h = attributedString.size()
+    w += _textBoxPadding
 
+    if align is not None:
+        attributedString = alignAttributedString(attributedString, align)
+
+    # typeset the text once, each line is a frame of the same framesetter
     setter = newFramesetterWithAttributedString(attributedString)
     path = Quartz.CGPathCreateMutable()
     Quartz.CGPathAddRect(path, None, Quartz.CGRectMake(x, y, w, h * 2))
@@ -1103,18 +1423,12 @@ def makeTextBoxes(attributedString, xy, align, plainText):
         rng = CoreText.CTLineGetStringRange(ctLine)
 
         attributedSubstring = attributedString.attributedSubstringFromRange_(rng)
-        para, _ = attributedSubstring.attribute_atIndex_effectiveRange_(AppKit.NSParagraphStyleAttributeName, 0, None)
 
         width, height = attributedSubstring.size()
 
         if attributedSubstring.length() > 0:
-            width += extraPadding
-            originX = 0
-            if para is not None:
-                if para.alignment() == AppKit.NSTextAlignmentCenter:
-                    originX -= width * 0.5
-                elif para.alignment() == AppKit.NSTextAlignmentRight:
-                    originX = -width
+            width += _textBoxPadding
+            originX = _alignedOriginX(attributedSubstring, width)
 
             if attributedSubstring.string()[-1] in ["\n", "\r"]:
                 attributedSubstring = attributedSubstring.mutableCopy()
@@ -1132,14 +1446,10 @@ def makeTextBoxes(attributedString, xy, align, plainText):
                 box = (lineX, lineY, width, h * 2)
             else:
                 lineY = y + originY + firstLineJump - h * 2
-                subSetter = newFramesetterWithAttributedString(attributedSubstring)
-                subPath = Quartz.CGPathCreateMutable()
-                Quartz.CGPathAddRect(subPath, None, Quartz.CGRectMake(lineX, lineY, w, h * 2))
-                subFrame = CoreText.CTFramesetterCreateFrame(subSetter, (0, 0), subPath, None)
-                subOrigins = CoreText.CTFrameGetLineOrigins(subFrame, (0, 1), None)
-                if subOrigins:
-                    subOriginY = subOrigins[0].y
-                else:
+                # every line starts a paragraph, a frame starting at the line
+                # places the line as if it was typesetted on its own
+                subOriginY = _firstLineOriginY(setter, (rng.location, rng.length), (lineX, lineY, w, h * 2))
+                if subOriginY is None:
                     continue
 
                 box = (lineX, lineY - subOriginY, width, h * 2)
@@ -1151,6 +1461,219 @@ def makeTextBoxes(attributedString, xy, align, plainText):
     return boxes
 
 
+# typesetted text frames, keyed by the attributed string, the box and the hyphenation setting
+_textFrameCache = LRUCache(maxSize=128, name="textLayout")
+
+
+# hyphenation indexes for each word and language
+_hyphenationCache = LRUCache(maxSize=4096, name="hyphenation")
+
+# a single immutable attributed string and framesetter for each flowing text
+_textFlowCache = LRUCache(maxSize=16, name="textFlow")
+
+
+def getTextLayoutCacheStats():
+    return _textFrameCache.stats()
+
+
+def getHyphenationCacheStats():
+    return _hyphenationCache.stats()
+
+
+CharactersBounds = namedtuple("CharactersBounds", ["bounds", "baselineOffset", "formattedSubString"])
+
+
+class TextFrame:
+    """
+    A typesetted attributed string in a box, independent of the text object it was created from.
+    All CoreText objects are created when they are requested for the first time.
+
+    A frame of a text flow shares the `framesetter` of the whole text and starts at the `start` index.
+    """
+
+    def __init__(self, attributedString, path, origin, sourceText=None, framesetter=None, start=0, offset=0):
+        # the (hyphenated) attributed string that is typesetted
+        self.attributedString = attributedString
+        self.path = path
+        self.origin = origin
+        # the text before hyphenation, used to map the visible range back to the source text
+        self._sourceText = sourceText
+        self._framesetter = framesetter
+        self.start = start
+        # the index in the source text of the first character of the attributed string
+        self.offset = offset
+        self._frame = None
+        self._lines = None
+        self._lineOrigins = None
+        self._clipIndex = None
+        self._runBounds = None
+        self._sourceIndexes = None
+
+    @property
+    def location(self):
+        # the index in the source text of the first character in the frame
+        return self.offset + self.start
+
+    @property
+    def framesetter(self):
+        if self._framesetter is None:
+            self._framesetter = newFramesetterWithAttributedString(self.attributedString)
+        return self._framesetter
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            self._frame = CoreText.CTFramesetterCreateFrame(self.framesetter, (self.start, 0), self.path, None)
+        return self._frame
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = CoreText.CTFrameGetLines(self.frame)
+        return self._lines
+
+    @property
+    def lineOrigins(self):
+        # line origins relative to the origin of the box
+        if self._lineOrigins is None:
+            self._lineOrigins = CoreText.CTFrameGetLineOrigins(self.frame, (0, len(self.lines)), None)
+        return self._lineOrigins
+
+    @property
+    def clipIndex(self):
+        # the index in the source text of the first character that does not fit
+        if self._clipIndex is None:
+            visibleRange = CoreText.CTFrameGetVisibleStringRange(self.frame)
+            clip = visibleRange.location + visibleRange.length
+            if self._sourceText is not None:
+                # remove the inserted hyphens
+                subString = self.attributedString.string()[:clip]
+                for i, c in enumerate(self._sourceText):
+                    if c != "-":
+                        continue
+                    if i < clip:
+                        clip += 1
+                    else:
+                        break
+                clip -= subString.count("-")
+            self._clipIndex = self.offset + clip
+        return self._clipIndex
+
+    def sourceIndex(self, index):
+        # the index in the source text of an index in the typesetted attributed string
+        if self._sourceText is None:
+            return self.offset + index
+        if self._sourceIndexes is None:
+            # the hyphenated text is the source text with inserted hyphens,
+            # an inserted hyphen maps to the index of the next character in the source text
+            sourceText = self._sourceText
+            sourceLength = len(sourceText)
+            sourceIndexes = array("I")
+            sourceIndex = 0
+            for c in self.attributedString.string():
+                sourceIndexes.append(sourceIndex)
+                if sourceIndex < sourceLength and c == sourceText[sourceIndex]:
+                    sourceIndex += 1
+            sourceIndexes.append(sourceIndex)
+            self._sourceIndexes = sourceIndexes
+        return self.offset + self._sourceIndexes[index]
+
+    @property
+    def runBounds(self):
+        # a list of (bounds, ascent, stringRange) for each run, the string range is a range in the source text
+        if self._runBounds is None:
+            x, y = self.origin
+            self._runBounds = []
+            for ctLine, (originX, originY) in zip(self.lines, self.lineOrigins):
+                for ctRun in CoreText.CTLineGetGlyphRuns(ctLine):
+                    runRange = CoreText.CTRunGetStringRange(ctRun)
+                    location = self.sourceIndex(runRange.location)
+                    runPos = CoreText.CTRunGetPositions(ctRun, (0, 1), None)[0]
+                    runW, runH, ascent, descent = CoreText.CTRunGetTypographicBounds(ctRun, (0, 0), None, None, None)
+                    self._runBounds.append(
+                        (
+                            (x + originX + runPos.x, y + originY + runPos.y - ascent, runW, runH + ascent),
+                            ascent,
+                            (location, self.sourceIndex(runRange.location + runRange.length) - location),
+                        )
+                    )
+        return self._runBounds
+
+
+class TextLayout:
+    """
+    The result of typesetting a text in a box, see `layoutText(..)`.
+    """
+
+    def __init__(self, txt, textFrame):
+        self.txt = txt
+        self._textFrame = textFrame
+
+    @property
+    def frame(self):
+        """
+        The CoreText frame.
+        """
+        return self._textFrame.frame
+
+    @property
+    def lines(self):
+        """
+        A list of CoreText lines.
+        """
+        return self._textFrame.lines
+
+    @property
+    def origins(self):
+        """
+        A list of `x, y` coordinates indicating the start of each line.
+        """
+        x, y = self._textFrame.origin
+        return [(x + o.x, y + o.y) for o in self._textFrame.lineOrigins]
+
+    @property
+    def range(self):
+        """
+        The range of the text in the box as a `(location, length)` tuple.
+        """
+        location = self._textFrame.location
+        return location, self._textFrame.clipIndex - location
+
+    @property
+    def overflow(self):
+        """
+        The text that does not fit in the box.
+        """
+        return self.txt[self._textFrame.clipIndex :]
+
+    @property
+    def characterBounds(self):
+        """
+        A list of typesetted bounding boxes `((x, y, w, h), baseLineOffset, formattedSubString)`.
+        """
+        return [
+            CharactersBounds(bounds, ascent, self.txt[location : location + length])
+            for bounds, ascent, (location, length) in self._textFrame.runBounds
+        ]
+
+
+# interned text attributes and fonts for FormattedString runs with equal settings
+_textAttributesCache = LRUCache(maxSize=1024, name="textAttributes")
+_textFontCache = LRUCache(maxSize=256, name="textFonts")
+
+
+def getTextAttributesCacheStats():
+    return dict(attributes=_textAttributesCache.stats(), fonts=_textFontCache.stats())
+
+
+def _makeHashable(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, _makeHashable(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_makeHashable(item) for item in value)
+    return value
+
+
 class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
     """
     Return a string object that can handle text formatting.
@@ -1228,6 +1751,9 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
 
     _writingDirectionMap = dict(LTR=AppKit.NSWritingDirectionLeftToRight, RTL=AppKit.NSWritingDirectionRightToLeft)
 
+    # attributes that can be a font path, the page cache includes the modification date of the font file
+    _pathAttributes = ("_font", "_fallbackFont")
+
     _formattedAttributes: dict[str, Any] = dict(
         font=_FALLBACKFONT,
         fallbackFont=None,
@@ -1391,57 +1917,130 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             return
         elif not isinstance(txt, (str, FormattedString)):
             raise TypeError("expected 'str' or 'FormattedString', got '%s'" % type(txt).__name__)
+        txt = AppKit.NSAttributedString.alloc().initWithString_attributes_(txt, self._getNSAttributes())
+        self._attributedString.appendAttributedString_(txt)
+
+    def _getNSAttributes(self, paragraphStyles=None):
+        # return the attributes for a NSAttributedString with the current settings
+        # optionally paragraphStyles is a dict to reuse equal paragraph styles
+        properties = self.textProperties()
+        try:
+            key = _makeHashable((type(self), self._colorClass.colorSpace, properties))
+            hash(key)
+        except TypeError:
+            key = None
+        if key is not None:
+            cached = _textAttributesCache.get(key)
+            if cached is not None:
+                nsAttributes, tabs, missingFeatures = cached
+                # building the attributes completes the tab stops
+                self._tabs = list(tabs) if tabs is not None else None
+                # warn for every run, also when the attributes come from the cache
+                self._warnMissingFeatures(missingFeatures)
+                return nsAttributes
+        attributes = self._makeNSAttributes(properties, paragraphStyles)
+        nsAttributes = AppKit.NSDictionary.dictionaryWithDictionary_(attributes)
+        if key is not None:
+            missingFeatures = self._getCachedNSFontWithFeatures()[2] if self._openTypeFeatures else []
+            _textAttributesCache.set(
+                key, (nsAttributes, list(self._tabs) if self._tabs is not None else None, missingFeatures)
+            )
+        return nsAttributes
+
+    def _getNSFontWithFeatures(self):
+        # return the font with all OpenType features, font variations and the fallback font,
+        # and whether kerning must be disabled
+        font, disableKerning, missingFeatures = self._getCachedNSFontWithFeatures()
+        # warn for every run, also when the font comes from the cache
+        self._warnMissingFeatures(missingFeatures)
+        return font, disableKerning
+
+    def _warnMissingFeatures(self, missingFeatures):
+        for featureTag in missingFeatures:
+            warnings.warn("OpenType feature '%s' not available for '%s'" % (featureTag, self._font))
+
+    def _getCachedNSFontWithFeatures(self):
+        try:
+            key = _makeHashable(
+                (
+                    self._font,
+                    self._fontSize,
+                    self._fontNumber,
+                    self._fallbackFont,
+                    self._fallbackFontNumber,
+                    self._openTypeFeatures,
+                    self._fontVariations,
+                )
+            )
+            hash(key)
+        except TypeError:
+            key = None
+        if key is not None:
+            cached = _textFontCache.get(key)
+            if cached is not None:
+                return cached
+        font = self._getNSFontWithFallback()
+        disableKerning = False
+        missingFeatures = []
+        coreTextFontFeatures = []
+        nsFontFeatures = []  # fallback for macOS < 10.13
+        if self._openTypeFeatures:
+            # get existing openTypeFeatures for the font
+            existingOpenTypeFeatures = openType.getFeatureTagsForFont(font)
+            # sort features by their on/off state
+            # set all disabled features first
+            orderedOpenTypeFeatures = sorted(self._openTypeFeatures.items(), key=lambda kv: kv[1])
+            for featureTag, value in orderedOpenTypeFeatures:
+                if value and featureTag not in existingOpenTypeFeatures:
+                    # only warn when the feature is on and not existing for the current font
+                    missingFeatures.append(featureTag)
+                feature = dict(CTFeatureOpenTypeTag=featureTag, CTFeatureOpenTypeValue=value)
+                coreTextFontFeatures.append(feature)
+                # The next lines are a fallback for macOS < 10.13
+                nsFontFeatureTag = featureTag
+                if not value:
+                    nsFontFeatureTag = "%s_off" % featureTag
+                if nsFontFeatureTag in SFNTLayoutTypes.featureMap:
+                    feature = SFNTLayoutTypes.featureMap[nsFontFeatureTag]
+                    nsFontFeatures.append(feature)
+                # kern is a special case
+                if featureTag == "kern" and not value:
+                    # https://developer.apple.com/documentation/uikit/nskernattributename
+                    # The value 0 means kerning is disabled.
+                    disableKerning = True
+
+        fontAttributes = {}
+        if coreTextFontFeatures:
+            fontAttributes[CoreText.kCTFontFeatureSettingsAttribute] = coreTextFontFeatures
+            if macOSVersion < Version("10.13"):
+                # fallback for macOS < 10.13:
+                fontAttributes[CoreText.NSFontFeatureSettingsAttribute] = nsFontFeatures
+        if self._fallbackFont:
+            fallbackFont = getNSFontFromNameOrPath(self._fallbackFont, self._fontSize, self._fallbackFontNumber)
+            if fallbackFont is not None:
+                fallbackFontDescriptor = fallbackFont.fontDescriptor()
+                fontAttributes[CoreText.NSFontCascadeListAttribute] = [fallbackFontDescriptor]
+        try:
+            attributesKey = _makeHashable((self._openTypeFeatures, self._fallbackFont, self._fallbackFontNumber))
+            hash(attributesKey)
+        except TypeError:
+            attributesKey = None
+        # fonts are shared by all runs with the same variation location
+        font = variation.getVariationFont(font, self._fontVariations, self._fontSize, fontAttributes, attributesKey)
+        result = font, disableKerning, tuple(missingFeatures)
+        if key is not None:
+            _textFontCache.set(key, result)
+        return result
+
+    def _makeNSAttributes(self, properties, paragraphStyles=None):
         attributes = {}
         # store all formattedString settings in a custom attributes key
-        attributes["drawBot.formattedString.properties"] = self.textProperties()
+        attributes["drawBot.formattedString.properties"] = properties
         attributes[AppKit.NSLigatureAttributeName] = 1  # https://github.com/typemytype/drawbot/issues/427
         if self._font:
-            font = self._getNSFontWithFallback()
-            coreTextFontFeatures = []
-            nsFontFeatures = []  # fallback for macOS < 10.13
-            if self._openTypeFeatures:
-                # get existing openTypeFeatures for the font
-                existingOpenTypeFeatures = openType.getFeatureTagsForFont(font)
-                # sort features by their on/off state
-                # set all disabled features first
-                orderedOpenTypeFeatures = sorted(self._openTypeFeatures.items(), key=lambda kv: kv[1])
-                for featureTag, value in orderedOpenTypeFeatures:
-                    if value and featureTag not in existingOpenTypeFeatures:
-                        # only warn when the feature is on and not existing for the current font
-                        warnings.warn("OpenType feature '%s' not available for '%s'" % (featureTag, self._font))
-                    feature = dict(CTFeatureOpenTypeTag=featureTag, CTFeatureOpenTypeValue=value)
-                    coreTextFontFeatures.append(feature)
-                    # The next lines are a fallback for macOS < 10.13
-                    nsFontFeatureTag = featureTag
-                    if not value:
-                        nsFontFeatureTag = "%s_off" % featureTag
-                    if nsFontFeatureTag in SFNTLayoutTypes.featureMap:
-                        feature = SFNTLayoutTypes.featureMap[nsFontFeatureTag]
-                        nsFontFeatures.append(feature)
-                    # kern is a special case
-                    if featureTag == "kern" and not value:
-                        # https://developer.apple.com/documentation/uikit/nskernattributename
-                        # The value 0 means kerning is disabled.
-                        attributes[AppKit.NSKernAttributeName] = 0
-
-            coreTextFontVariations = variation.getFontVariationAttributes(font, self._fontVariations)
-
-            fontAttributes = {}
-            if coreTextFontFeatures:
-                fontAttributes[CoreText.kCTFontFeatureSettingsAttribute] = coreTextFontFeatures
-                if macOSVersion < Version("10.13"):
-                    # fallback for macOS < 10.13:
-                    fontAttributes[CoreText.NSFontFeatureSettingsAttribute] = nsFontFeatures
-            if coreTextFontVariations:
-                fontAttributes[CoreText.NSFontVariationAttribute] = coreTextFontVariations
-            if self._fallbackFont:
-                fallbackFont = getNSFontFromNameOrPath(self._fallbackFont, self._fontSize, self._fallbackFontNumber)
-                if fallbackFont is not None:
-                    fallbackFontDescriptor = fallbackFont.fontDescriptor()
-                    fontAttributes[CoreText.NSFontCascadeListAttribute] = [fallbackFontDescriptor]
-            fontDescriptor = font.fontDescriptor()
-            fontDescriptor = fontDescriptor.fontDescriptorByAddingAttributes_(fontAttributes)
-            font = AppKit.NSFont.fontWithDescriptor_size_(fontDescriptor, self._fontSize)
+            font, disableKerning = self._getNSFontWithFeatures()
+            if disableKerning:
+                attributes[AppKit.NSKernAttributeName] = 0
             attributes[AppKit.NSFontAttributeName] = font
         elif self._fontSize:
             font = AppKit.NSFont.fontWithName_size_(_FALLBACKFONT, self._fontSize)
@@ -1532,9 +2131,79 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         if self._writingDirection in self._writingDirectionMap:
             para.setBaseWritingDirection_(self._writingDirectionMap[self._writingDirection])
 
+        if paragraphStyles is not None:
+            para = paragraphStyles.setdefault(para, para)
         attributes[AppKit.NSParagraphStyleAttributeName] = para
-        txt = AppKit.NSAttributedString.alloc().initWithString_attributes_(txt, attributes)
-        self._attributedString.appendAttributedString_(txt)
+        return attributes
+
+    @classmethod
+    def fromRuns(cls, runs: list[tuple[str, dict[str, Any]]], **kwargs) -> Self:
+        """
+        Return a new formatted string from a list of `(txt, attributes)` runs.
+        The attributes of each run are applied on the given default attributes, not on the attributes of the previous run.
+
+        Runs with the same attributes share the same text attributes, building a long formatted string with many runs is a lot faster than using `append(..)` for each run.
+
+        .. downloadcode:: formattedStringFromRuns.py
+
+            prices = [("Apples", "1.20"), ("Pears", "0.95"), ("Cherries", "4.50")]
+            runs = []
+            for name, price in prices:
+                runs.append((name, dict(font="Helvetica-Bold")))
+                runs.append((f"\\t{price}\\n", dict(fill=(1, 0, 0))))
+            txt = FormattedString.fromRuns(runs, font="Helvetica", fontSize=30, tabs=[(300, ".")])
+            text(txt, (100, 800))
+        """
+        new = cls(**kwargs)
+        defaults = new.textProperties()
+        # attributes and settings for each unique set of run attributes
+        runCache = dict()
+        paragraphStyles = dict()
+        attributedString = new._attributedString
+        attributedString.beginEditing()
+        properties = None
+        pendingText = []
+        pendingAttributes = None
+        for txt, attributes in runs:
+            if not isinstance(txt, str):
+                raise TypeError("expected 'str', got '%s'" % type(txt).__name__)
+            key = _makeHashable(attributes)
+            cached = runCache.get(key)
+            if cached is None:
+                attributes = new._validateAttributes(attributes, addDefaults=False)
+                new._setTextProperties(defaults)
+                for attributeName, value in attributes.items():
+                    new._setAttribute(attributeName, value)
+                new._setColorAttributes(attributes)
+                cached = runCache[key] = new._getNSAttributes(paragraphStyles), new.textProperties()
+            nsAttributes, properties = cached
+            if nsAttributes is not pendingAttributes:
+                # join the text of consecutive runs with the same attributes
+                if pendingText:
+                    attributedString.appendAttributedString_(
+                        AppKit.NSAttributedString.alloc().initWithString_attributes_(
+                            "".join(pendingText), pendingAttributes
+                        )
+                    )
+                pendingText = []
+                pendingAttributes = nsAttributes
+            pendingText.append(txt)
+        if pendingText:
+            attributedString.appendAttributedString_(
+                AppKit.NSAttributedString.alloc().initWithString_attributes_("".join(pendingText), pendingAttributes)
+            )
+        attributedString.endEditing()
+        # continue with the settings of the last run
+        new._setTextProperties(properties if properties is not None else defaults)
+        return new
+
+    def _setTextProperties(self, properties):
+        for attributeName, value in properties.items():
+            if isinstance(value, dict):
+                value = dict(value)
+            elif isinstance(value, list):
+                value = list(value)
+            setattr(self, f"_{attributeName}", value)
 
     def _getNSFontWithFallback(self):
         font = getNSFontFromNameOrPath(self._font, self._fontSize, self._fontNumber)
@@ -1559,6 +2228,16 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
             new.append(txt)
         return new
 
+    def __iadd__(self, txt: str | Self):
+        # append in place, without copying the formatted string
+        if isinstance(txt, self.__class__):
+            self._attributedString.appendAttributedString_(txt.getNSObject())
+        else:
+            if not isinstance(txt, str):
+                raise TypeError("FormattedString requires a str or unicode, got '%s'" % type(txt))
+            self.append(txt)
+        return self
+
     def __getitem__(self, index: int | slice) -> str | Self:
         if isinstance(index, slice):
             start = index.start
@@ -1828,13 +2507,20 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         font = getNSFontFromNameOrPath(fontNameOrPath, 10, fontNumber)
         return openType.getFeatureTagsForFont(font)
 
-    def fontVariations(self, *, resetVariations: bool = False, **axes: float) -> dict[str, float]:
+    def fontVariations(
+        self, *, resetVariations: bool = False, quantization: float | None = None, **axes: float
+    ) -> dict[str, float]:
         """
         Pick a variation by axes values and return the current font variations settings.
         You can reset the default values with `fontVariations(resetVariations=True)`
 
+        Optionally the axes values are rounded to a multiple of `quantization`,
+        animations with many tiny steps share the fonts of the rounded locations.
+
         If no arguments are given `fontVariations()` will just return the current font variations settings.
         """
+        if quantization:
+            axes = variation.quantizeVariations(axes, quantization)
         if resetVariations:
             self._fontVariations.clear()
         self._fontVariations.update(axes)
@@ -2059,11 +2745,10 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         font = self._getNSFontWithFallback()
         if font is None:
             return False
-        # Issue 524: we need to pass the number of UTF-16 characters or it won't work for
-        # characters > U+FFFF
-        count = len(characters.encode("utf-16-be")) // 2
-        result, glyphs = CoreText.CTFontGetGlyphsForCharacters(font, characters, None, count)
-        return result
+        fontCoverage = getFontCoverage(font)
+        if fontCoverage is not None:
+            return fontCoverage.containsCharacters(characters)
+        return fontContainsCharacters(font, characters)
 
     def fontContainsGlyph(self, glyphName: str) -> bool:
         font = self._getNSFontWithFallback()
@@ -2105,25 +2790,20 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
         """
         Return a list of glyph names supported by the current font.
         """
-        from fontTools.ttLib import TTFont, TTLibError  # type: ignore
+        from fontTools.ttLib import TTLibError  # type: ignore
 
         path = self.fontFilePath()
         if path is None:
             return []
-        # load the font with fontTools
-        # provide a fontNumber as lots of fonts are .ttc font files.
-        # search for the res_name_or_index for .dfont files.
-        res_name_or_index = None
-        fontNumber = None
+        # read the glyph order from the font index
+        # provide a fontNumber as lots of fonts are .ttc or .dfont font files.
+        fontNumber = 0
         ext = os.path.splitext(path)[-1].lower()
-        if ext in (".ttc", ".otc"):
+        if ext in (".ttc", ".otc", ".dfont"):
             fontNumber = self.fontFileFontNumber()
-        elif ext == ".dfont":
-            res_name_or_index = self.fontFileFontNumber() + 1
         try:
-            with TTFont(path, lazy=True, fontNumber=fontNumber, res_name_or_index=res_name_or_index) as fontToolsFont:
-                glyphNames = fontToolsFont.getGlyphOrder()
-        except TTLibError:
+            glyphNames = list(fontIndex.getFontInfo(path, fontNumber)["glyphOrder"])
+        except (TTLibError, IndexError):
             warnings.warn("Cannot read the font file for '%s' at the path '%s'" % (self._font, path))
             return []
         # remove .notdef from glyph names
@@ -2209,17 +2889,12 @@ class FormattedString(SVGContextPropertyMixin, ContextPropertyMixin):
 
         # disable calt features, as this seems to be on by default
         # for both the font stored in the nsGlyphInfo as in the replacement character
-        fontAttributes = {}
-        coreTextFontVariations = variation.getFontVariationAttributes(font, self._fontVariations)
-        if coreTextFontVariations:
-            fontAttributes[CoreText.NSFontVariationAttribute] = coreTextFontVariations
-
-        fontAttributes[CoreText.kCTFontFeatureSettingsAttribute] = [
-            dict(CTFeatureOpenTypeTag="calt", CTFeatureOpenTypeValue=False)
-        ]
-        fontDescriptor = font.fontDescriptor()
-        fontDescriptor = fontDescriptor.fontDescriptorByAddingAttributes_(fontAttributes)
-        font = AppKit.NSFont.fontWithDescriptor_size_(fontDescriptor, self._fontSize)
+        fontAttributes = {
+            CoreText.kCTFontFeatureSettingsAttribute: [dict(CTFeatureOpenTypeTag="calt", CTFeatureOpenTypeValue=False)]
+        }
+        font = variation.getVariationFont(
+            font, self._fontVariations, self._fontSize, fontAttributes, attributesKey=(("calt", False),)
+        )
 
         fallbackFont = self._fallbackFont
         self._fallbackFont = None  # type: ignore
@@ -2333,6 +3008,8 @@ class BaseContext:
     fileExtensions: list[str] = []
     saveImageOptions: list[tuple[str, str]] = []
     validateSaveImageOptions = True
+    # the frame durations of all pages are given to prepareSaveImage(..)
+    usesFrameDurations = False
 
     _textAlignMap = FormattedString._textAlignMap
     _textTabAlignMap = FormattedString._textTabAlignMap
@@ -2385,6 +3062,11 @@ class BaseContext:
         self.width = None
         self.height = None
         self.hasPage = False
+        self._pageCache = None
+        self._pageCacheKeys = []
+        self._plannedFrameDurations = None
+        # context specific data for each defined symbol
+        self._symbols = {}
         self.reset()
 
     # overwrite by a subclass
@@ -2410,10 +3092,17 @@ class BaseContext:
     def _clipPath(self):
         pass
 
+    def _defineSymbol(self, symbol):
+        # return the context specific data to place the symbol
+        return None
+
+    def _placeSymbol(self, symbolData, transformMatrix):
+        pass
+
     def _transform(self, matrix):
         pass
 
-    def _textBox(self, txt, box, align):
+    def _textBox(self, txt, box, align, start):
         pass
 
     def _image(self, path, xy, alpha, pageNumber):
@@ -2425,6 +3114,12 @@ class BaseContext:
     def _reset(self, other=None):
         pass
 
+    def _prepareSaveImage(self, path, options):
+        pass
+
+    def _insertCachedPage(self, path):
+        pass
+
     def _saveImage(self, path, options):
         pass
 
@@ -2462,6 +3157,44 @@ class BaseContext:
         self.hasPage = True
         self._newPage(width, height)
 
+    def prepareSaveImage(self, path, options, frameDurations=None):
+        # called before the drawing is replayed in the context
+        # optionally `frameDurations` is a list with the duration of each page, or None when not set
+        self._plannedFrameDurations = frameDurations
+        self._pageCacheKeys = []
+        pageCacheRoot = options.get("pageCache")
+        if pageCacheRoot is not None and self._supportsPageCache(options):
+            self._pageCache = PageCache(pageCacheRoot, self.__class__.__name__, options, os.path.splitext(path)[1])
+        self._prepareSaveImage(path, options)
+
+    def _supportsPageCache(self, options):
+        return False
+
+    def drawCachedPage(self, instructionSet):
+        """
+        Insert the page from the page cache, return True when the instructions don't need to be drawn.
+        """
+        pageCache = self._pageCache
+        if pageCache is None:
+            return False
+        key = pageCache.getKey(instructionSet)
+        self._pageCacheKeys.append(key)
+        cachedPath = pageCache.get(key)
+        if cachedPath is None:
+            return False
+        self._insertCachedPage(cachedPath)
+        self.hasPage = True
+        return True
+
+    def _storeCachedPage(self, pageIndex, path=None, data=None):
+        pageCache = self._pageCache
+        if pageCache is None or pageIndex >= len(self._pageCacheKeys):
+            return
+        if path is not None:
+            pageCache.storeFile(self._pageCacheKeys[pageIndex], path)
+        else:
+            pageCache.storeData(self._pageCacheKeys[pageIndex], data)
+
     def saveImage(self, path, options):
         if not self.hasPage:
             raise DrawBotError("can't save image when no page is set")
@@ -2530,6 +3263,14 @@ class BaseContext:
             self._state.path = path
         self._clipPath()
 
+    def defineSymbol(self, symbol):
+        self._symbols[symbol] = self._defineSymbol(symbol)
+
+    def placeSymbol(self, symbol, transformMatrix):
+        if symbol not in self._symbols:
+            raise DrawBotError("symbol is not defined in this drawing, use `defineSymbol(path)`")
+        self._placeSymbol(self._symbols[symbol], transformMatrix)
+
     def colorSpace(self, colorSpace):
         if colorSpace is None:
             colorSpace = "genericRGB"
@@ -2714,8 +3455,10 @@ class BaseContext:
     def openTypeFeatures(self, *, resetFeatures: bool = False, **features: bool) -> dict[str, bool]:
         return self._state.text.openTypeFeatures(resetFeatures=resetFeatures, **features)
 
-    def fontVariations(self, *, resetVariations: bool = False, **axes: float) -> dict[str, float]:
-        return self._state.text.fontVariations(resetVariations=resetVariations, **axes)
+    def fontVariations(
+        self, *, resetVariations: bool = False, quantization: float | None = None, **axes: float
+    ) -> dict[str, float]:
+        return self._state.text.fontVariations(resetVariations=resetVariations, quantization=quantization, **axes)
 
     def fontNamedInstance(self, name, fontNameOrPath):
         self._state.text.fontNamedInstance(name, fontNameOrPath)
@@ -2728,39 +3471,50 @@ class BaseContext:
         return self._state.text.getNSObject()
 
     def hyphenateAttributedString(self, attrString, path):
-        # add soft hyphens
+        # only the text that could be visible in the path is hyphenated:
+        # the text that fits without hyphenation and a bit more, up to the end of a word
+        length = attrString.length()
+        visibleLength = self._getVisibleLengthWithPath(attrString, path)
+        extra = max(visibleLength // 4, 100)
+        while True:
+            end = min(visibleLength + extra, length)
+            if end < length:
+                end = max(end, AppKit.NSMaxRange(attrString.doubleClickAtIndex_(end)))
+            hyphenated = self._hyphenateLines(attrString.attributedSubstringFromRange_((0, end)), path)
+            if end == length:
+                return hyphenated
+            if self._getVisibleLengthWithPath(hyphenated, path) < hyphenated.length():
+                hyphenated.appendAttributedString_(attrString.attributedSubstringFromRange_((end, length - end)))
+                return hyphenated
+            # all hyphenated text fits, try again with more text
+            extra *= 2
+
+    def _hyphenateLines(self, attrString, path):
+        softHyphen = chr(self._softHypen)
         attrString = attrString.mutableCopy()
         mutString = attrString.mutableString()
-        wordRange = AppKit.NSMakeRange(mutString.length(), 0)
-        while wordRange.location > 2:
-            wordRange = attrString.doubleClickAtIndex_(wordRange.location - 2)
-            hyphenIndex = AppKit.NSMaxRange(wordRange)
-            while hyphenIndex != AppKit.NSNotFound:
-                hyphenIndex = attrString.lineBreakByHyphenatingBeforeIndex_withinRange_(hyphenIndex, wordRange)
-                if hyphenIndex != AppKit.NSNotFound:
-                    mutString.insertString_atIndex_(chr(self._softHypen), hyphenIndex)
-
+        # add soft hyphens
+        self._insertSoftHyphens(attrString)
+        # in a rectangle all lines have the same width,
+        # the lines after a changed line are typesetted again without the lines before
+        isRect, _ = Quartz.CGPathIsRect(path, None)
         # get the lines
-        lines = self._getTypesetterLinesWithPath(attrString, path)
-        # get all lines justified
-        justifiedLines = self._getTypesetterLinesWithPath(self._justifyAttributedString(attrString), path)
+        lines = self._getHyphenationLines(attrString, path)
+        lineCount = len(lines)
 
         # loop over all lines
         i = 0
         while i < len(lines):
-            # get the current line
-            line = lines[i]
-            # get the range in the text for the current line
-            rng = CoreText.CTLineGetStringRange(line)
+            # get the range in the text for the current line and the max line width of the justified line
+            location, length, maxLineWidth = lines[i]
+            rng = (location, length)
             # get the substring from the range
             subString = attrString.attributedSubstringFromRange_(rng)
             # get the string
             subStringText = subString.string()
             # check if the line ends with a softhypen
-            if len(subStringText) and subStringText[-1] == chr(self._softHypen):
+            if len(subStringText) and subStringText[-1] == softHyphen:
                 # here we go
-                # get the justified line and get the max line width
-                maxLineWidth, _, _, _ = CoreText.CTLineGetTypographicBounds(justifiedLines[i], None, None, None)
                 # get the last attributes
                 hyphenAttr, _ = subString.attributesAtIndex_effectiveRange_(0, None)
                 # create a hyphen string
@@ -2785,53 +3539,169 @@ class BaseContext:
                     # get the width
                     stringWidth = breakString.size().width
                     # add hyphen width if required
-                    if breakString.string()[-1] == chr(self._softHypen):
+                    if breakString.string()[-1] == softHyphen:
                         stringWidth += hyphenWidth
                     # found a break
                     if stringWidth <= maxLineWidth:
                         breakFound = True
                         break
 
-                if breakFound and len(breakString.string()) > 2 and breakString.string()[-1] == chr(self._softHypen):
+                if breakFound and len(breakString.string()) > 2 and breakString.string()[-1] == softHyphen:
                     # if the break line ends with a soft hyphen
                     # add a hyphen
-                    attrString.replaceCharactersInRange_withString_((rng.location + lineBreak, 0), "-")
+                    attrString.replaceCharactersInRange_withString_((location + lineBreak, 0), "-")
                 # remove all soft hyphens for the range of that line
                 mutString.replaceOccurrencesOfString_withString_options_range_(
-                    chr(self._softHypen), "", AppKit.NSLiteralSearch, rng
+                    softHyphen, "", AppKit.NSLiteralSearch, rng
                 )
-                # reset the lines, from the adjusted attribute string
-                lines = self._getTypesetterLinesWithPath(attrString, path)
-                # reset the justifed lines form the adjusted attributed string
-                justifiedLines = self._getTypesetterLinesWithPath(self._justifyAttributedString(attrString), path)
+                # reset the lines from the adjusted attributed string
+                if isRect:
+                    lines = lines[:i] + self._getHyphenationLines(attrString, path, location)[: lineCount - i]
+                else:
+                    lines = self._getHyphenationLines(attrString, path)
             # next line
             i += 1
         # remove all soft hyphen
         mutString.replaceOccurrencesOfString_withString_options_range_(
-            chr(self._softHypen), "", AppKit.NSLiteralSearch, (0, mutString.length())
+            softHyphen, "", AppKit.NSLiteralSearch, (0, mutString.length())
         )
         # done!
         return attrString
 
-    def clippedText(self, txt, box, align):
-        path, origin = self._getPathForFrameSetter(box)
-        attrString = self.attributedString(txt, align=align)
-        if self._state.hyphenation:
-            hyphenIndexes = [i for i, c in enumerate(attrString.string()) if c == "-"]
-            attrString = self.hyphenateAttributedString(attrString, path)
+    def _insertSoftHyphens(self, attrString):
+        mutString = attrString.mutableString()
+        wordRange = AppKit.NSMakeRange(mutString.length(), 0)
+        while wordRange.location > 2:
+            wordRange = attrString.doubleClickAtIndex_(wordRange.location - 2)
+            # the hyphenation indexes are sorted from the end of the word, inserting doesn't change the next index
+            for hyphenIndex in self._getHyphenationIndexes(attrString, wordRange):
+                mutString.insertString_atIndex_(chr(self._softHypen), wordRange.location + hyphenIndex)
+
+    def _getHyphenationIndexes(self, attrString, wordRange):
+        word = attrString.attributedSubstringFromRange_(wordRange)
+        language, _ = attrString.attribute_atIndex_effectiveRange_("NSLanguage", wordRange.location, None)
+        key = word.string(), language
+        hyphenIndexes = _hyphenationCache.get(key)
+        if hyphenIndexes is None:
+            hyphenator = getHyphenator(language)
+            if hyphenator is not None:
+                # installed hyphenation patterns for this language
+                hyphenIndexes = tuple(reversed(hyphenator.positions(str(word.string()))))
+                _hyphenationCache.set(key, hyphenIndexes)
+                return hyphenIndexes
+            hyphenIndexes = []
+            hyphenIndex = wordRange.length
+            while True:
+                hyphenIndex = word.lineBreakByHyphenatingBeforeIndex_withinRange_(hyphenIndex, (0, wordRange.length))
+                if hyphenIndex == AppKit.NSNotFound or (hyphenIndexes and hyphenIndex >= hyphenIndexes[-1]):
+                    break
+                hyphenIndexes.append(hyphenIndex)
+            hyphenIndexes = tuple(hyphenIndexes)
+            _hyphenationCache.set(key, hyphenIndexes)
+        return hyphenIndexes
+
+    def _getHyphenationLines(self, attrString, path, start=0):
+        # get the string range and the width of the justified line for each line, starting at the given index
+        if start:
+            isParagraphStart = attrString.attributedSubstringFromRange_((start - 1, 1)).string() in "\n\r\u2029"
+            attrString = attrString.attributedSubstringFromRange_((start, attrString.length() - start))
+            if not isParagraphStart:
+                attrString = self._continueParagraph(attrString)
+        lines = self._getTypesetterLinesWithPath(attrString, path)
+        # get all lines justified
+        justifiedLines = self._getTypesetterLinesWithPath(self._justifyAttributedString(attrString), path)
+        result = []
+        for line, justifiedLine in zip(lines, justifiedLines):
+            rng = CoreText.CTLineGetStringRange(line)
+            maxLineWidth, _, _, _ = CoreText.CTLineGetTypographicBounds(justifiedLine, None, None, None)
+            result.append((start + rng.location, rng.length, maxLineWidth))
+        return result
+
+    def _continueParagraph(self, attrString):
+        # the attributed string starts in the middle of a paragraph, the first line is not a first line
+        attrString = attrString.mutableCopy()
+        paragraphRange = attrString.mutableString().paragraphRangeForRange_((0, 0))
+
+        def changeParaAttribute(para, rng, _):
+            if para is None:
+                return
+            para = para.mutableCopy()
+            para.setFirstLineHeadIndent_(para.headIndent())
+            attrString.addAttribute_value_range_(AppKit.NSParagraphStyleAttributeName, para, rng)
+
+        attrString.enumerateAttribute_inRange_options_usingBlock_(
+            AppKit.NSParagraphStyleAttributeName, paragraphRange, 0, changeParaAttribute
+        )
+        return attrString
+
+    def _getVisibleLengthWithPath(self, attrString, path):
         setter = newFramesetterWithAttributedString(attrString)
-        box = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
-        visibleRange = CoreText.CTFrameGetVisibleStringRange(box)
-        clip = visibleRange.length
-        if self._state.hyphenation:
-            subString = attrString.string()[:clip]
-            for i in hyphenIndexes:
-                if i < clip:
-                    clip += 1
+        frame = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
+        return CoreText.CTFrameGetVisibleStringRange(frame).length
+
+    def clippedText(self, txt, box, align):
+        return self.layoutText(txt, box, align).overflow
+
+    def layoutText(self, txt, box, align, start=None):
+        return TextLayout(txt, self._getTextFrame(self.attributedString(txt, align=align), box, start))
+
+    def _getTextFrame(self, attrString, box, start=None):
+        # an immutable copy, the attributed string of a formatted string can change
+        attrString = attrString.copy()
+        framesetter = None
+        if start is not None:
+            # a frame of a text flow, typeset the whole text only once
+            attrString, framesetter = self._getTextFlow(attrString)
+        hyphenation = bool(self._state.hyphenation)
+        key = (attrString, self._getTextFrameBoxKey(box), hyphenation, start)
+        textFrame = _textFrameCache.get(key)
+        if textFrame is None:
+            path, origin = self._getPathForFrameSetter(box)
+            if start is not None:
+                if hyphenation:
+                    textFrame = self._getHyphenatedTextFlowFrame(attrString, framesetter, start, path, origin)
                 else:
-                    break
-            clip -= subString.count("-")
-        return txt[clip:]
+                    textFrame = TextFrame(attrString, path, origin, framesetter=framesetter, start=start)
+            elif hyphenation:
+                sourceText = attrString.string()
+                textFrame = TextFrame(self.hyphenateAttributedString(attrString, path), path, origin, sourceText)
+            else:
+                textFrame = TextFrame(attrString, path, origin)
+            _textFrameCache.set(key, textFrame)
+        return textFrame
+
+    def _getTextFlow(self, attrString):
+        textFlow = _textFlowCache.get(attrString)
+        if textFlow is None:
+            textFlow = attrString, newFramesetterWithAttributedString(attrString)
+            _textFlowCache.set(attrString, textFlow)
+        return textFlow
+
+    def _getHyphenatedTextFlowFrame(self, attrString, framesetter, start, path, origin):
+        # only hyphenate the text that could fit in the box:
+        # the text fitting without hyphenation and a bit more, up to the end of a word
+        length = attrString.length()
+        frame = CoreText.CTFramesetterCreateFrame(framesetter, (start, 0), path, None)
+        visibleLength = CoreText.CTFrameGetVisibleStringRange(frame).length
+        extra = max(visibleLength // 4, 100)
+        while True:
+            end = min(start + visibleLength + extra, length)
+            if end < length:
+                end = max(end, AppKit.NSMaxRange(attrString.doubleClickAtIndex_(end)))
+            chunk = attrString.attributedSubstringFromRange_((start, end - start))
+            textFrame = TextFrame(
+                self.hyphenateAttributedString(chunk, path), path, origin, sourceText=chunk.string(), offset=start
+            )
+            if end == length or textFrame.clipIndex < end:
+                return textFrame
+            # all text in the chunk fits, try again with a larger chunk
+            extra *= 2
+
+    def _getTextFrameBoxKey(self, box):
+        if isinstance(box, self._bezierPathClass):
+            pathData = box._getPathData()
+            return pathData.segmentTypes.tobytes(), pathData.coordinates.tobytes()
+        return tuple(box)
 
     def _justifyAttributedString(self, attr):
         # create a justified copy of the attributed string
@@ -2880,19 +3750,15 @@ class BaseContext:
                 width = CoreText.CGFLOAT_MAX
             if height is None:
                 height = CoreText.CGFLOAT_MAX
-            if self._state.hyphenation:
-                path = CoreText.CGPathCreateMutable()
-                CoreText.CGPathAddRect(path, None, CoreText.CGRectMake(0, 0, width, height))
-                attrString = self.hyphenateAttributedString(attrString, path)
-            setter = newFramesetterWithAttributedString(attrString)
+            textFrame = self._getTextFrame(attrString, (0, 0, width, height))
             (w, h), _ = CoreText.CTFramesetterSuggestFrameSizeWithConstraints(
-                setter, (0, 0), None, (width, height), None
+                textFrame.framesetter, (0, 0), None, (width, height), None
             )
         return w, h
 
-    def textBox(self, txt, box, align="left"):
+    def textBox(self, txt, box, align="left", start=None):
         self._state.path = None
-        self._textBox(txt, box, align)
+        self._textBox(txt, box, align, start)
 
     def image(self, path, xy, alpha, pageNumber):
         x, y = xy
@@ -2903,6 +3769,7 @@ class BaseContext:
         success, error = CoreText.CTFontManagerRegisterFontsForURL(url, CoreText.kCTFontManagerScopeProcess, None)
         if not success:
             error = error.localizedDescription()
+        resetInstalledFontsCoverage()
         return success, error
 
     def uninstallFont(self, path):
@@ -2910,23 +3777,19 @@ class BaseContext:
         success, error = CoreText.CTFontManagerUnregisterFontsForURL(url, CoreText.kCTFontManagerScopeProcess, None)
         if not success:
             error = error.localizedDescription()
+        resetInstalledFontsCoverage()
         return success, error
 
     def _fontNameForPath(self, path):
-        from fontTools.ttLib import TTFont, TTLibError
+        from fontTools.ttLib import TTLibError
 
         try:
-            font = TTFont(path, fontNumber=0)  # in case of .ttc, use the first font
-            psName = font["name"].getName(6, 1, 0)
-            if psName is None:
-                psName = font["name"].getName(6, 3, 1)
-            font.close()
+            # in case of .ttc, use the first font
+            psName = fontIndex.getFontInfo(path)["psName"]
         except IOError:
             raise DrawBotError("Font '%s' does not exist." % path)
-        except TTLibError:
+        except (TTLibError, IndexError):
             raise DrawBotError("Font '%s' is not a valid font." % path)
-        if psName is not None:
-            psName = psName.toUnicode()
         return psName
 
     def linkURL(self, url, xywh):
@@ -2993,7 +3856,7 @@ def _getNSFontFromNameOrPath(fontNameOrPath, fontSize, fontNumber):
 _reloadedFontDescriptors: dict[SomePath, tuple[float, Any]] = {}
 
 
-@memoize
+@memoize(maxSize=256, persistent=True)
 def getFontDescriptorsFromPath(fontPath):
     modTime = os.stat(fontPath).st_mtime
     prevModTime, descriptors = _reloadedFontDescriptors.get(fontPath, (modTime, None))
@@ -3004,8 +3867,9 @@ def getFontDescriptorsFromPath(fontPath):
             assert url is not None
             descriptors = CoreText.CTFontManagerCreateFontDescriptorsFromURL(url)
             # Nothing was reloaded, this is the general case: do not cache the
-            # descriptors globally (they are cached per newDrawing session via
-            # @memoize), only store the modification time.
+            # descriptors globally (they are cached across drawings via a
+            # persistent @memoize, keyed by the modification time), only store
+            # the modification time.
             _reloadedFontDescriptors[fontPath] = modTime, None
     else:
         # The font file was changed on disk since we last used it. We now load
@@ -3017,6 +3881,97 @@ def getFontDescriptorsFromPath(fontPath):
     return descriptors
 
 
+def fontContainsCharacters(font, characters):
+    # Issue 524: we need to pass the number of UTF-16 characters or it won't work for
+    # characters > U+FFFF
+    count = len(characters.encode("utf-16-be")) // 2
+    result, glyphs = CoreText.CTFontGetGlyphsForCharacters(font, characters, None, count)
+    return result
+
+
+@memoize
+def getFontCoverage(font):
+    """
+    Return the character coverage of a font from the font index, or None when the font is not indexed.
+    """
+    fontDescriptor = font.fontDescriptor()
+    url = CoreText.CTFontDescriptorCopyAttribute(fontDescriptor, CoreText.kCTFontURLAttribute)
+    psFontName = CoreText.CTFontDescriptorCopyAttribute(fontDescriptor, CoreText.kCTFontNameAttribute)
+    if url is None or psFontName is None:
+        return None
+    try:
+        fontInfo = fontIndex.findFontInfo(url.path(), psFontName)
+    except Exception:
+        # not a font file fontTools can read
+        return None
+    if fontInfo is None or not fontInfo["cmapRanges"]:
+        # fonts without a unicode cmap are checked by CoreText
+        return None
+    return FontCoverage.fromRanges(fontInfo["cmapRanges"])
+
+
+class _InstalledFontsCoverage:
+    # the number of font files read with fontTools for each query, until all installed fonts are indexed
+    indexBatchSize = 64
+
+    def __init__(self):
+        self.fontNames = [str(fontName) for fontName in AppKit.NSFontManager.sharedFontManager().availableFonts()]
+        urls = CoreText.CTFontManagerCopyAvailableFontURLs() or []
+        self.coverageIndex = CoverageIndex()
+        self.pendingPaths = sorted({url.path() for url in urls}, reverse=True)
+        self.unindexedCharacterSets = None
+
+    def _indexNextFontFiles(self):
+        # font files already in the font index are added without reading the font file
+        readCount = 0
+        while self.pendingPaths and readCount < self.indexBatchSize:
+            if self.coverageIndex.addFontFile(self.pendingPaths.pop()):
+                readCount += 1
+        if not self.pendingPaths:
+            # fonts fontTools can not read, or with a different postscript name, are checked by CoreText
+            self.unindexedCharacterSets = {}
+            for fontName in self.fontNames:
+                if fontName not in self.coverageIndex:
+                    font = CoreText.CTFontCreateWithName(fontName, 10, None)
+                    self.unindexedCharacterSets[fontName] = CoreText.CTFontCopyCharacterSet(font)
+
+    def _matchFontsForCharacters(self, characters):
+        characterSet = AppKit.NSCharacterSet.characterSetWithCharactersInString_(characters)
+        fontAttributes = {CoreText.NSFontCharacterSetAttribute: characterSet}
+        fontDescriptor = CoreText.CTFontDescriptorCreateWithAttributes(fontAttributes)
+        descriptions = fontDescriptor.matchingFontDescriptorsWithMandatoryKeys_(None) or []
+        return {str(description[CoreText.NSFontNameAttribute]) for description in descriptions}
+
+    def fontsForCharacters(self, characters):
+        if self.unindexedCharacterSets is None:
+            # CoreText answers until all installed fonts are indexed, a few font files are indexed for each query
+            fontNames = self._matchFontsForCharacters(characters)
+            self._indexNextFontFiles()
+        else:
+            fontNames = set(self.coverageIndex.fontsForCharacters(characters))
+            values = set(map(ord, characters))
+            for fontName, characterSet in self.unindexedCharacterSets.items():
+                if all(characterSet.longCharacterIsMember_(value) for value in values):
+                    fontNames.add(fontName)
+        return [fontName for fontName in self.fontNames if fontName in fontNames]
+
+
+# the character coverage of all installed fonts, built once and reset when a font is installed or uninstalled
+_installedFontsCoverage = None
+
+
+def getInstalledFontsCoverage():
+    global _installedFontsCoverage
+    if _installedFontsCoverage is None:
+        _installedFontsCoverage = _InstalledFontsCoverage()
+    return _installedFontsCoverage
+
+
+def resetInstalledFontsCoverage():
+    global _installedFontsCoverage
+    _installedFontsCoverage = None
+
+
 def getFontName(font) -> str | None:
     if font is None:
         return None
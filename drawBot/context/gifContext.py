@@ -1,3 +1,5 @@
+import os
+import shutil
 import tempfile
 
 import Quartz  # type: ignore
@@ -16,6 +18,7 @@ class GIFContext(ImageContext):
             "imageColorSyncProfileData",
         ]
     )
+    saveImageOptions = [(key, doc) for key, doc in saveImageOptions if key != "pageCache"]
     saveImageOptions.append(("imageGIFLoop", "Boolean that indicates whether the animated gif should loop"))
 
     _delay = 10
@@ -23,6 +26,18 @@ class GIFContext(ImageContext):
     def __init__(self):
         super(GIFContext, self).__init__()
         self._delayData = []
+        self._inputPaths = []
+        self._tempFolder = None
+
+    def _supportsPageCache(self, options):
+        # the frame durations are part of the skipped drawing instructions
+        return False
+
+    def _prepareSaveImage(self, path, options):
+        # stream all frames into temporary gif files, combined with gifsicle when saving
+        options = dict(options, multipage=True)
+        self._tempFolder = tempfile.mkdtemp()
+        super()._prepareSaveImage(os.path.join(self._tempFolder, "frame.gif"), options)
 
     def _frameDuration(self, seconds):
         # gifsicle -h: Set frame delay to TIME (in 1/100sec).
@@ -33,6 +48,24 @@ class GIFContext(ImageContext):
         self._delayData.append(self._delay)
 
     def _writeDataToFile(self, data, path, options):
+        if self._tempFolder is None:
+            self._tempFolder = tempfile.mkdtemp()
+        try:
+            self._writeGif(data, path, options)
+        finally:
+            # remove all temporary frames
+            shutil.rmtree(self._tempFolder, ignore_errors=True)
+            self._tempFolder = None
+            self._inputPaths = []
+
+    def _writeGif(self, data, path, options):
+        if self._streamPages:
+            super()._writeDataToFile(data, path, options)
+            if len(self._inputPaths) > 1:
+                generateGif(self._inputPaths, path, self._delayData, options.get("imageGIFLoop", True))
+            else:
+                shutil.move(self._inputPaths[0], path)
+            return
         pdfDocument = Quartz.PDFDocument.alloc().initWithData_(data)
         pageCount = pdfDocument.pageCount()
         shouldBeAnimated = pageCount > 1
@@ -40,15 +73,13 @@ class GIFContext(ImageContext):
         tempPath = path
         if shouldBeAnimated:
             options["multipage"] = True
-            tempPath = tempfile.mkstemp(suffix=".gif")[1]
+            tempPath = os.path.join(self._tempFolder, "frame.gif")
 
         self._inputPaths = []
         super()._writeDataToFile(data, tempPath, options)
 
         if shouldBeAnimated:
             generateGif(self._inputPaths, path, self._delayData, options.get("imageGIFLoop", True))
-        del self._inputPaths
 
-    def _storeImageData(self, imageData, imagePath):
-        super()._storeImageData(imageData, imagePath)
+    def _imageStored(self, imagePath):
         self._inputPaths.append(imagePath)
@@ -1,9 +1,17 @@
+import ast
+import concurrent.futures
+import math
+import multiprocessing
 import os
+import pickle
+import shutil
+import sys
+import tempfile
 
 import AppKit  # type: ignore
 import Quartz  # type: ignore
 
-from drawBot.misc import DrawBotError
+from drawBot.misc import DrawBotError, warnings
 
 from .baseContext import Color
 from .pdfContext import PDFContext
@@ -118,11 +126,83 @@ class ImageContext(PDFContext):
             "A Boolean value that specifies whether subpixel quantization of glyphs is allowed. Default is True.",
         ),
         ("multipage", "Output a numbered image for each page or frame in the document."),
+        (
+            "workers",
+            'The number of processes used to render the pages of a multipage export in parallel. Default is None, rendering all pages in the current process. The worker processes import the main script again: a script drawing at the top level must be guarded by `if __name__ == "__main__":`, otherwise the pages are rendered serially.',
+        ),
+        (
+            "pageCache",
+            "A folder path to cache each rendered image of a multipage export. Pages with unchanged drawing instructions are reused from the cache on a next export. See `pageCacheStats()`.",
+        ),
     ]
 
     ensureEvenPixelDimensions = False
 
+    def _prepareSaveImage(self, path, options):
+        workers = options.get("workers")
+        if workers is not None and workers > 1:
+            # a parallel export renders the pages from the complete pdf document
+            return
+        # render and write each page as soon as it is finished,
+        # only a single page is kept in memory
+        self._streamPages = True
+        self._streamPath = path
+        self._streamOptions = options
+        self._streamPageCount = 0
+        self._streamLastPageData = None
+
+    def _supportsPageCache(self, options):
+        workers = options.get("workers")
+        return bool(options.get("multipage")) and (workers is None or workers <= 1)
+
+    def _insertCachedPage(self, path):
+        if self._hasContext:
+            # flush the current page
+            self._closeContext()
+            self._pageDataCompleted(self._pdfData)
+            self._pdfContext = None
+            self._pdfData = None
+        self._streamPageCount += 1
+        imagePath = self._getStreamImagePath(self._streamPageCount)
+        shutil.copyfile(path, imagePath)
+        self._imageStored(imagePath)
+
+    def _getStreamImagePath(self, pageNumber):
+        fileName, fileExt = os.path.splitext(self._streamPath)
+        return f"{fileName}_{pageNumber}{fileExt}"
+
+    def _pageDataCompleted(self, data):
+        self._streamPageCount += 1
+        if self._streamOptions.get("multipage"):
+            imagePath = self._getStreamImagePath(self._streamPageCount)
+            self._writePageDataToFile(data, imagePath, self._streamOptions)
+            self._storeCachedPage(self._streamPageCount - 1, path=imagePath)
+        else:
+            # only the last page is exported
+            self._streamLastPageData = data
+
+    def _writePageDataToFile(self, data, imagePath, options):
+        ext = os.path.splitext(imagePath)[1][1:]
+        pool = AppKit.NSAutoreleasePool.alloc().init()
+        try:
+            page = Quartz.PDFDocument.alloc().initWithData_(data).pageAtIndex_(0)
+            imageData = _makeImageData(
+                page, self._saveImageFileTypes[ext], options, self.ensureEvenPixelDimensions, self.fileExtensions
+            )
+            self._storeImageData(imageData, imagePath)
+            del page, imageData
+        finally:
+            del pool
+
     def _writeDataToFile(self, data, path, options):
+        if self._streamPages:
+            # data only contains the last page, or is None when the last page came from the page cache
+            if data is not None:
+                self._pageDataCompleted(data)
+            if self._streamLastPageData is not None:
+                self._writePageDataToFile(self._streamLastPageData, self._streamPath, self._streamOptions)
+            self._streamLastPageData = None
+            return
         multipage = options.get("multipage")
         if multipage is None:
             multipage = False
@@ -135,40 +215,178 @@ class ImageContext(PDFContext):
         if not multipage:
             firstPage = pageCount - 1
             pathAdd = ""
-        imageResolution = options.get("imageResolution", 72.0)
-        antiAliasing = options.get("antiAliasing", True)
-        fontSubpixelQuantization = options.get("fontSubpixelQuantization", True)
-        properties = {}
-        for key, value in options.items():
-            if key in _nsImageOptions:
-                nsKey, converter, _ = _nsImageOptions[key]
-                if converter is not None:
-                    value = converter(value)
-                properties[nsKey] = value
+        pages = []
         for index in range(firstPage, pageCount):
+            pages.append((index, fileName + pathAdd + fileExt))
+            pathAdd = "_%s" % (index + 2)
+        workers = options.get("workers")
+        if workers is not None and workers > 1 and len(pages) > 1 and self._canWritePagesInParallel(options):
+            self._writePagesInParallel(data, pages, ext, options, workers)
+            return
+        for index, imagePath in pages:
             pool = AppKit.NSAutoreleasePool.alloc().init()
             try:
                 page = pdfDocument.pageAtIndex_(index)
-                imageRep = _makeBitmapImageRep(
-                    pdfPage=page,
-                    antiAliasing=antiAliasing,
-                    fontSubpixelQuantization=fontSubpixelQuantization,
-                    imageResolution=imageResolution,
+                imageData = _makeImageData(
+                    page, self._saveImageFileTypes[ext], options, self.ensureEvenPixelDimensions, self.fileExtensions
                 )
-                if self.ensureEvenPixelDimensions:
-                    if imageRep.pixelsWide() % 2 or imageRep.pixelsHigh() % 2:
-                        msg = f"Exporting to {', '.join(self.fileExtensions)} doesn't support odd pixel dimensions for width and height."
-                        raise DrawBotError(msg)
-                imageData = imageRep.representationUsingType_properties_(self._saveImageFileTypes[ext], properties)
-                imagePath = fileName + pathAdd + fileExt
                 self._storeImageData(imageData, imagePath)
-                pathAdd = "_%s" % (index + 2)
-                del page, imageRep, imageData
+                del page, imageData
             finally:
                 del pool
 
+    def _canWritePagesInParallel(self, options):
+        if getattr(sys, "frozen", False):
+            # a process pool would launch the application bundle itself
+            warnings.warn("saveImage(workers=...) is not supported inside the DrawBot application, exporting serially.")
+            return False
+        if _mainModuleRunsOnImport():
+            # the spawned worker processes import the main script again, drawing it again
+            warnings.warn(
+                "saveImage(workers=...) requires a main script guarded by 'if __name__ == \"__main__\":', exporting serially."
+            )
+            return False
+        try:
+            pickle.dumps(options)
+        except Exception:
+            warnings.warn("saveImage(workers=...) requires plain Python option values, exporting serially.")
+            return False
+        return True
+
+    def _writePagesInParallel(self, data, pages, ext, options, workers):
+        # the drawing instructions hold Cocoa objects which cannot be sent to another process,
+        # the workers read the pages from a temporary pdf file instead
+        fileDescriptor, pdfPath = tempfile.mkstemp(suffix=".pdf")
+        os.close(fileDescriptor)
+        try:
+            data.writeToFile_atomically_(pdfPath, True)
+            chunkSize = math.ceil(len(pages) / workers)
+            chunks = [pages[i : i + chunkSize] for i in range(0, len(pages), chunkSize)]
+            context = multiprocessing.get_context("spawn")
+            with concurrent.futures.ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as executor:
+                futures = [
+                    executor.submit(
+                        _writePDFPagesToImageFiles,
+                        pdfPath,
+                        chunk,
+                        self._saveImageFileTypes[ext],
+                        options,
+                        self.ensureEvenPixelDimensions,
+                        self.fileExtensions,
+                    )
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            os.remove(pdfPath)
+        for _, imagePath in pages:
+            self._imageStored(imagePath)
+
     def _storeImageData(self, imageData, imagePath):
         imageData.writeToFile_atomically_(imagePath, True)
+        self._imageStored(imagePath)
+
+    def _imageStored(self, imagePath):
+        # subclasses can keep track of all written image paths
+        pass
+
+
+def _isMainGuard(node):
+    if not isinstance(node, ast.Compare) or len(node.ops) != 1 or not isinstance(node.ops[0], ast.Eq):
+        return False
+    operands = [node.left, node.comparators[0]]
+    return any(isinstance(operand, ast.Name) and operand.id == "__name__" for operand in operands) and any(
+        isinstance(operand, ast.Constant) and operand.value == "__main__" for operand in operands
+    )
+
+
+def _scriptRunsOnImport(source):
+    # a script runs on import when it has top level statements other than
+    # imports, definitions, assignments and an `if __name__ == "__main__":` block
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return True
+    for node in tree.body:
+        if isinstance(
+            node,
+            (
+                ast.Import,
+                ast.ImportFrom,
+                ast.FunctionDef,
+                ast.AsyncFunctionDef,
+                ast.ClassDef,
+                ast.Assign,
+                ast.AnnAssign,
+            ),
+        ):
+            continue
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            # a docstring
+            continue
+        if isinstance(node, ast.If) and _isMainGuard(node.test):
+            continue
+        return True
+    return False
+
+
+def _mainModuleRunsOnImport():
+    mainModule = sys.modules.get("__main__")
+    path = getattr(mainModule, "__file__", None)
+    if path is None or os.path.splitext(path)[1] != ".py":
+        # an interactive session or a script runner, nothing is imported again
+        return False
+    try:
+        with open(path, encoding="utf-8") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError):
+        return True
+    return _scriptRunsOnImport(source)
+
+
+def _getImageProperties(options):
+    properties = {}
+    for key, value in options.items():
+        if key in _nsImageOptions:
+            nsKey, converter, _ = _nsImageOptions[key]
+            if converter is not None:
+                value = converter(value)
+            properties[nsKey] = value
+    return properties
+
+
+def _makeImageData(pdfPage, fileType, options, ensureEvenPixelDimensions=False, fileExtensions=()):
+    imageRep = _makePDFPageImageRep(pdfPage, options, ensureEvenPixelDimensions, fileExtensions)
+    return imageRep.representationUsingType_properties_(fileType, _getImageProperties(options))
+
+
+def _makePDFPageImageRep(pdfPage, options, ensureEvenPixelDimensions=False, fileExtensions=()):
+    imageRep = _makeBitmapImageRep(
+        pdfPage=pdfPage,
+        antiAliasing=options.get("antiAliasing", True),
+        fontSubpixelQuantization=options.get("fontSubpixelQuantization", True),
+        imageResolution=options.get("imageResolution", 72.0),
+    )
+    if ensureEvenPixelDimensions:
+        if imageRep.pixelsWide() % 2 or imageRep.pixelsHigh() % 2:
+            msg = f"Exporting to {', '.join(fileExtensions)} doesn't support odd pixel dimensions for width and height."
+            raise DrawBotError(msg)
+    return imageRep
+
+
+def _writePDFPagesToImageFiles(pdfPath, pages, fileType, options, ensureEvenPixelDimensions, fileExtensions):
+    # runs in a worker process
+    pdfDocument = Quartz.PDFDocument.alloc().initWithURL_(AppKit.NSURL.fileURLWithPath_(pdfPath))
+    for index, imagePath in pages:
+        pool = AppKit.NSAutoreleasePool.alloc().init()
+        try:
+            page = pdfDocument.pageAtIndex_(index)
+            imageData = _makeImageData(page, fileType, options, ensureEvenPixelDimensions, fileExtensions)
+            imageData.writeToFile_atomically_(imagePath, True)
+            del page, imageData
+        finally:
+            del pool
 
 
 def _makeBitmapImageRep(
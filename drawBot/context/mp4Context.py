@@ -2,10 +2,25 @@ import os
 import shutil
 import tempfile
 
-from drawBot.misc import warnings
+import AppKit  # type: ignore
+import Quartz  # type: ignore
 
-from .imageContext import PNGContext
-from .tools.mp4Tools import generateMP4
+from drawBot.misc import DrawBotError, warnings
+
+from .imageContext import PNGContext, _makePDFPageImageRep
+from .tools.mp4Tools import MP4Pipe, generateMP4
+
+
+def _getRGBAData(imageRep):
+    width = imageRep.pixelsWide()
+    height = imageRep.pixelsHigh()
+    bytesPerRow = imageRep.bytesPerRow()
+    data = imageRep.bitmapData()
+    rowSize = width * 4
+    if bytesPerRow == rowSize:
+        return bytes(data[: rowSize * height])
+    # strip the row padding
+    return b"".join(bytes(data[y * bytesPerRow : y * bytesPerRow + rowSize]) for y in range(height))
 
 
 class MP4Context(PNGContext):
@@ -17,15 +32,63 @@ class MP4Context(PNGContext):
             "The codec to be used by ffmpeg. By default it is 'libx264' (for H.264). The 'mpeg4' codec gives better results when importing the movie into After Effects, at the expense of a larger file size.",
         ),
     ]
-    saveImageOptions.extend((key, doc) for key, doc in PNGContext.saveImageOptions if key != "multipage")
+    saveImageOptions.extend(
+        (key, doc) for key, doc in PNGContext.saveImageOptions if key not in ("multipage", "pageCache")
+    )
 
     _defaultFrameDuration = 1 / 10
 
     ensureEvenPixelDimensions = True
+    usesFrameDurations = True
 
     def __init__(self):
         super(MP4Context, self).__init__()
         self._frameDurations = []
+        self._mp4Pipe = None
+
+    def _supportsPageCache(self, options):
+        # the frame durations are part of the skipped drawing instructions
+        return False
+
+    def _prepareSaveImage(self, path, options):
+        # stream all frames as raw pixel data directly into ffmpeg
+        super()._prepareSaveImage(path, dict(options, multipage=True))
+
+    def _pageDataCompleted(self, data):
+        frameIndex = self._streamPageCount
+        self._streamPageCount += 1
+        frameDuration = self._frameDurations[frameIndex]
+        pool = AppKit.NSAutoreleasePool.alloc().init()
+        try:
+            page = Quartz.PDFDocument.alloc().initWithData_(data).pageAtIndex_(0)
+            imageRep = _makePDFPageImageRep(
+                page, self._streamOptions, self.ensureEvenPixelDimensions, self.fileExtensions
+            )
+            width, height = imageRep.pixelsWide(), imageRep.pixelsHigh()
+            if self._mp4Pipe is None:
+                self._mp4Pipe = MP4Pipe(
+                    self._streamPath,
+                    width,
+                    height,
+                    round(1.0 / frameDuration, 3),
+                    self._streamOptions.get("ffmpegCodec", "libx264"),
+                    self._getPlannedFrameDurations(),
+                )
+            elif (width, height) != (self._mp4Pipe.width, self._mp4Pipe.height):
+                self._mp4Pipe.close()
+                raise DrawBotError("Exporting to mp4 requires all frames to have the same size.")
+            self._mp4Pipe.writeFrame(_getRGBAData(imageRep))
+            del page, imageRep
+        finally:
+            del pool
+
+    def _getPlannedFrameDurations(self):
+        # the frames are streamed into ffmpeg, the timestamps of all frames must be known before the first frame
+        if self._plannedFrameDurations is None:
+            return None
+        return [
+            self._defaultFrameDuration if duration is None else duration for duration in self._plannedFrameDurations
+        ]
 
     def _frameDuration(self, frameDuration):
         self._frameDurations[-1] = frameDuration
@@ -42,15 +105,32 @@ class MP4Context(PNGContext):
         self.restore()
 
     def _writeDataToFile(self, data, path, options):
+        if self._streamPages:
+            try:
+                # data only contains the last frame
+                self._pageDataCompleted(data)
+            finally:
+                if self._mp4Pipe is not None:
+                    self._mp4Pipe.close()
+                    self._mp4Pipe = None
+            if self._plannedFrameDurations is None and len(set(self._frameDurations)) > 1:
+                warnings.warn(
+                    "Exporting to mp4 doesn't support varying frame durations, only the first value was used."
+                )
+            return
         frameRate = round(1.0 / self._frameDurations[0], 3)
-        frameDurations = set(self._frameDurations)
-        if len(frameDurations) > 1:
-            warnings.warn("Exporting to mp4 doesn't support varying frame durations, only the first value was used.")
         options["multipage"] = True
         codec = options.get("ffmpegCodec", "libx264")
         tempDir = tempfile.mkdtemp(suffix=".mp4tmp")
         try:
             super(MP4Context, self)._writeDataToFile(data, os.path.join(tempDir, "frame.png"), options)
-            generateMP4(os.path.join(tempDir, "frame_%d.png"), path, frameRate, codec)
+            frameCount = len(self._frameDurations)
+            if len(set(self._frameDurations)) > 1:
+                # the last frame is repeated to mark the end of the last frame
+                shutil.copyfile(
+                    os.path.join(tempDir, f"frame_{frameCount}.png"),
+                    os.path.join(tempDir, f"frame_{frameCount + 1}.png"),
+                )
+            generateMP4(os.path.join(tempDir, "frame_%d.png"), path, frameRate, codec, self._frameDurations)
         finally:
             shutil.rmtree(tempDir)
@@ -0,0 +1,31 @@
+class MultiContext:
+    """
+    Fan out every drawing callback to several contexts,
+    so an instruction stack can be replayed once into multiple output formats.
+    """
+
+    def __init__(self, contexts):
+        self._contexts = list(contexts)
+        # the indexes of the contexts drawing the current page
+        self._drawIndexes = set(range(len(self._contexts)))
+
+    def drawCachedPage(self, instructionSet):
+        # each context looks up the page in its own page cache,
+        # the page is only drawn in the contexts without a cached page
+        self._drawIndexes = set(
+            index for index, context in enumerate(self._contexts) if not context.drawCachedPage(instructionSet)
+        )
+        return not self._drawIndexes
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        callbacks = [getattr(context, attr) for context in self._contexts]
+
+        def callback(*args, **kwargs):
+            drawIndexes = self._drawIndexes
+            for index, contextCallback in enumerate(callbacks):
+                if index in drawIndexes:
+                    contextCallback(*args, **kwargs)
+
+        return callback
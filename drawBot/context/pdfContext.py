@@ -1,3 +1,5 @@
+import os
+
 import AppKit  # type: ignore
 import CoreText
 import Quartz  # type: ignore
@@ -5,8 +7,9 @@ from packaging.version import Version
 
 from ..macOSVersion import macOSVersion
 from ..misc import DrawBotError, isGIF, isPDF
-from .baseContext import BaseContext, FormattedString, newFramesetterWithAttributedString
+from .baseContext import BaseContext, FormattedString
 from .tools import gifTools
+from .tools.pathData import CLOSEPATH, CURVETO, LINETO, MOVETO
 
 
 def sendPDFtoPrinter(pdfDocument):
@@ -32,12 +35,23 @@ class PDFContext(BaseContext):
             "multipage",
             "If False, only the last page in the document will be saved into the output PDF. This value is ignored if it is None (default).",
         ),
+        (
+            "pageCache",
+            "A folder path to cache each rendered page. Pages with unchanged drawing instructions are reused from the cache on a next export. See `pageCacheStats()`.",
+        ),
     ]
 
     def __init__(self):
         super(PDFContext, self).__init__()
         self._hasContext = False
+        # both are None when no page is drawn, or when all pages came from the page cache
+        self._pdfContext = None
+        self._pdfData = None
         self._cachedImages = {}
+        self._cachedPageDocuments = []
+        # when streaming pages, every page is a separate pdf document
+        # handed over to `_pageDataCompleted` as soon as the page is finished
+        self._streamPages = False
 
     def _newPage(self, width, height):
         self.size(width, height)
@@ -45,6 +59,12 @@ class PDFContext(BaseContext):
 
         # reset the context
         self.reset()
+        if self._hasContext and self._streamPages:
+            # flush the finished page
+            self._closeContext()
+            self._pageDataCompleted(self._pdfData)
+            self._pdfContext = None
+            self._pdfData = None
         if self._hasContext:
             # add a new page
             Quartz.CGContextEndPage(self._pdfContext)
@@ -57,6 +77,9 @@ class PDFContext(BaseContext):
             Quartz.CGContextBeginPage(self._pdfContext, mediaBox)
             self._hasContext = True
 
+    def _pageDataCompleted(self, data):
+        pass
+
     def _closeContext(self):
         Quartz.CGContextEndPage(self._pdfContext)
         Quartz.CGPDFContextClose(self._pdfContext)
@@ -66,7 +89,8 @@ class PDFContext(BaseContext):
         generatedObject = None
         pool = AppKit.NSAutoreleasePool.alloc().init()
         try:
-            self._closeContext()
+            if self._hasContext:
+                self._closeContext()
             generatedObject = self._writeDataToFile(self._pdfData, path, options)
             self._pdfContext = None
             self._pdfData = None
@@ -74,10 +98,28 @@ class PDFContext(BaseContext):
             del pool
         return generatedObject
 
+    def _supportsPageCache(self, options):
+        return True
+
+    def _insertCachedPage(self, path):
+        pdfDocument = Quartz.CGPDFDocumentCreateWithURL(AppKit.NSURL.fileURLWithPath_(path))
+        page = Quartz.CGPDFDocumentGetPage(pdfDocument, 1)
+        width, height = Quartz.CGPDFPageGetBoxRect(page, Quartz.kCGPDFMediaBox).size
+        self.newPage(width, height)
+        Quartz.CGContextDrawPDFPage(self._pdfContext, page)
+        # keep the cached document alive until the pdf is written
+        self._cachedPageDocuments.append(pdfDocument)
+
     def _writeDataToFile(self, data, path, options):
         multipage = options.get("multipage")
         if multipage is None:
             multipage = True
+        if self._pageCache is not None:
+            pdfDocument = Quartz.PDFDocument.alloc().initWithData_(data)
+            for index, key in enumerate(self._pageCacheKeys):
+                if key is not None and not os.path.exists(self._pageCache.getPath(key)):
+                    pageData = pdfDocument.pageAtIndex_(index).dataRepresentation()
+                    self._storeCachedPage(index, data=bytes(pageData))
         if not multipage:
             pdfDocument = Quartz.PDFDocument.alloc().initWithData_(data)
             page = pdfDocument.pageAtIndex_(pdfDocument.pageCount() - 1)
@@ -156,19 +198,50 @@ class PDFContext(BaseContext):
             self._pdfPath(self._state.path)
             Quartz.CGContextClip(self._pdfContext)
 
-    def _textBox(self, txt, box, align):
-        path, (x, y) = self._getPathForFrameSetter(box)
+    def _defineSymbol(self, symbol):
+        bounds = symbol.path.bounds()
+        if bounds is None:
+            return None
+        # draw the symbol in a separate pdf page,
+        # a pdf page drawn in a pdf context is embedded once as a form xobject
+        xMin, yMin, xMax, yMax = bounds
+        margin = abs(self._state.strokeWidth) * (self._state.miterLimit or 10)
+        if self._state.shadow is not None:
+            offsetX, offsetY = self._state.shadow.offset
+            margin += max(abs(offsetX), abs(offsetY)) + self._state.shadow.blur * 2
+        mediaBox = Quartz.CGRectMake(xMin - margin, yMin - margin, xMax - xMin + 2 * margin, yMax - yMin + 2 * margin)
+        symbolData = Quartz.CFDataCreateMutable(None, 0)
+        dataConsumer = Quartz.CGDataConsumerCreateWithCFData(symbolData)
+        symbolContext = Quartz.CGPDFContextCreate(dataConsumer, mediaBox, None)
+        Quartz.CGContextBeginPage(symbolContext, mediaBox)
+        pdfContext, currentPath = self._pdfContext, self._state.path
+        self._pdfContext = symbolContext
+        self._state.path = symbol.path
+        try:
+            self._drawPath()
+        finally:
+            self._pdfContext = pdfContext
+            self._state.path = currentPath
+        Quartz.CGContextEndPage(symbolContext)
+        Quartz.CGPDFContextClose(symbolContext)
+        dataProvider = Quartz.CGDataProviderCreateWithCFData(symbolData)
+        return Quartz.CGPDFDocumentCreateWithProvider(dataProvider)
+
+    def _placeSymbol(self, symbolData, transformMatrix):
+        if symbolData is None:
+            return
+        self._save()
+        Quartz.CGContextConcatCTM(self._pdfContext, transformMatrix)
+        Quartz.CGContextDrawPDFPage(self._pdfContext, Quartz.CGPDFDocumentGetPage(symbolData, 1))
+        self._restore()
 
+    def _textBox(self, txt, box, align, start):
         canDoGradients = not isinstance(txt, FormattedString)
-        attrString = self.attributedString(txt, align=align)
-        if self._state.hyphenation:
-            attrString = self.hyphenateAttributedString(attrString, path)
-
-        setter = newFramesetterWithAttributedString(attrString)
-        frame = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
+        textFrame = self._getTextFrame(self.attributedString(txt, align=align), box, start)
+        x, y = textFrame.origin
 
-        ctLines = CoreText.CTFrameGetLines(frame)
-        origins = CoreText.CTFrameGetLineOrigins(frame, (0, len(ctLines)), None)
+        ctLines = textFrame.lines
+        origins = textFrame.lineOrigins
         for i, (originX, originY) in enumerate(origins):
             ctLine = ctLines[i]
             bounds = CoreText.CTLineGetImageBounds(ctLine, self._pdfContext)
@@ -319,24 +392,15 @@ class PDFContext(BaseContext):
     # helpers
 
     def _pdfPath(self, path):
-        path = path.getNSBezierPath()
-        for i in range(path.elementCount()):
-            instruction, points = path.elementAtIndex_associatedPoints_(i)
-            if instruction == AppKit.NSMoveToBezierPathElement:
-                Quartz.CGContextMoveToPoint(self._pdfContext, points[0].x, points[0].y)
-            elif instruction == AppKit.NSLineToBezierPathElement:
-                Quartz.CGContextAddLineToPoint(self._pdfContext, points[0].x, points[0].y)
-            elif instruction == AppKit.NSCurveToBezierPathElement:
-                Quartz.CGContextAddCurveToPoint(
-                    self._pdfContext,
-                    points[0].x,
-                    points[0].y,
-                    points[1].x,
-                    points[1].y,
-                    points[2].x,
-                    points[2].y,
-                )
-            elif instruction == AppKit.NSClosePathBezierPathElement:
+        for segmentType, points in path._getPathData().elements():
+            if segmentType == MOVETO:
+                Quartz.CGContextMoveToPoint(self._pdfContext, *points[0])
+            elif segmentType == LINETO:
+                Quartz.CGContextAddLineToPoint(self._pdfContext, *points[0])
+            elif segmentType == CURVETO:
+                (x1, y1), (x2, y2), (x3, y3) = points
+                Quartz.CGContextAddCurveToPoint(self._pdfContext, x1, y1, x2, y2, x3, y3)
+            elif segmentType == CLOSEPATH:
                 Quartz.CGContextClosePath(self._pdfContext)
 
     def _pdfFillColor(self, c=None):
@@ -67,7 +67,7 @@ class PrintContext(BaseContext):
     def _transform(self, matrix):
         print("transform %s" % " ".join(["%s" % i for i in matrix]))
 
-    def _textBox(self, txt, xywh, align):
+    def _textBox(self, txt, xywh, align, start):
         # XXX
         # should a formatted string be printed in parts???
         x, y, w, h = xywh
@@ -1,5 +1,7 @@
 import base64
+import gzip
 import os
+import shutil
 
 import AppKit  # type: ignore
 import CoreText
@@ -15,9 +17,9 @@ from .baseContext import (
     Gradient,
     GraphicsState,
     Shadow,
-    newFramesetterWithAttributedString,
 )
 from .imageContext import _makeBitmapImageRep
+from .tools.pathData import svgPathData
 
 
 class _UniqueIDGenerator:
@@ -50,7 +52,7 @@ class SVGFile:
 
     def writeToFile(self, path):
         data = self.read()
-        f = open(path, "wb")
+        f = _openSVGFile(path)
         f.write(data)
         f.close()
 
@@ -61,6 +63,13 @@ class SVGFile:
         pass
 
 
+def _openSVGFile(path):
+    if path.endswith(".svgz"):
+        # no time stamp in the gzip header, the output only depends on the drawing
+        return gzip.GzipFile(path, "wb", mtime=0)
+    return open(path, "wb")
+
+
 # subclass some object to add some svg api
 
 
@@ -233,6 +242,7 @@ class SVGContext(BaseContext):
     _colorClass = SVGColor
     _gradientClass = SVGGradient
     _clipPathIDGenerator = _UniqueIDGenerator("clip")
+    _symbolIDGenerator = _UniqueIDGenerator("symbol")
 
     _svgFileClass = SVGFile
 
@@ -267,14 +277,33 @@ class SVGContext(BaseContext):
     }
 
     indentation = " "
-    fileExtensions = ["svg"]
+    fileExtensions = ["svg", "svgz"]
     saveImageOptions = [
         ("multipage", "Output a numbered svg file for each page or frame in the document."),
+        (
+            "pageCache",
+            "A folder path to cache each svg page. Pages with unchanged drawing instructions are reused from the cache on a next export. See `pageCacheStats()`.",
+        ),
+        (
+            "svgPathPrecision",
+            "The number of decimals for coordinates in svg paths, set to `None` to keep all decimals. Defaults to `2`.",
+        ),
+        (
+            "svgPathRelative",
+            "A boolean to write svg path segments relative to the previous point, or with absolute coordinates. Defaults to `True`.",
+        ),
     ]
 
+    _svgPathPrecision = 2
+    _svgPathRelative = True
+
     def __init__(self):
         super(SVGContext, self).__init__()
         self._pages = []
+        self._streamPages = False
+        # symbols are written once in each svg file
+        self._svgPageSymbols = set()
+        self._svgPageDefs = set()
 
     # not supported in a svg context
 
@@ -300,33 +329,44 @@ class SVGContext(BaseContext):
     def shadow(self, offset, blur, color):
         super(SVGContext, self).shadow(offset, blur, color)
         if self._state.shadow is not None:
-            self._state.shadow.writeDefs(self._svgContext)
+            self._writeDefs(self._state.shadow)
 
     def linearGradient(self, startPoint=None, endPoint=None, colors=None, locations=None):
         super(SVGContext, self).linearGradient(startPoint, endPoint, colors, locations)
         if self._state.gradient is not None:
-            self._state.gradient.writeDefs(self._svgContext)
+            self._writeDefs(self._state.gradient)
 
     def radialGradient(self, startPoint=None, endPoint=None, colors=None, locations=None, startRadius=0, endRadius=100):
         super(SVGContext, self).radialGradient(startPoint, endPoint, colors, locations, startRadius, endRadius)
         if startRadius != 0:
             warnings.warn("radialGradient will clip the startRadius to '0' in a svg context.")
         if self._state.gradient is not None:
-            self._state.gradient.writeDefs(self._svgContext)
+            self._writeDefs(self._state.gradient)
 
     # svg
 
+    def _writeDefs(self, item):
+        # shadows and gradients are written once per page
+        item.writeDefs(self._svgContext)
+        self._svgPageDefs.add(item.tagID)
+
     def _reset(self, other=None):
         self._embeddedFonts = set()
         self._embeddedImages = dict()
 
     def _newPage(self, width, height):
-        if hasattr(self, "_svgContext"):
-            self._svgContext.endtag("svg")
+        self._endSVGPage()
         self.reset()
         self.size(width, height)
-        self._svgData = self._svgFileClass()
-        self._pages.append(self._svgData)
+        self._svgPageSymbols = set()
+        self._svgPageDefs = set()
+        if self._streamPages:
+            # write the page straight into its file, only the current page is kept in memory
+            self._streamPageCount += 1
+            self._svgData = _openSVGFile(self._getStreamPagePath(self._streamPageCount))
+        else:
+            self._svgData = self._svgFileClass()
+            self._pages.append(self._svgData)
         self._svgContext = XMLWriter(self._svgData, encoding="utf-8", indentwhite=self.indentation)
         self._svgContext.width = self.width
         self._svgContext.height = self.height
@@ -335,11 +375,47 @@ class SVGContext(BaseContext):
         self._svgContext.newline()
         self._state.transformMatrix = self._state.transformMatrix.scale(1, -1).translate(0, -self.height)
 
+    def _endSVGPage(self):
+        if not hasattr(self, "_svgContext"):
+            return
+        self._svgContext.endtag("svg")
+        del self._svgContext
+        if self._streamPages:
+            self._svgData.close()
+            self._storeCachedPage(self._streamPageCount - 1, path=self._getStreamPagePath(self._streamPageCount))
+        self._svgData = None
+
+    def _getStreamPagePath(self, pageNumber):
+        if not self._streamMultipage:
+            # only the last page is exported, every page overwrites the previous one
+            return self._streamPath
+        fileName, fileExt = os.path.splitext(self._streamPath)
+        return f"{fileName}_{pageNumber}{fileExt}"
+
+    def _prepareSaveImage(self, path, options):
+        self._svgPathPrecision = options.get("svgPathPrecision", 2)
+        self._svgPathRelative = options.get("svgPathRelative", True)
+        self._streamPages = True
+        self._streamPath = path
+        self._streamMultipage = bool(options.get("multipage"))
+        self._streamPageCount = 0
+
+    def _supportsPageCache(self, options):
+        return True
+
+    def _insertCachedPage(self, path):
+        self._endSVGPage()
+        self._streamPageCount += 1
+        shutil.copyfile(path, self._getStreamPagePath(self._streamPageCount))
+
     def _saveImage(self, path, options):
+        self._endSVGPage()
+        if self._streamPages:
+            # all pages are already written
+            return
         multipage = options.get("multipage")
         if multipage is None:
             multipage = False
-        self._svgContext.endtag("svg")
         fileName, fileExt = os.path.splitext(path)
         firstPage = 0
         pageCount = len(self._pages)
@@ -397,17 +473,58 @@ class SVGContext(BaseContext):
         self._svgContext.newline()
         self._state.clipPathID = uniqueID
 
-    def _textBox(self, rawTxt, box, align):
-        path, (x, y) = self._getPathForFrameSetter(box)
+    def _defineSymbol(self, symbol):
+        if not symbol.path:
+            return None
+        data = self._svgDrawingAttributes()
+        data["d"] = self._svgPath(symbol.path)
+        if symbol.path.svgClass:
+            data["class"] = symbol.path.svgClass
+        defs = []
+        if self._state.shadow is not None:
+            data["filter"] = "url(#%s)" % self._state.shadow.tagID
+            defs.append(self._state.shadow)
+        if self._state.gradient is not None:
+            data["fill"] = "url(#%s)" % self._state.gradient.tagID
+            defs.append(self._state.gradient)
+        return self._symbolIDGenerator.gen(), data, defs
+
+    def _placeSymbol(self, symbolData, transformMatrix):
+        if symbolData is None:
+            return
+        symbolID, data, defs = symbolData
+        if symbolID not in self._svgPageSymbols:
+            # the shadow and gradient used by the symbol must be defined on each page placing it
+            for item in defs:
+                if item.tagID not in self._svgPageDefs:
+                    self._writeDefs(item)
+            self._svgContext.begintag("defs")
+            self._svgContext.newline()
+            self._svgContext.begintag("symbol", id=symbolID, overflow="visible")
+            self._svgContext.newline()
+            self._svgContext.simpletag("path", **data)
+            self._svgContext.newline()
+            self._svgContext.endtag("symbol")
+            self._svgContext.newline()
+            self._svgContext.endtag("defs")
+            self._svgContext.newline()
+            self._svgPageSymbols.add(symbolID)
+        self._svgBeginClipPath()
+        data = {
+            "xlink:href": "#%s" % symbolID,
+            "transform": self._svgTransform(self._state.transformMatrix.transform(transformMatrix)),
+        }
+        self._svgContext.simpletag("use", **data)
+        self._svgContext.newline()
+        self._svgEndClipPath()
+
+    def _textBox(self, rawTxt, box, align, start):
         canDoGradients = True
         if align == "justified":
             warnings.warn("justified text is not supported in a svg context")
-        attrString = self.attributedString(rawTxt, align=align)
-        if self._state.hyphenation:
-            attrString = self.hyphenateAttributedString(attrString, path)
-        txt = attrString.string()
-        setter = newFramesetterWithAttributedString(attrString)
-        box = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
+        textFrame = self._getTextFrame(self.attributedString(rawTxt, align=align), box, start)
+        x, y = textFrame.origin
+        txt = textFrame.attributedString.string()
 
         self._svgBeginClipPath()
         defaultData = self._svgDrawingAttributes()
@@ -429,8 +546,8 @@ class SVGContext(BaseContext):
         self._svgContext.begintag("text", **data)
         self._svgContext.newline()
 
-        ctLines = CoreText.CTFrameGetLines(box)
-        origins = CoreText.CTFrameGetLineOrigins(box, (0, len(ctLines)), None)
+        ctLines = textFrame.lines
+        origins = textFrame.lineOrigins
         for i, (originX, originY) in enumerate(origins):
             ctLine = ctLines[i]
             # bounds = CoreText.CTLineGetImageBounds(ctLine, self._pdfContext)
@@ -600,42 +717,11 @@ class SVGContext(BaseContext):
         return "matrix(%s)" % (",".join([repr(s) for s in transform]))
 
     def _svgPath(self, path, transformMatrix=None):
-        path = path.getNSBezierPath()
+        pathData = path._getPathData()
         if transformMatrix:
-            path = path.copy()
-            aT = AppKit.NSAffineTransform.transform()
-            aT.setTransformStruct_(transformMatrix[:])
-            path.transformUsingAffineTransform_(aT)
-        svg = ""
-        for i in range(path.elementCount()):
-            instruction, points = path.elementAtIndex_associatedPoints_(i)
-            if instruction == AppKit.NSMoveToBezierPathElement:
-                svg += "M%s,%s " % (formatNumber(points[0].x), formatNumber(points[0].y))
-                previousPoint = points[-1]
-            elif instruction == AppKit.NSLineToBezierPathElement:
-                x = points[0].x - previousPoint.x
-                y = points[0].y - previousPoint.y
-                svg += "l%s,%s " % (formatNumber(x), formatNumber(y))
-                previousPoint = points[-1]
-            elif instruction == AppKit.NSCurveToBezierPathElement:
-                offx1 = points[0].x - previousPoint.x
-                offy1 = points[0].y - previousPoint.y
-                offx2 = points[1].x - previousPoint.x
-                offy2 = points[1].y - previousPoint.y
-                x = points[2].x - previousPoint.x
-                y = points[2].y - previousPoint.y
-                svg += "c%s,%s,%s,%s,%s,%s " % (
-                    formatNumber(offx1),
-                    formatNumber(offy1),
-                    formatNumber(offx2),
-                    formatNumber(offy2),
-                    formatNumber(x),
-                    formatNumber(y),
-                )
-                previousPoint = points[-1]
-            elif instruction == AppKit.NSClosePathBezierPathElement:
-                svg += "Z "
-        return svg.strip()
+            pathData = pathData.copy()
+            pathData.transform(transformMatrix)
+        return svgPathData(pathData, precision=self._svgPathPrecision, relative=self._svgPathRelative)
 
     def _svgBeginClipPath(self):
         if self._state.clipPathID:
@@ -0,0 +1,158 @@
+"""
+A character coverage index of fonts, built from the cmap ranges of the font index, without any dependency on AppKit.
+
+The coverage of a font is a compressed bitset: a dictionary of blocks of 256 unicode values to a 256 bit integer.
+A coverage index answers which fonts cover a string of characters: for each character the fonts covering it
+are a bitset of font indexes, built once, and a query is a bitwise and of these bitsets.
+"""
+
+from array import array
+
+from . import fontIndex
+
+_blockShift = 8
+_blockMask = (1 << _blockShift) - 1
+
+
+def _rangesToBlocks(cmapRanges):
+    ranges = array("I")
+    ranges.frombytes(cmapRanges)
+    blocks = {}
+    for start, end in zip(ranges[0::2], ranges[1::2]):
+        while start <= end:
+            block = start >> _blockShift
+            blockEnd = min(end, (block << _blockShift) | _blockMask)
+            bits = ((1 << (blockEnd - start + 1)) - 1) << (start & _blockMask)
+            blocks[block] = blocks.get(block, 0) | bits
+            start = blockEnd + 1
+    return blocks
+
+
+def _charactersToBlocks(characters):
+    blocks = {}
+    for character in characters:
+        value = ord(character)
+        block = value >> _blockShift
+        blocks[block] = blocks.get(block, 0) | (1 << (value & _blockMask))
+    return blocks
+
+
+class FontCoverage:
+    """
+    The unicode coverage of a single font.
+    """
+
+    __slots__ = ("blocks",)
+
+    def __init__(self, blocks=None):
+        self.blocks = blocks or {}
+
+    @classmethod
+    def fromRanges(cls, cmapRanges):
+        return cls(_rangesToBlocks(cmapRanges))
+
+    def __contains__(self, character):
+        value = ord(character)
+        return bool(self.blocks.get(value >> _blockShift, 0) & (1 << (value & _blockMask)))
+
+    def __len__(self):
+        return sum(bits.bit_count() for bits in self.blocks.values())
+
+    def containsCharacters(self, characters):
+        blocks = self.blocks
+        for block, bits in _charactersToBlocks(characters).items():
+            if blocks.get(block, 0) & bits != bits:
+                return False
+        return True
+
+
+class CoverageIndex:
+    """
+    The unicode coverage of many fonts, by font name.
+    """
+
+    def __init__(self):
+        self.fontNames = []
+        self._coverages = []
+        self._fontIndexes = {}
+        # unicode value: bitset of the indexes of the fonts covering it
+        self._characterFonts = {}
+
+    @classmethod
+    def fromFontFiles(cls, paths):
+        """
+        Build a coverage index of all fonts in the given font files.
+        Files that can not be read by fontTools are skipped.
+        """
+        coverageIndex = cls()
+        for path in paths:
+            coverageIndex.addFontFile(path)
+        return coverageIndex
+
+    def addFontFile(self, path):
+        """
+        Add the coverage of all fonts in a font file, a file that can not be read by fontTools is skipped.
+        Return True when the cmap of the fonts had to be read from the font file, False when it came from the font index.
+        """
+        try:
+            records = fontIndex.getFontRecords(path)
+            wasRead = not all(record.isStored("cmapRanges") for record in records)
+            cmapRanges = [(record["psName"], record["cmapRanges"]) for record in records]
+        except Exception:
+            # not a font file fontTools can read
+            return True
+        for psName, ranges in cmapRanges:
+            if psName is not None and ranges:
+                self.addFont(psName, FontCoverage.fromRanges(ranges))
+        return wasRead
+
+    def addFont(self, fontName, coverage):
+        """
+        Add the coverage of a font, the first coverage is kept when a font name is added twice.
+        """
+        if fontName in self._fontIndexes:
+            return
+        self._fontIndexes[fontName] = len(self.fontNames)
+        self.fontNames.append(fontName)
+        self._coverages.append(coverage)
+        self._characterFonts.clear()
+
+    def __contains__(self, fontName):
+        return fontName in self._fontIndexes
+
+    def __len__(self):
+        return len(self.fontNames)
+
+    def getCoverage(self, fontName):
+        return self._coverages[self._fontIndexes[fontName]]
+
+    def _getCharacterFonts(self, value):
+        fonts = self._characterFonts.get(value)
+        if fonts is None:
+            block = value >> _blockShift
+            bit = 1 << (value & _blockMask)
+            fonts = 0
+            for index, coverage in enumerate(self._coverages):
+                if coverage.blocks.get(block, 0) & bit:
+                    fonts |= 1 << index
+            self._characterFonts[value] = fonts
+        return fonts
+
+    def fontsForCharacters(self, characters):
+        """
+        Return the names of all fonts covering all given characters.
+        """
+        fonts = (1 << len(self.fontNames)) - 1
+        for value in set(map(ord, characters)):
+            fonts &= self._getCharacterFonts(value)
+            if not fonts:
+                return []
+        fontNames = []
+        while fonts:
+            lowest = fonts & -fonts
+            fontNames.append(self.fontNames[lowest.bit_length() - 1])
+            fonts ^= lowest
+        return fontNames
+
+    def fontContainsCharacters(self, fontName, characters):
+        return self.getCoverage(fontName).containsCharacters(characters)
@@ -0,0 +1,287 @@
+"""
+A persistent index of font metadata, read with fontTools, without any dependency on AppKit.
+
+For each font file a list of records is stored, one record for each font in the file
+(a single font, the fonts in a collection or the `sfnt` resources of a suitcase).
+A record is a `FontInfo` with:
+
+* `psName`: the postscript name, or None
+* `psNames`: all distinct postscript names
+* `featureTags`: a sorted list of OpenType feature tags in the `GSUB` and `GPOS` tables
+* `aatFeatures`: a list of `(featureType, settingValue)` tuples from the `feat` table
+* `axes`: a list of `(tag, minValue, defaultValue, maxValue)` tuples from the `fvar` table
+* `namedInstances`: a list of `{axisTag: value}` locations from the `fvar` table
+* `glyphOrder`: a list of glyph names
+* `cmapRanges`: the unicode coverage as flat `array("I")` bytes of inclusive `start, end` pairs
+
+Only the postscript names are read when a font file is indexed. All other values are read from their own
+tables the first time they are requested and added to the index.
+
+The records are stored in a `marshal` file in an index folder, keyed by the path, the modification time
+and the size of the font file. A next run reads the index file and doesn't parse the font again.
+"""
+
+import functools
+import hashlib
+import marshal
+import os
+import tempfile
+from array import array
+
+from fontTools.misc.macCreatorType import getMacCreatorAndType  # type: ignore
+from fontTools.misc.macRes import ResourceReader  # type: ignore
+from fontTools.ttLib import TTFont  # type: ignore
+from fontTools.ttLib.ttCollection import TTCollection  # type: ignore
+
+# change this when the record format changes
+_indexFormatVersion = 2
+
+fontIndexFolder = os.path.join(tempfile.gettempdir(), "drawBotFontIndex")
+
+
+def _cmapRanges(cmap):
+    ranges = array("I")
+    for code in sorted(cmap):
+        if ranges and ranges[-1] == code - 1:
+            ranges[-1] = code
+        else:
+            ranges.append(code)
+            ranges.append(code)
+    return ranges.tobytes()
+
+
+def unicodesFromRanges(cmapRanges):
+    """
+    Return all unicode values of the `cmapRanges` bytes of a font record.
+    """
+    ranges = array("I")
+    ranges.frombytes(cmapRanges)
+    unicodes = []
+    for start, end in zip(ranges[0::2], ranges[1::2]):
+        unicodes.extend(range(start, end + 1))
+    return unicodes
+
+
+def _readNames(font):
+    psNames = []
+    if "name" in font:
+        for platID, platEncID in ((1, 0), (3, 1)):
+            nameRecord = font["name"].getName(6, platID, platEncID)
+            if nameRecord is not None:
+                psName = nameRecord.toUnicode()
+                if psName not in psNames:
+                    psNames.append(psName)
+    return dict(psName=psNames[0] if psNames else None, psNames=psNames)
+
+
+def _readLayoutFeatures(font):
+    featureTags = set()
+    for tableTag in ("GPOS", "GSUB"):
+        if tableTag in font and font[tableTag].table.FeatureList is not None:
+            for record in font[tableTag].table.FeatureList.FeatureRecord:
+                featureTags.add(str(record.FeatureTag))
+    aatFeatures = []
+    if "feat" in font:
+        for featureName in font["feat"].table.FeatureNames.FeatureName:
+            for featureSetting in featureName.Settings.Setting:
+                aatFeatures.append((featureName.FeatureType, featureSetting.SettingValue))
+    return dict(featureTags=sorted(featureTags), aatFeatures=aatFeatures)
+
+
+def _readVariations(font):
+    axes = []
+    namedInstances = []
+    if "fvar" in font:
+        fvar = font["fvar"]
+        for axis in fvar.axes:
+            axes.append((str(axis.axisTag), axis.minValue, axis.defaultValue, axis.maxValue))
+        for instance in fvar.instances:
+            namedInstances.append({str(tag): value for tag, value in instance.coordinates.items()})
+    return dict(axes=axes, namedInstances=namedInstances)
+
+
+def _readGlyphOrder(font):
+    return dict(glyphOrder=[str(glyphName) for glyphName in font.getGlyphOrder()])
+
+
+def _readCmap(font):
+    cmap = font.getBestCmap() if "cmap" in font else None
+    return dict(cmapRanges=_cmapRanges(cmap or {}))
+
+
+# record key: function reading that value, and the values read from the same tables, from a font
+_valueReaders = {
+    "featureTags": _readLayoutFeatures,
+    "aatFeatures": _readLayoutFeatures,
+    "axes": _readVariations,
+    "namedInstances": _readVariations,
+    "glyphOrder": _readGlyphOrder,
+    "cmapRanges": _readCmap,
+}
+
+
+def _openFonts(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".ttc", ".otc"):
+        return list(TTCollection(path, lazy=True))
+    elif ext == ".dfont" or getMacCreatorAndType(path)[1] == "FFIL":
+        reader = ResourceReader(path)
+        if "sfnt" not in reader:
+            return []
+        return [TTFont(path, lazy=True, res_name_or_index=index) for index in reader.getIndices("sfnt")]
+    return [TTFont(path, lazy=True)]
+
+
+def _readFromFonts(path, reader):
+    fonts = _openFonts(path)
+    try:
+        return [reader(font) for font in fonts]
+    finally:
+        # the fonts of a collection share a single file
+        for font in fonts:
+            font.close()
+
+
+def readFontRecords(path):
+    """
+    Read the postscript names of all fonts in a font file with fontTools, without using the index.
+    """
+    return _readFromFonts(path, _readNames)
+
+
+class FontInfo:
+    """
+    The record of a single font in a font file.
+    Values are read from the font file when they are requested for the first time, and stored in the index.
+    """
+
+    def __init__(self, path, modTime, size, fontNumber, record):
+        self.path = path
+        self.fontNumber = fontNumber
+        self._indexKey = path, modTime, size
+        self._record = record
+
+    def __getitem__(self, key):
+        record = self._record
+        if key not in record:
+            reader = _valueReaders.get(key)
+            if reader is None:
+                raise KeyError(key)
+            # read the values of the same tables for all fonts in the file at once
+            values = _readFromFonts(self.path, reader)
+            records = _getFontRecords(*self._indexKey)
+            for fontRecord, fontValues in zip(records, values):
+                fontRecord.update(fontValues)
+            record.update(values[self.fontNumber])
+            _writeIndex(_getIndexPath(*self._indexKey), records)
+        return record[key]
+
+    def __contains__(self, key):
+        return key in self._record or key in _valueReaders
+
+    def isStored(self, key):
+        """
+        Return True when the value is already stored in the index, and requesting it doesn't read the font file.
+        """
+        return key in self._record
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __eq__(self, other):
+        if not isinstance(other, FontInfo):
+            return NotImplemented
+        return (self._indexKey, self.fontNumber) == (other._indexKey, other.fontNumber)
+
+    def __hash__(self):
+        return hash((self._indexKey, self.fontNumber))
+
+    def __repr__(self):
+        return f"<FontInfo {self.path!r} {self.fontNumber}>"
+
+
+def _getIndexPath(path, modTime, size):
+    key = f"{_indexFormatVersion}:{path}:{modTime}:{size}"
+    fileName = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".marshal"
+    return os.path.join(fontIndexFolder, fileName)
+
+
+def _writeIndex(indexPath, records):
+    os.makedirs(fontIndexFolder, exist_ok=True)
+    tempPath = f"{indexPath}.{os.getpid()}.tmp"
+    with open(tempPath, "wb") as f:
+        marshal.dump(records, f)
+    os.replace(tempPath, indexPath)
+
+
+# a record for each font file of a system with many installed fonts
+@functools.lru_cache(maxsize=4096)
+def _getFontRecords(path, modTime, size):
+    indexPath = _getIndexPath(path, modTime, size)
+    if os.path.exists(indexPath):
+        try:
+            with open(indexPath, "rb") as f:
+                return marshal.loads(f.read())
+        except (EOFError, ValueError, TypeError):
+            # a broken index file, read the font again
+            pass
+    records = readFontRecords(path)
+    _writeIndex(indexPath, records)
+    return records
+
+
+def getFontRecords(path):
+    """
+    Return the records of all fonts in a font file, from the index when the font file didn't change.
+    """
+    path = os.path.abspath(os.fspath(path))
+    stat = os.stat(path)
+    records = _getFontRecords(path, stat.st_mtime_ns, stat.st_size)
+    return [
+        FontInfo(path, stat.st_mtime_ns, stat.st_size, fontNumber, record) for fontNumber, record in enumerate(records)
+    ]
+
+
+def getFontInfo(path, fontNumber=0):
+    """
+    Return the record of the font with the given `fontNumber` in a font file.
+    """
+    records = getFontRecords(path)
+    if not 0 <= fontNumber < len(records):
+        raise IndexError(f"fontNumber out of range for '{path}': {fontNumber} not in range 0..{len(records) - 1}")
+    return records[fontNumber]
+
+
+def findFontInfo(path, psName):
+    """
+    Return the record of the font with the given postscript name in a font file, or None.
+    """
+    for record in getFontRecords(path):
+        if psName in record["psNames"]:
+            return record
+    return None
+
+
+def setFontInfoValue(path, fontNumber, key, value):
+    """
+    Store an additional value in the record of a font, for values that are expensive to compute.
+    The value is stored in the index as long as the font file doesn't change.
+    """
+    path = os.path.abspath(os.fspath(path))
+    stat = os.stat(path)
+    records = _getFontRecords(path, stat.st_mtime_ns, stat.st_size)
+    records[fontNumber][key] = value
+    _writeIndex(_getIndexPath(path, stat.st_mtime_ns, stat.st_size), records)
+
+
+def clearFontIndex():
+    """
+    Remove all index files.
+    """
+    _getFontRecords.cache_clear()
+    if os.path.exists(fontIndexFolder):
+        for fileName in os.listdir(fontIndexFolder):
+            if fileName.endswith(".marshal"):
+                os.remove(os.path.join(fontIndexFolder, fileName))
@@ -0,0 +1,105 @@
+"""
+Glyph outlines as path data, read with fontTools, without any dependency on AppKit.
+
+An outline is stored once in font units, keyed by the font file, the font number, the glyph ID
+and the variation location. Drawing a glyph at a position and a font size is a placement:
+the outline is appended to a path data with a scale of `fontSize / unitsPerEm` and a translation.
+"""
+
+import functools
+import os
+
+from fontTools.pens.basePen import BasePen  # type: ignore
+from fontTools.ttLib import TTFont  # type: ignore
+
+from .pathData import PathData
+
+
+class PathDataPen(BasePen):
+    """
+    A pen drawing into a path data, quadratic curves are converted to cubic curves.
+    """
+
+    def __init__(self, glyphSet=None):
+        super().__init__(glyphSet)
+        self.pathData = PathData()
+
+    def _moveTo(self, pt):
+        self.pathData.moveTo(*pt)
+
+    def _lineTo(self, pt):
+        self.pathData.lineTo(*pt)
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        self.pathData.curveTo(*pt1, *pt2, *pt3)
+
+    def _closePath(self):
+        self.pathData.closePath()
+
+
+# only the most recently used font file is kept open
+_openFont = None
+
+
+def _getFont(path, fontNumber, modTime):
+    global _openFont
+    key = path, fontNumber, modTime
+    if _openFont is None or _openFont[0] != key:
+        _closeFont()
+        _openFont = key, TTFont(path, lazy=True, fontNumber=fontNumber)
+    return _openFont[1]
+
+
+def _closeFont():
+    global _openFont
+    if _openFont is not None:
+        _openFont[1].close()
+        _openFont = None
+
+
+def _locationKey(location):
+    if not location:
+        return None
+    return tuple(sorted(location.items()))
+
+
+@functools.lru_cache(maxsize=4096)
+def _getGlyphOutline(path, fontNumber, modTime, glyphID, locationKey):
+    font = _getFont(path, fontNumber, modTime)
+    glyphSet = font.getGlyphSet(location=dict(locationKey) if locationKey else None)
+    pen = PathDataPen(glyphSet)
+    glyphSet[font.getGlyphName(glyphID)].draw(pen)
+    return pen.pathData
+
+
+def getGlyphOutline(path, glyphID, fontNumber=0, location=None):
+    """
+    Return the outline of a glyph in font units as a path data.
+    Optionally `location` is a dictionary of axis tags and user space values.
+    The returned path data is cached and must not be changed.
+    """
+    path = os.path.abspath(os.fspath(path))
+    return _getGlyphOutline(path, fontNumber, os.stat(path).st_mtime_ns, glyphID, _locationKey(location))
+
+
+def getUnitsPerEm(path, fontNumber=0):
+    path = os.path.abspath(os.fspath(path))
+    return _getFont(path, fontNumber, os.stat(path).st_mtime_ns)["head"].unitsPerEm
+
+
+def placeGlyphOutline(pathData, outline, fontSize, unitsPerEm, x, y):
+    """
+    Append a glyph outline in font units to a path data, at a font size and a position.
+    """
+    if outline.isEmpty():
+        return
+    scale = fontSize / unitsPerEm
+    pathData.extendTransformed(outline, (scale, 0, 0, scale, x, y))
+
+
+def clearGlyphOutlines():
+    """
+    Remove all cached outlines and close the open font file.
+    """
+    _getGlyphOutline.cache_clear()
+    _closeFont()
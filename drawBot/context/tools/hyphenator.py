@@ -0,0 +1,250 @@
+"""
+A pure Python hyphenator with Frank Liang's pattern algorithm, as used by TeX, without any dependency on AppKit.
+
+Patterns are read from TeX pattern files (`\\patterns{..}` and `\\hyphenation{..}`)
+or from LibreOffice/Hunspell `hyph_*.dic` files. Parsed patterns are compiled into a
+`marshal` file in a cache folder, a next load reads the compiled file when the source file did not change.
+"""
+
+import functools
+import hashlib
+import marshal
+import os
+import re
+import tempfile
+
+# change this when the compiled format changes
+_compiledFormatVersion = 1
+
+compiledPatternsFolder = os.path.join(tempfile.gettempdir(), "drawBotHyphenation")
+
+_texGroupRE = re.compile(r"\\(patterns|hyphenation)\s*\{([^}]*)\}", re.DOTALL)
+_texCommentRE = re.compile(r"(?<!\\)%.*")
+_dicHexRE = re.compile(r"\^\^([0-9a-f]{2})")
+
+
+def _parsePattern(pattern):
+    # "hy1p" -> ("hyp", b"\x00\x00\x01\x00")
+    letters = []
+    points = [0]
+    for char in pattern:
+        if char.isdigit():
+            points[-1] = int(char)
+        else:
+            letters.append(char)
+            points.append(0)
+    return "".join(letters), bytes(points)
+
+
+def parsePatterns(text):
+    """
+    Parse the content of a TeX pattern file or a `hyph_*.dic` file.
+
+    Returns a dictionary with `patterns`, `exceptions`, `leftMin` and `rightMin`.
+    """
+    patterns = {}
+    exceptions = {}
+    leftMin = 2
+    rightMin = 2
+    if "\\patterns" in text:
+        text = _texCommentRE.sub("", text)
+        groups = [(name, content.split()) for name, content in _texGroupRE.findall(text)]
+    else:
+        patternLines = []
+        for line in text.splitlines()[1:]:
+            # the first line is the encoding
+            line = line.strip()
+            if not line or line.startswith("%") or line.startswith("#"):
+                continue
+            if line.startswith("LEFTHYPHENMIN"):
+                leftMin = int(line.split()[1])
+            elif line.startswith("RIGHTHYPHENMIN"):
+                rightMin = int(line.split()[1])
+            elif line[0].isupper() and line.split()[0].isupper():
+                # other options like NOHYPHEN or COMPOUNDLEFTHYPHENMIN
+                continue
+            elif "/" in line:
+                # non standard hyphenation patterns are not supported
+                continue
+            else:
+                # characters can be written as ^^xx hex codes
+                patternLines.append(_dicHexRE.sub(lambda m: chr(int(m.group(1), 16)), line))
+        groups = [("patterns", patternLines)]
+    for name, items in groups:
+        for item in items:
+            if name == "patterns":
+                letters, points = _parsePattern(item)
+                if letters:
+                    patterns[letters] = points
+            else:
+                word = item.replace("-", "")
+                positions = []
+                index = 0
+                for char in item:
+                    if char == "-":
+                        positions.append(index)
+                    else:
+                        index += 1
+                exceptions[word.lower()] = tuple(positions)
+    return dict(patterns=patterns, exceptions=exceptions, leftMin=leftMin, rightMin=rightMin)
+
+
+def _readPatternFile(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if not path.endswith(".dic"):
+        return data.decode("utf-8")
+    # the first line of a dic file is the encoding
+    encoding = data.split(b"\n", 1)[0].strip().decode("ascii") or "utf-8"
+    return data.decode(encoding)
+
+
+def _getCompiledPath(path):
+    stat = os.stat(path)
+    key = f"{_compiledFormatVersion}:{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    fileName = hashlib.sha1(key.encode("utf-8")).hexdigest() + ".marshal"
+    return os.path.join(compiledPatternsFolder, fileName)
+
+
+def loadPatterns(path):
+    """
+    Load the patterns of a TeX pattern file or a `hyph_*.dic` file.
+    The parsed patterns are stored in a compiled file and reused as long as the source file doesn't change.
+    """
+    compiledPath = _getCompiledPath(path)
+    if os.path.exists(compiledPath):
+        try:
+            with open(compiledPath, "rb") as f:
+                return marshal.loads(f.read())
+        except (EOFError, ValueError, TypeError):
+            # a broken compiled file, compile again
+            pass
+    data = parsePatterns(_readPatternFile(path))
+    os.makedirs(compiledPatternsFolder, exist_ok=True)
+    tempPath = compiledPath + ".tmp"
+    with open(tempPath, "wb") as f:
+        marshal.dump(data, f)
+    os.replace(tempPath, compiledPath)
+    return data
+
+
+class Hyphenator:
+    """
+    Find the hyphenation points of words with Liang's algorithm.
+
+    `patterns` is a dictionary of letters to points as bytes,
+    `exceptions` a dictionary of words to hyphenation positions.
+    The positions of the last `cacheSize` words are cached.
+    """
+
+    def __init__(self, patterns, exceptions=None, leftMin=2, rightMin=2, cacheSize=4096):
+        self.patterns = patterns
+        self.exceptions = exceptions or {}
+        self.leftMin = leftMin
+        self.rightMin = rightMin
+        self.maxPatternLength = max((len(letters) for letters in patterns), default=0)
+        self.positions = functools.lru_cache(maxsize=cacheSize)(self._positions)
+
+    @classmethod
+    def fromPath(cls, path, cacheSize=4096):
+        return cls(cacheSize=cacheSize, **loadPatterns(path))
+
+    def _positions(self, word):
+        # return the indexes in the word where the word can be hyphenated
+        wordLength = len(word)
+        if wordLength < self.leftMin + self.rightMin:
+            return ()
+        lowerWord = word.lower()
+        if len(lowerWord) != wordLength:
+            lowerWord = word
+        if lowerWord in self.exceptions:
+            positions = self.exceptions[lowerWord]
+        else:
+            patterns = self.patterns
+            maxPatternLength = self.maxPatternLength
+            dottedWord = "." + lowerWord + "."
+            dottedLength = len(dottedWord)
+            points = [0] * (dottedLength + 1)
+            for start in range(dottedLength):
+                for end in range(start + 1, min(start + maxPatternLength, dottedLength) + 1):
+                    patternPoints = patterns.get(dottedWord[start:end])
+                    if patternPoints is None:
+                        continue
+                    for index, value in enumerate(patternPoints, start):
+                        if value > points[index]:
+                            points[index] = value
+            # points[i + 1] is the point before the character word[i]
+            positions = [index for index in range(1, wordLength) if points[index + 1] % 2]
+        return tuple(position for position in positions if self.leftMin <= position <= wordLength - self.rightMin)
+
+    def hyphenate(self, word, hyphen="-"):
+        """
+        Return the word with a `hyphen` inserted at each hyphenation point.
+        """
+        parts = []
+        previous = 0
+        for position in self.positions(word):
+            parts.append(word[previous:position])
+            previous = position
+        parts.append(word[previous:])
+        return hyphen.join(parts)
+
+
+# language tag: path of the pattern file
+_patternPaths = {}
+_hyphenators = {}
+
+
+def registerPatterns(language, path):
+    """
+    Use the patterns in the given file for all text in a language.
+    Set `path` to None to remove the patterns for that language.
+    """
+    if path is None:
+        _patternPaths.pop(language, None)
+    else:
+        _patternPaths[language] = os.fspath(path)
+    _hyphenators.pop(language, None)
+
+
+def getRegisteredPatterns():
+    return dict(_patternPaths)
+
+
+def findPyphenPatterns(language):
+    """
+    Return the path of the `hyph_*.dic` file of the optional `pyphen` package for a language tag, or None.
+    """
+    try:
+        import pyphen  # type: ignore
+    except ImportError:
+        return None
+    name = pyphen.language_fallback(language)
+    if name is None:
+        return None
+    return os.fspath(pyphen.LANGUAGES[name])
+
+
+def _languageCandidates(language):
+    # "de-CH" -> "de-CH", "de_CH", "de"
+    if language is None:
+        return [None]
+    candidates = [language, language.replace("-", "_")]
+    primary = re.split(r"[-_]", language)[0]
+    if primary not in candidates:
+        candidates.append(primary)
+    return candidates
+
+
+def getHyphenator(language):
+    """
+    Return a hyphenator for a language tag, or None when no patterns are registered for that language.
+    """
+    if not _patternPaths:
+        return None
+    for candidate in _languageCandidates(language):
+        if candidate in _patternPaths:
+            if candidate not in _hyphenators:
+                _hyphenators[candidate] = Hyphenator.fromPath(_patternPaths[candidate])
+            return _hyphenators[candidate]
+    return None
@@ -1,9 +1,49 @@
 import os
+import subprocess
+import sys
+import tempfile
 
 from drawBot.misc import executeExternalProcess, getExternalToolPath
 
 
-def generateMP4(imageTemplate, mp4path, frameRate, codec="libx264"):
+def _frameTimesFilter(frameDurations):
+    # a setpts filter expression with the start time of each frame, in runs of frames with an equal duration,
+    # the extra last frame marks the end of the last frame
+    terms = []
+    startTime = 0
+    index = 0
+    frameCount = len(frameDurations)
+    while index < frameCount:
+        duration = frameDurations[index]
+        end = index
+        while end < frameCount and frameDurations[end] == duration:
+            end += 1
+        terms.append(f"between(N,{index},{end - 1})*({startTime!r}+(N-{index})*{duration!r})")
+        startTime += duration * (end - index)
+        index = end
+    terms.append(f"gte(N,{frameCount})*{startTime!r}")
+    # a time base dividing the common frame rates
+    return "settb=1/60000,setpts='round((%s)/TB)'" % "+".join(terms)
+
+
+def _hasVaryingFrameDurations(frameDurations):
+    return frameDurations is not None and len(set(frameDurations)) > 1
+
+
+def _timestampArguments(frameDurations):
+    if _hasVaryingFrameDurations(frameDurations):
+        # explicit timestamps for each frame, with a variable frame rate
+        # without b-frames the extra last frame only sets the duration of the movie
+        return ["-vf", _frameTimesFilter(frameDurations), "-fps_mode", "vfr", "-bf", "0"]
+    return []
+
+
+def generateMP4(imageTemplate, mp4path, frameRate, codec="libx264", frameDurations=None):
+    """
+    Encode a numbered image sequence, starting at 1.
+    Optionally `frameDurations` is a list with the duration of each frame, the image of the last frame
+    must be repeated once after the last frame when the durations are not all equal.
+    """
     ffmpegPath = getExternalToolPath(os.path.dirname(__file__), "ffmpeg")
     assert ffmpegPath is not None
     cmds = [
@@ -16,6 +56,7 @@ def generateMP4(imageTemplate, mp4path, frameRate, codec="libx264"):
         str(frameRate),  # frame rate
         "-i",
         imageTemplate,  # input sequence
+        *_timestampArguments(frameDurations),  # frame timestamps
         "-c:v",
         codec,  # codec
         "-crf",
@@ -25,3 +66,74 @@ def generateMP4(imageTemplate, mp4path, frameRate, codec="libx264"):
         mp4path,  # output path
     ]
     executeExternalProcess(cmds)
+
+
+class MP4Pipe:
+    """
+    An ffmpeg process encoding raw RGBA frames of a fixed size, written to its stdin.
+    Optionally `frameDurations` is a list with the duration of each frame that will be written.
+    """
+
+    def __init__(self, mp4path, width, height, frameRate, codec="libx264", frameDurations=None):
+        ffmpegPath = getExternalToolPath(os.path.dirname(__file__), "ffmpeg")
+        assert ffmpegPath is not None
+        cmds = [
+            # ffmpeg path
+            ffmpegPath,
+            "-y",  # overwrite existing files
+            "-loglevel",
+            "16",  # 'error, 16' Show all errors, including ones which can be recovered from.
+            "-f",
+            "rawvideo",  # raw frames as input
+            "-pix_fmt",
+            "rgba",  # input pixel format
+            "-s",
+            "%ix%i" % (width, height),  # input frame size
+            "-r",
+            str(frameRate),  # frame rate
+            "-i",
+            "-",  # read the frames from stdin
+            *_timestampArguments(frameDurations),  # frame timestamps
+            "-c:v",
+            codec,  # codec
+            "-crf",
+            "20",  # Constant Rate Factor
+            "-pix_fmt",
+            "yuv420p",  # pixel format
+            mp4path,  # output path
+        ]
+        self.width = width
+        self.height = height
+        self.frameRate = frameRate
+        # the last frame is written twice to mark the end of the last frame
+        self._repeatLastFrame = _hasVaryingFrameDurations(frameDurations)
+        self._lastFrameData = None
+        # collect errors in a file, a pipe could fill up and block ffmpeg
+        self._errors = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(cmds, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._errors)
+
+    def writeFrame(self, frameData):
+        try:
+            self._process.stdin.write(frameData)
+        except BrokenPipeError:
+            # ffmpeg stopped, report its errors
+            self.close()
+            raise
+        self._lastFrameData = frameData
+
+    def close(self):
+        try:
+            if self._repeatLastFrame and self._lastFrameData is not None:
+                self._process.stdin.write(self._lastFrameData)
+            self._lastFrameData = None
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._process.wait()
+        try:
+            if self._process.returncode != 0:
+                self._errors.seek(0)
+                sys.stderr.write(self._errors.read().decode("utf-8", "replace"))
+                raise RuntimeError("'ffmpeg' failed with error code %s" % self._process.returncode)
+        finally:
+            self._errors.close()
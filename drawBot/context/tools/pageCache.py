@@ -0,0 +1,186 @@
+import hashlib
+import os
+import shutil
+from array import array
+
+import AppKit  # type: ignore
+import objc  # type: ignore
+
+from drawBot.drawBotSettings import __version__
+from drawBot.misc import optimizePath
+
+from .hyphenator import getRegisteredPatterns
+
+# pages with links can not be inserted from the cache without losing the link annotations,
+# symbols depend on the graphics state at the moment they are defined, possibly on another page
+_uncacheableCallbacks = ["linkURL", "linkRect", "linkDestination", "defineSymbol", "placeSymbol"]
+
+# ignored options when building a cache key, they don't change the rendering of a single page
+_ignoredOptions = {"multipage", "pageCache", "workers"}
+
+# the index of the argument of a callback that can be a path to a file
+_pathArguments = {"image": 0, "font": 0, "fallbackFont": 0}
+
+_lastPageCacheStats = dict(hits=0, misses=0, uncacheable=0)
+
+
+def getPageCacheStats():
+    return dict(_lastPageCacheStats)
+
+
+def resetPageCacheStats():
+    # called before saving with a page cache, the stats of all formats of a single save are added together
+    _lastPageCacheStats.update(hits=0, misses=0, uncacheable=0)
+
+
+class _UnhashableError(Exception):
+    pass
+
+
+def _hashFile(path, hasher):
+    # a path to an image or a font, include the modification date
+    if isinstance(path, os.PathLike):
+        path = os.fspath(path)
+    if isinstance(path, str) and os.path.isfile(path):
+        stat = os.stat(path)
+        hasher.update(f"file:{stat.st_mtime_ns}:{stat.st_size};".encode("utf-8"))
+
+
+def _hashObject(obj, hasher, seen):
+    objType = type(obj)
+    if obj is None or isinstance(obj, (bool, int, float, complex)):
+        hasher.update(f"{objType.__name__}:{obj!r};".encode("utf-8"))
+    elif isinstance(obj, str):
+        hasher.update(f"str:{len(obj)}:".encode("utf-8"))
+        hasher.update(obj.encode("utf-8", "surrogatepass"))
+    elif isinstance(obj, (bytes, bytearray)):
+        hasher.update(f"bytes:{len(obj)}:".encode("utf-8"))
+        hasher.update(obj)
+    elif isinstance(obj, array):
+        hasher.update(f"array:{obj.typecode}:{len(obj)}:".encode("utf-8"))
+        hasher.update(obj.tobytes())
+    elif isinstance(obj, objc.objc_object):
+        try:
+            data, error = AppKit.NSKeyedArchiver.archivedDataWithRootObject_requiringSecureCoding_error_(
+                obj, False, None
+            )
+        except Exception:
+            data = None
+        if data is None:
+            raise _UnhashableError(obj)
+        hasher.update(f"objc:{obj.className()}:{data.length()}:".encode("utf-8"))
+        hasher.update(bytes(data))
+    else:
+        if id(obj) in seen:
+            hasher.update(b"cycle;")
+            return
+        seen.add(id(obj))
+        if isinstance(obj, (tuple, list)):
+            hasher.update(f"{objType.__name__}:{len(obj)}:".encode("utf-8"))
+            for item in obj:
+                _hashObject(item, hasher, seen)
+        elif isinstance(obj, dict):
+            hasher.update(f"dict:{len(obj)}:".encode("utf-8"))
+            for key in sorted(obj, key=repr):
+                _hashObject(key, hasher, seen)
+                _hashObject(obj[key], hasher, seen)
+        elif isinstance(obj, (set, frozenset)):
+            hasher.update(f"set:{len(obj)}:".encode("utf-8"))
+            for item in sorted(obj, key=repr):
+                _hashObject(item, hasher, seen)
+        elif hasattr(obj, "__dict__"):
+            hasher.update(f"object:{objType.__module__}.{objType.__qualname__}:".encode("utf-8"))
+            # an object can prepare its state, for example to build lazy attributes in a single form
+            getHashState = getattr(obj, "_getHashState", None)
+            state = vars(obj) if getHashState is None else getHashState()
+            unhashedAttributes = getattr(objType, "_unhashedAttributes", ())
+            _hashObject({key: value for key, value in state.items() if key not in unhashedAttributes}, hasher, seen)
+            for name in getattr(objType, "_pathAttributes", ()):
+                _hashFile(state.get(name), hasher)
+        elif hasattr(objType, "__slots__"):
+            hasher.update(f"object:{objType.__module__}.{objType.__qualname__}:".encode("utf-8"))
+            unhashedAttributes = getattr(objType, "_unhashedAttributes", ())
+            _hashObject(
+                {name: getattr(obj, name, None) for name in objType.__slots__ if name not in unhashedAttributes},
+                hasher,
+                seen,
+            )
+        else:
+            raise _UnhashableError(obj)
+        seen.discard(id(obj))
+
+
+class PageCache:
+    """
+    An on disk cache of rendered pages, keyed by a hash of the drawing instructions of each page.
+    """
+
+    def __init__(self, root, contextName, options, fileExtension):
+        self.root = optimizePath(root)
+        os.makedirs(self.root, exist_ok=True)
+        self.fileExtension = fileExtension
+        hasher = hashlib.sha256()
+        contextOptions = {key: value for key, value in options.items() if key not in _ignoredOptions}
+        # installed hyphenation patterns change the rendering of hyphenated text
+        patternPaths = getRegisteredPatterns()
+        _hashObject((__version__, contextName, fileExtension, contextOptions, patternPaths), hasher, set())
+        for language in sorted(patternPaths):
+            _hashFile(patternPaths[language], hasher)
+        self._contextKey = hasher.hexdigest()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+
+    def getKey(self, instructionSet):
+        """
+        Return the cache key of an instruction set, or None if the page can not be cached.
+        """
+        if any(instructionSet.hasCallback(callback) for callback in _uncacheableCallbacks):
+            return None
+        hasher = hashlib.sha256(self._contextKey.encode("utf-8"))
+        seen = set()
+        try:
+            for callback, args, kwargs in instructionSet:
+                hasher.update(f"{callback}:".encode("utf-8"))
+                _hashObject(args, hasher, seen)
+                _hashObject(kwargs, hasher, seen)
+                pathIndex = _pathArguments.get(callback)
+                if pathIndex is not None and pathIndex < len(args):
+                    _hashFile(args[pathIndex], hasher)
+        except _UnhashableError:
+            return None
+        return hasher.hexdigest()
+
+    def getPath(self, key):
+        return os.path.join(self.root, key + self.fileExtension)
+
+    def get(self, key):
+        """
+        Return the path of the cached page for the given key, or None.
+        The given key can be None for pages that can not be cached.
+        """
+        if key is None:
+            self.uncacheable += 1
+            _lastPageCacheStats["uncacheable"] += 1
+            return None
+        path = self.getPath(key)
+        if os.path.exists(path):
+            self.hits += 1
+            _lastPageCacheStats["hits"] += 1
+            return path
+        self.misses += 1
+        _lastPageCacheStats["misses"] += 1
+        return None
+
+    def storeFile(self, key, path):
+        if key is not None:
+            tempPath = self.getPath(key) + ".tmp"
+            shutil.copyfile(path, tempPath)
+            os.replace(tempPath, self.getPath(key))
+
+    def storeData(self, key, data):
+        if key is not None:
+            tempPath = self.getPath(key) + ".tmp"
+            with open(tempPath, "wb") as f:
+                f.write(data)
+            os.replace(tempPath, self.getPath(key))
@@ -0,0 +1,276 @@
+"""
+A backend neutral store for bezier path geometry, without any dependency on AppKit or Quartz.
+
+A path is stored as an `array("B")` of segment types and an `array("d")` of flat `x, y` coordinates.
+The segment types and their number of points follow `NSBezierPath` and `CGPath`:
+
+* `MOVETO`: one point
+* `LINETO`: one point
+* `CURVETO`: three points, two off curve points and the on curve point
+* `CLOSEPATH`: no points
+"""
+
+import math
+from array import array
+
+from fontTools.misc.bezierTools import calcCubicBounds  # type: ignore
+
+MOVETO = 0
+LINETO = 1
+CURVETO = 2
+CLOSEPATH = 3
+
+segmentPointCount = (1, 1, 3, 0)
+
+
+class PathData:
+    __slots__ = ("segmentTypes", "coordinates", "_subpathStart")
+
+    # a lookup cache, not part of the geometry
+    _unhashedAttributes = ("_subpathStart",)
+
+    def __init__(self, segmentTypes=None, coordinates=None):
+        self.segmentTypes = array("B") if segmentTypes is None else segmentTypes
+        self.coordinates = array("d") if coordinates is None else coordinates
+        # index in coordinates of the first point of the current subpath
+        self._subpathStart = None
+
+    def copy(self):
+        new = self.__class__(array("B", self.segmentTypes), array("d", self.coordinates))
+        new._subpathStart = self._subpathStart
+        return new
+
+    def __len__(self):
+        return len(self.segmentTypes)
+
+    def isEmpty(self):
+        return not self.segmentTypes
+
+    # building
+
+    def _ensureCurrentPoint(self):
+        if not self.segmentTypes:
+            raise ValueError("No current point, a path must start with a moveTo")
+        if self.segmentTypes[-1] == CLOSEPATH:
+            # start a new subpath at the start of the closed subpath
+            index = self._getSubpathStart()
+            self.moveTo(self.coordinates[index], self.coordinates[index + 1])
+
+    def _getSubpathStart(self):
+        if self._subpathStart is None:
+            index = 0
+            for segmentType in self.segmentTypes:
+                if segmentType == MOVETO:
+                    self._subpathStart = index
+                index += segmentPointCount[segmentType] * 2
+        return self._subpathStart
+
+    def moveTo(self, x, y):
+        self._subpathStart = len(self.coordinates)
+        self.segmentTypes.append(MOVETO)
+        self.coordinates.append(x)
+        self.coordinates.append(y)
+
+    def lineTo(self, x, y):
+        self._ensureCurrentPoint()
+        self.segmentTypes.append(LINETO)
+        self.coordinates.append(x)
+        self.coordinates.append(y)
+
+    def curveTo(self, x1, y1, x2, y2, x3, y3):
+        self._ensureCurrentPoint()
+        self.segmentTypes.append(CURVETO)
+        self.coordinates.extend((x1, y1, x2, y2, x3, y3))
+
+    def closePath(self):
+        if self.segmentTypes and self.segmentTypes[-1] != CLOSEPATH:
+            self.segmentTypes.append(CLOSEPATH)
+
+    def extend(self, other):
+        self.segmentTypes.extend(other.segmentTypes)
+        self.coordinates.extend(other.coordinates)
+        self._subpathStart = None
+
+    def extendTransformed(self, other, transformMatrix):
+        """
+        Append all segments of an other path data transformed with a transform matrix (xx, xy, yx, yy, x, y).
+        """
+        coordinates = other.coordinates
+        xs, ys = _transformCoordinates(coordinates[0::2], coordinates[1::2], transformMatrix)
+        newCoordinates = array("d", bytes(len(coordinates) * coordinates.itemsize))
+        newCoordinates[0::2] = xs
+        newCoordinates[1::2] = ys
+        self.segmentTypes.extend(other.segmentTypes)
+        self.coordinates.extend(newCoordinates)
+        self._subpathStart = None
+
+    def removeTrailingMoveTo(self):
+        if self.segmentTypes and self.segmentTypes[-1] == MOVETO:
+            self.segmentTypes.pop()
+            del self.coordinates[-2:]
+            self._subpathStart = None
+
+    # reading
+
+    def elements(self):
+        """
+        Yield all segments as `(segmentType, points)` tuples.
+        """
+        coordinates = self.coordinates
+        index = 0
+        for segmentType in self.segmentTypes:
+            count = segmentPointCount[segmentType] * 2
+            values = coordinates[index : index + count]
+            yield segmentType, tuple(zip(values[0::2], values[1::2]))
+            index += count
+
+    def points(self, onCurve=True, offCurve=True):
+        if onCurve and offCurve:
+            coordinates = self.coordinates
+            return tuple(zip(coordinates[0::2], coordinates[1::2]))
+        points = []
+        if not onCurve and not offCurve:
+            return tuple(points)
+        for segmentType, segmentPoints in self.elements():
+            if segmentType == CURVETO:
+                if onCurve:
+                    points.append(segmentPoints[-1])
+                else:
+                    points.extend(segmentPoints[:-1])
+            elif segmentType != CLOSEPATH and onCurve:
+                points.extend(segmentPoints)
+        return tuple(points)
+
+    def contours(self):
+        """
+        Return a list of `(segments, open)` tuples, where each segment is a list of points.
+        """
+        contours = []
+        for segmentType, segmentPoints in self.elements():
+            if segmentType == MOVETO:
+                contours.append([[], True])
+            if segmentType == CLOSEPATH:
+                contours[-1][1] = False
+            elif segmentPoints:
+                contours[-1][0].append(list(segmentPoints))
+        return contours
+
+    def controlPointBounds(self):
+        coordinates = self.coordinates
+        if not coordinates:
+            return None
+        xs = coordinates[0::2]
+        ys = coordinates[1::2]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def bounds(self):
+        if not self.coordinates:
+            return None
+        xMin = yMin = math.inf
+        xMax = yMax = -math.inf
+        previous = None
+        for segmentType, segmentPoints in self.elements():
+            if segmentType == CURVETO:
+                xMin1, yMin1, xMax1, yMax1 = calcCubicBounds(previous, *segmentPoints)
+                xMin = min(xMin, xMin1)
+                yMin = min(yMin, yMin1)
+                xMax = max(xMax, xMax1)
+                yMax = max(yMax, yMax1)
+            elif segmentType != CLOSEPATH:
+                x, y = segmentPoints[0]
+                xMin = min(xMin, x)
+                yMin = min(yMin, y)
+                xMax = max(xMax, x)
+                yMax = max(yMax, y)
+            if segmentPoints:
+                previous = segmentPoints[-1]
+        return xMin, yMin, xMax, yMax
+
+    # transformations
+
+    def transform(self, transformMatrix):
+        """
+        Transform all coordinates in place with a transform matrix (xx, xy, yx, yy, x, y).
+        """
+        coordinates = self.coordinates
+        xs, ys = _transformCoordinates(coordinates[0::2], coordinates[1::2], transformMatrix)
+        coordinates[0::2] = xs
+        coordinates[1::2] = ys
+
+    def transformMany(self, transformMatrices):
+        """
+        Return a list of new path data objects, one for each given transform matrix.
+        """
+        coordinates = self.coordinates
+        sourceXs = coordinates[0::2]
+        sourceYs = coordinates[1::2]
+        result = []
+        for transformMatrix in transformMatrices:
+            xs, ys = _transformCoordinates(sourceXs, sourceYs, transformMatrix)
+            newCoordinates = array("d", bytes(len(coordinates) * coordinates.itemsize))
+            newCoordinates[0::2] = xs
+            newCoordinates[1::2] = ys
+            result.append(self.__class__(array("B", self.segmentTypes), newCoordinates))
+        return result
+
+
+def _transformCoordinates(xs, ys, transformMatrix):
+    xx, xy, yx, yy, dx, dy = transformMatrix
+    if xy == 0 and yx == 0:
+        # only scale and translate
+        return array("d", [xx * x + dx for x in xs]), array("d", [yy * y + dy for y in ys])
+    return (
+        array("d", [xx * x + yx * y + dx for x, y in zip(xs, ys)]),
+        array("d", [xy * x + yy * y + dy for x, y in zip(xs, ys)]),
+    )
+
+
+_svgRelativeCommands = ("M", "l", "c", "Z")
+_svgAbsoluteCommands = ("M", "L", "C", "Z")
+
+
+def _formatNumbers(values, precision):
+    # same output as drawBot.misc.formatNumber
+    if precision is None:
+        return ["%i" % value if value.is_integer() else repr(value) for value in values]
+    return ["%i" % value if value.is_integer() else repr(round(value, precision)) for value in values]
+
+
+def svgPathData(pathData, precision=2, relative=True):
+    """
+    Return the svg path data string, the `d` attribute of a svg path element.
+
+    Numbers are rounded to the given `precision`, set it to None to keep all decimals.
+    Segments are relative to the previous on curve point, except move to's, when `relative` is True.
+    """
+    segmentTypes = pathData.segmentTypes
+    coordinates = pathData.coordinates
+    if relative:
+        values = array("d", coordinates)
+        commands = _svgRelativeCommands
+        index = 0
+        previousX = previousY = 0
+        for segmentType in segmentTypes:
+            count = segmentPointCount[segmentType] * 2
+            if count:
+                if segmentType != MOVETO:
+                    for i in range(index, index + count, 2):
+                        values[i] -= previousX
+                        values[i + 1] -= previousY
+                previousX = coordinates[index + count - 2]
+                previousY = coordinates[index + count - 1]
+            index += count
+    else:
+        values = coordinates
+        commands = _svgAbsoluteCommands
+    numbers = _formatNumbers(values, precision)
+    parts = []
+    index = 0
+    for segmentType in segmentTypes:
+        count = segmentPointCount[segmentType] * 2
+        if count:
+            parts.append(commands[segmentType] + ",".join(numbers[index : index + count]))
+            index += count
+        else:
+            parts.append(commands[segmentType])
+    return " ".join(parts)
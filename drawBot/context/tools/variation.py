@@ -1,9 +1,12 @@
 from collections import OrderedDict
 
+import AppKit  # type: ignore
 import CoreText
-from fontTools.ttLib import TTFont
 
-from drawBot.misc import memoize, warnings
+from drawBot.macOSVersion import macOSVersion
+from drawBot.misc import LRUCache, memoize, warnings
+
+from . import fontIndex
 
 """
 https://developer.apple.com/documentation/coretext/ctfont/font_variation_axis_dictionary_keys?language=objc
@@ -65,27 +68,34 @@ def getNamedInstancesForFont(font):
     if variationAxesDescriptions is None:
         # non-variable fonts have no named instances
         return instances
-    tagNameMap = {}
-    for variationAxesDescription in variationAxesDescriptions:
-        tag = convertIntToVariationTag(variationAxesDescription[CoreText.kCTFontVariationAxisIdentifierKey])
-        name = variationAxesDescription[CoreText.kCTFontVariationAxisNameKey]
-        tagNameMap[tag] = name
 
-    ft = TTFont(url.path(), lazy=True, fontNumber=0)
-    if "fvar" in ft:
-        cgFont, _ = CoreText.CTFontCopyGraphicsFont(font, None)
-        fvar = ft["fvar"]
+    path = url.path()
+    fontInfo = fontIndex.getFontInfo(path)
+    if not fontInfo["namedInstances"]:
+        return instances
+    # the postscript names generated by CoreText are stored in the font index
+    namesKey = f"coreTextNamedInstanceNames.{macOSVersion}"
+    postScriptNames = fontInfo.get(namesKey)
+    if postScriptNames is None:
+        tagNameMap = {}
+        for variationAxesDescription in variationAxesDescriptions:
+            tag = convertIntToVariationTag(variationAxesDescription[CoreText.kCTFontVariationAxisIdentifierKey])
+            name = variationAxesDescription[CoreText.kCTFontVariationAxisNameKey]
+            tagNameMap[tag] = name
 
-        for instance in fvar.instances:
+        cgFont, _ = CoreText.CTFontCopyGraphicsFont(font, None)
+        postScriptNames = []
+        for coordinates in fontInfo["namedInstances"]:
             fontVariations = dict()
-            for axis, value in instance.coordinates.items():
+            for axis, value in coordinates.items():
                 fontVariations[tagNameMap[axis]] = value
 
             varFont = CoreText.CGFontCreateCopyWithVariations(cgFont, fontVariations)
-            postScriptName = CoreText.CGFontCopyPostScriptName(varFont)
-            instances[postScriptName] = instance.coordinates
+            postScriptNames.append(str(CoreText.CGFontCopyPostScriptName(varFont)))
+        fontIndex.setFontInfoValue(path, 0, namesKey, postScriptNames)
 
-    ft.close()
+    for postScriptName, coordinates in zip(postScriptNames, fontInfo["namedInstances"]):
+        instances[postScriptName] = dict(coordinates)
     return instances
 
 
@@ -104,3 +114,43 @@ def getFontVariationAttributes(font, fontVariations):
         warnings.warn("variation axis '%s' not available for '%s'" % (axisTag, font.fontName()))
 
     return coreTextFontVariations
+
+
+# fonts for a variation location, by font, clipped location, font size and extra font attributes
+_variationFontCache = LRUCache(maxSize=512, name="variationFonts")
+
+
+def quantizeVariations(fontVariations, quantization):
+    """
+    Round all axis values to a multiple of `quantization`.
+    """
+    return {axisTag: round(value / quantization) * quantization for axisTag, value in fontVariations.items()}
+
+
+def getVariationFont(font, fontVariations, fontSize, fontAttributes=None, attributesKey=None):
+    """
+    Return a font at a variation location with a font size and optional extra font attributes.
+
+    Fonts are cached by the location clipped to the axes of the font.
+    The extra `fontAttributes` must be described by a hashable `attributesKey`, they are not cached otherwise.
+    """
+    coreTextFontVariations = getFontVariationAttributes(font, fontVariations)
+    key = None
+    if not fontAttributes or attributesKey is not None:
+        key = (font, tuple(sorted(coreTextFontVariations.items())), fontSize, attributesKey)
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+    if key is not None:
+        variationFont = _variationFontCache.get(key)
+        if variationFont is not None:
+            return variationFont
+    attributes = dict(fontAttributes or {})
+    if coreTextFontVariations:
+        attributes[CoreText.NSFontVariationAttribute] = coreTextFontVariations
+    fontDescriptor = font.fontDescriptor().fontDescriptorByAddingAttributes_(attributes)
+    variationFont = AppKit.NSFont.fontWithDescriptor_size_(fontDescriptor, fontSize)
+    if key is not None:
+        _variationFontCache.set(key, variationFont)
+    return variationFont
@@ -3,7 +3,6 @@ from __future__ import annotations
 import math
 import os
 import random
-from collections import namedtuple
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -15,18 +14,27 @@ from .context import getContextForFileExt, getContextOptionsDocs, getFileExtensi
 from .context.baseContext import (
     BezierPath,
     FormattedString,
+    Symbol,
+    TextLayout,
+    getCGPathCacheStats,
     getFontName,
+    getInstalledFontsCoverage,
     getNSFontFromNameOrPath,
+    isSingleLineText,
+    makeTextBox,
     makeTextBoxes,
-    newFramesetterWithAttributedString,
 )
 from .context.dummyContext import DummyContext
-from .context.tools import drawBotbuiltins, gifTools
+from .context.multiContext import MultiContext
+from .context.tools import drawBotbuiltins, gifTools, hyphenator, variation
 from .context.tools.imageObject import ImageObject
+from .context.tools.pageCache import getPageCacheStats, resetPageCacheStats
+from .drawBotInstructions import InstructionSet
 from .misc import (
     DrawBotError,
     VariableController,
     clearMemoizeCache,
+    getCacheStats,
     isEPS,
     isGIF,
     isPDF,
@@ -88,6 +96,47 @@ for key, (w, h) in list(_paperSizes.items()):
     _paperSizes["%sLandscape" % key] = (h, w)
 
 
+class TextFlow:
+    """
+    A text flowing through a sequence of boxes, see `textFlow(..)`.
+    The text is typesetted once, each box continues where the previous box stopped.
+    """
+
+    def __init__(self, drawingTool, txt, align):
+        self._drawingTool = drawingTool
+        self.txt = txt
+        self.align = align
+        # the (location, length) of the text in each box
+        self.ranges = []
+        self._location = 0
+
+    def __bool__(self):
+        # there is text left to flow
+        return self._location < len(self.txt)
+
+    @property
+    def overflow(self):
+        """
+        The text that has not been placed in a box yet.
+        """
+        return self.txt[self._location :]
+
+    def textBox(self, box: BoundingBox | BezierPath) -> tuple[int, int]:
+        """
+        Draw the next part of the text in a box and return the `(location, length)` range of the text in that box.
+        """
+        location, length = self._drawingTool._textFlowBox(self.txt, box, self.align, self._location)
+        self.ranges.append((location, length))
+        self._location = location + length
+        return location, length
+
+    def layoutText(self, box: BoundingBox | BezierPath) -> TextLayout:
+        """
+        Typeset the next part of the text in a box without drawing and without moving on to the next part.
+        """
+        return self._drawingTool._dummyContext.layoutText(self.txt, box, self.align, self._location)
+
+
 class DrawBotDrawingTool:
     def __init__(self):
         self._reset()
@@ -120,21 +169,35 @@ class DrawBotDrawingTool:
 
     def _addInstruction(self, callback, *args, **kwargs):
         if callback == "newPage":
-            self._instructionsStack.append([])
+            self._instructionsStack.append(InstructionSet())
         if not self._instructionsStack:
-            self._instructionsStack.append([])
+            self._instructionsStack.append(InstructionSet())
         if self._requiresNewFirstPage and not self._hasPage:
             self._hasPage = True
-            self._instructionsStack[-1].insert(0, ("newPage", [self.width(), self.height()], {}))
-        self._instructionsStack[-1].append((callback, args, kwargs))
+            self._instructionsStack[-1].prepend("newPage", (self.width(), self.height()))
+        self._instructionsStack[-1].append(callback, args, kwargs)
 
     def _drawInContext(self, context):
         if not self._instructionsStack:
             return
+        # cache the resolved context callbacks for all pages
+        methods = dict()
+        for instructionSet in self._instructionsStack:
+            if context.drawCachedPage(instructionSet):
+                # the page is reused from the page cache
+                continue
+            instructionSet.drawInContext(context, methods)
+
+    def _getFrameDurations(self, context):
+        # the duration of each page set with frameDuration(..), or None when not set
+        if not context.usesFrameDurations:
+            return None
+        frameDurations = []
         for instructionSet in self._instructionsStack:
-            for callback, args, kwargs in instructionSet:
-                attr = getattr(context, callback)
-                attr(*args, **kwargs)
+            if instructionSet.hasCallback("newPage"):
+                arguments = instructionSet.getLastArguments("frameDuration")
+                frameDurations.append(None if arguments is None else arguments[0])
+        return frameDurations
 
     def _reset(self, other=None):
         if other is not None:
@@ -392,10 +455,8 @@ class DrawBotDrawingTool:
 
         instructions = []
         for instructionSet in self._instructionsStack:
-            for callback, _, _ in instructionSet:
-                if callback == "newPage":
-                    instructions.append(instructionSet)
-                    break
+            if instructionSet.hasCallback("newPage"):
+                instructions.append(instructionSet)
         return tuple(DrawBotPage(instructionSet) for instructionSet in instructions)
 
     def saveImage(self, path: SomePath, *args: Any, **options: Any):
@@ -456,18 +517,7 @@ class DrawBotDrawingTool:
             else:
                 # if there are more just raise a TypeError
                 raise TypeError("saveImage(path, **options) takes only keyword arguments")
-        originalPath = path
-        path = optimizePath(path)
-        dirName = os.path.dirname(path)
-        if not os.path.exists(dirName):
-            raise DrawBotError("Folder '%s' doesn't exists" % dirName)
-        base, ext = os.path.splitext(path)
-        ext = ext.lower()[1:]
-        if not ext:
-            path = ext = originalPath
-        context = getContextForFileExt(ext)
-        if context is None:
-            raise DrawBotError("Could not find a supported context for: '%s'" % ext)
+        path, context = self._getContextForPath(path)
         if context.validateSaveImageOptions:
             allowedSaveImageOptions = set(optionName for optionName, optionDoc in context.saveImageOptions)
             for optionName in options:
@@ -475,6 +525,9 @@ class DrawBotDrawingTool:
                     warnings.warn(
                         "Unrecognized saveImage() option found for %s: %s" % (context.__class__.__name__, optionName)
                     )
+        if options.get("pageCache") is not None:
+            resetPageCacheStats()
+        context.prepareSaveImage(path, options, self._getFrameDurations(context))
         self._drawInContext(context)
         return context.saveImage(path, options)
 
@@ -484,6 +537,117 @@ class DrawBotDrawingTool:
         supportedOptions="\n        ".join(getContextOptionsDocs()),
     )
 
+    def saveImages(self, paths: list[SomePath], **options: Any) -> list[Any]:
+        """
+        Save or export the canvas to multiple paths at once.
+
+        All drawing actions are replayed only once, into a context for each path.
+        This is a lot faster than calling `saveImage()` for each output format.
+
+        The file extension of each path determines the format in which the image will be exported.
+        The `saveImage()` options are shared by all paths, each format only uses the options it recognizes.
+        With a `pageCache` folder each format looks up the pages in the cache on its own,
+        a page is only drawn for the formats without a cached page.
+
+        ::
+
+            saveImages(["~/Desktop/image.pdf", "~/Desktop/image.png", "~/Desktop/image.svg"])
+        """
+        if isinstance(paths, (str, os.PathLike)):
+            raise TypeError(
+                "saveImages(paths, **options) expects a list of paths, use saveImage(path) for a single path"
+            )
+        pathContexts = [self._getContextForPath(path) for path in paths]
+        if not pathContexts:
+            return []
+        allowedSaveImageOptions = set()
+        validateSaveImageOptions = False
+        for _, context in pathContexts:
+            if context.validateSaveImageOptions:
+                validateSaveImageOptions = True
+                allowedSaveImageOptions.update(optionName for optionName, optionDoc in context.saveImageOptions)
+        if validateSaveImageOptions:
+            for optionName in options:
+                if optionName not in allowedSaveImageOptions:
+                    warnings.warn("Unrecognized saveImages() option found: %s" % optionName)
+        if options.get("pageCache") is not None:
+            resetPageCacheStats()
+        # some contexts alter the options while saving, give each context its own copy
+        contextOptions = [dict(options) for _ in pathContexts]
+        for (path, context), pathOptions in zip(pathContexts, contextOptions):
+            context.prepareSaveImage(path, pathOptions, self._getFrameDurations(context))
+        self._drawInContext(MultiContext([context for _, context in pathContexts]))
+        return [
+            context.saveImage(path, pathOptions) for (path, context), pathOptions in zip(pathContexts, contextOptions)
+        ]
+
+    def pageCacheStats(self) -> dict[str, int]:
+        """
+        Return statistics of the page cache used by the last `saveImage(path, pageCache=folder)` call.
+        For `saveImages(paths, pageCache=folder)` the statistics of all formats are added together.
+
+        The returned dictionary contains the number of `hits`, pages reused from the cache,
+        the number of `misses`, pages rendered and added to the cache,
+        and the number of `uncacheable` pages, pages that always need to be rendered.
+        Pages with links or with objects that cannot be compared can not be cached.
+
+        .. downloadcode:: pageCacheStats.py
+
+            import tempfile
+
+            # keep the cached pages in a temporary folder
+            cacheFolder = tempfile.mkdtemp()
+            for i in range(10):
+                newPage(200, 200)
+                rect(10, 10, 20 * i, 20 * i)
+            saveImage("~/Desktop/pages.png", multipage=True, pageCache=cacheFolder)
+            # all pages are rendered
+            print(pageCacheStats())
+            saveImage("~/Desktop/pages.png", multipage=True, pageCache=cacheFolder)
+            # all pages are reused from the cache
+            print(pageCacheStats())
+        """
+        return getPageCacheStats()
+
+    def cacheStats(self) -> dict[str, dict[str, int]]:
+        """
+        Return statistics of the caches used while drawing, for each cache by name.
+
+        Each cache reports the number of `hits`, `misses` and, for caches with a maximum size,
+        the number of `evictions`, items removed to keep the cache within its `maxSize`.
+        Fonts, typesetted text, text attributes and hyphenation are cached.
+        The statistics of the page cache are the statistics of the last `saveImage(..)` with a `pageCache`,
+        see `pageCacheStats()`.
+
+        .. downloadcode:: cacheStats.py
+
+            for i in range(10):
+                newPage(200, 200)
+                fontSize(30)
+                text("hello", (10, 10 + i * 15))
+            # print the statistics of the text layout cache
+            print(cacheStats()["textLayout"])
+        """
+        stats = getCacheStats()
+        stats["cgPath"] = getCGPathCacheStats()
+        stats["pageCache"] = getPageCacheStats()
+        return stats
+
+    def _getContextForPath(self, path):
+        originalPath = path
+        path = optimizePath(path)
+        dirName = os.path.dirname(path)
+        if not os.path.exists(dirName):
+            raise DrawBotError("Folder '%s' doesn't exists" % dirName)
+        base, ext = os.path.splitext(path)
+        ext = ext.lower()[1:]
+        if not ext:
+            path = ext = originalPath
+        context = getContextForFileExt(ext)
+        if context is None:
+            raise DrawBotError("Could not find a supported context for: '%s'" % ext)
+        return path, context
+
     def printImage(self, pdf=None) -> None:
         """
         Export the canvas to a printing dialog, ready to print.
@@ -764,6 +928,47 @@ class DrawBotDrawingTool:
         self._requiresNewFirstPage = True
         self._addInstruction("clipPath", path)
 
+    def defineSymbol(self, path: BezierPath) -> Symbol:
+        """
+        Define a symbol from a bezier path and the current graphics state: fill, stroke, shadow, gradient and line styles.
+        Returns a symbol object to draw with `placeSymbol(symbol, transformMatrix)`.
+
+        The path is written only once in pdf and svg files, every placed symbol refers to it.
+        This keeps files small when the same shape is drawn many times.
+
+        .. downloadcode:: defineSymbol.py
+
+            # create a bezier path
+            path = BezierPath()
+            path.oval(-10, -10, 20, 20)
+            # set a fill
+            fill(1, 0, 0)
+            # define a symbol with the current fill
+            dot = defineSymbol(path)
+            for x in range(50, 1000, 50):
+                for y in range(50, 1000, 50):
+                    # place the symbol
+                    placeSymbol(dot, (1, 0, 0, 1, x, y))
+        """
+        if isinstance(path, AppKit.NSBezierPath):
+            path = BezierPath(path)
+        if not isinstance(path, BezierPath):
+            raise DrawBotError("defineSymbol() expects a BezierPath, got '%s'" % type(path).__name__)
+        symbol = Symbol(path)
+        self._requiresNewFirstPage = True
+        self._addInstruction("defineSymbol", symbol)
+        return symbol
+
+    def placeSymbol(self, symbol: Symbol, transformMatrix: TransformTuple = (1, 0, 0, 1, 0, 0)) -> None:
+        """
+        Draw a symbol, created with `defineSymbol(path)`, transformed with a transform matrix (xx, xy, yx, yy, x, y).
+        The symbol is drawn with the graphics state from the moment it was defined.
+        """
+        if not isinstance(symbol, Symbol):
+            raise DrawBotError("placeSymbol() expects a symbol from defineSymbol(), got '%s'" % type(symbol).__name__)
+        self._requiresNewFirstPage = True
+        self._addInstruction("placeSymbol", symbol, tuple(transformMatrix))
+
     def line(self, point1: Point, point2: Point) -> None:
         """
         Draws a line between two given points.
@@ -1626,6 +1831,56 @@ class DrawBotDrawingTool:
         self._checkLanguageHyphenation()
         self._addInstruction("hyphenation", value)
 
+    def installHyphenationPatterns(self, language: str | None, path: SomePath | None = None) -> None:
+        """
+        Hyphenate text in a `language` with TeX hyphenation patterns instead of the hyphenation of macOS.
+
+        The `path` can be a TeX pattern file, like `hyph-nl.tex`, or a LibreOffice dictionary, like `hyph_nl_NL.dic`.
+        Without a `path` the dictionaries of the `pyphen` package are used, when `pyphen` is installed.
+        Set `language` to `None` for text without a language, see `language(..)`.
+
+        The patterns are used for all drawings, until `uninstallHyphenationPatterns(language)` is called.
+
+        .. downloadcode:: installHyphenationPatterns.py
+
+            import os
+            import tempfile
+
+            # write a few english patterns in the TeX format to a file
+            path = os.path.join(tempfile.mkdtemp(), "hyph-en-demo.tex")
+            with open(path, "w") as f:
+                f.write("\\\\patterns{ .hy1p he2n hena4 hen5at 1na n2at 1tio 2io o2n }")
+            # use these patterns for english text
+            installHyphenationPatterns("en", path)
+            # set the language
+            language("en")
+            # enable hyphenation
+            hyphenation(True)
+            # set font size
+            fontSize(150)
+            # draw a long word in a small box
+            textBox("hyphenation hyphenation", (100, 50, 600, 800))
+            # go back to the hyphenation of macOS
+            uninstallHyphenationPatterns("en")
+        """
+        if path is None:
+            path = hyphenator.findPyphenPatterns(language or "en")
+            if path is None:
+                raise DrawBotError(f"No hyphenation patterns found for language '{language}', provide a path.")
+        path = os.fspath(path)
+        if not os.path.exists(path):
+            raise DrawBotError(f"Hyphenation patterns '{path}' do not exist.")
+        hyphenator.registerPatterns(language, path)
+        # hyphenated text is cached
+        clearMemoizeCache()
+
+    def uninstallHyphenationPatterns(self, language: str | None) -> None:
+        """
+        Stop using the installed hyphenation patterns for a `language`, see `installHyphenationPatterns(..)`.
+        """
+        hyphenator.registerPatterns(language, None)
+        clearMemoizeCache()
+
     def tabs(self, *tabs: tuple[float, str]) -> None:
         r"""
         Set tabs, tuples of (`float`, `alignment`)
@@ -1698,7 +1953,7 @@ class DrawBotDrawingTool:
 
     def _checkLanguageHyphenation(self):
         language = self._dummyContext._state.text._language
-        if language and self._dummyContext._state.hyphenation:
+        if language and self._dummyContext._state.hyphenation and hyphenator.getHyphenator(language) is None:
             locale = CoreText.CFLocaleCreate(None, language)
             if not CoreText.CFStringIsHyphenationAvailableForLocale(locale):
                 warnings.warn(f"Language '{language}' has no hyphenation available.")
@@ -1763,10 +2018,16 @@ class DrawBotDrawingTool:
 
     listOpenTypeFeatures.__doc__ = FormattedString.listOpenTypeFeatures.__doc__
 
-    def fontVariations(self, *, resetVariations: bool = False, **axes: float) -> dict[str, float]:
+    def fontVariations(
+        self, *, resetVariations: bool = False, quantization: float | None = None, **axes: float
+    ) -> dict[str, float]:
         """
         Pick a variation by axes values.
 
+        Optionally the axes values are rounded to a multiple of `quantization`.
+        Animations with many tiny steps share the fonts of the rounded locations,
+        `fontVariations(wght=wght, quantization=5)`.
+
         .. downloadcode:: fontVariations.py
 
             size(1000, 600)
@@ -1789,6 +2050,9 @@ class DrawBotDrawingTool:
             fontVariations(resetVariations=True)
             text("Hello Q", (100, 420))
         """
+        if quantization:
+            # the rounded values are recorded, the drawing and the page cache only see the rounded location
+            axes = variation.quantizeVariations(axes, quantization)
         result = self._dummyContext.fontVariations(resetVariations=resetVariations, **axes)
         self._addInstruction("fontVariations", resetVariations=resetVariations, **axes)
         return result
@@ -1860,12 +2124,14 @@ class DrawBotDrawingTool:
         if align not in ("left", "center", "right", None):
             raise DrawBotError("align must be left, right, center")
         attributedString = self._dummyContext.attributedString(txt, align=align)
-        for subTxt, box in makeTextBoxes(
-            attributedString,
-            (x, y),
-            align=align,
-            plainText=not isinstance(txt, FormattedString),
-        ):
+        plainText = not isinstance(txt, FormattedString)
+        if isSingleLineText(attributedString.string()):
+            # a single line, no need to split the text in lines
+            textBox = makeTextBox(attributedString, (x, y), align=align, plainText=plainText)
+            textBoxes = [textBox] if textBox else []
+        else:
+            textBoxes = makeTextBoxes(attributedString, (x, y), align=align, plainText=plainText)
+        for subTxt, box in textBoxes:
             if isinstance(txt, FormattedString):
                 subTxt.copyContextProperties(txt)
             self.textBox(subTxt, box, align=align)
@@ -1899,6 +2165,115 @@ class DrawBotDrawingTool:
             raise DrawBotError("align must be %s" % (", ".join(self._dummyContext._textAlignMap.keys())))
         return self._dummyContext.clippedText(txt, box, align)
 
+    def layoutText(
+        self,
+        txt: FormattedString | str,
+        box: BoundingBox | BezierPath,
+        align: Literal["left", "center", "right", "justified"] | None = None,
+    ) -> TextLayout:
+        """
+        Typeset a text in a box without drawing the text and return a layout object.
+
+        The layout object has the following attributes:
+
+        * `origins`: a list of `x, y` coordinates indicating the start of each line, like `textBoxBaselines(..)`
+        * `characterBounds`: a list of typesetted bounding boxes, like `textBoxCharacterBounds(..)`
+        * `overflow`: the overflowed text, like `textOverflow(..)`
+        * `frame`: the CoreText frame
+        * `lines`: a list of CoreText lines
+
+        A `box` could be a `(x, y, w, h)` or a bezierPath object.
+
+        Optionally an alignment can be set.
+        Possible `align` values are: `"left"`, `"center"`, `"right"` and `"justified"`.
+
+        Typesetted text is cached, drawing the same text in the same box with `textBox(..)` reuses the layout.
+
+        .. downloadcode:: layoutText.py
+
+            # set a font size
+            fontSize(30)
+            # typeset a text in a box
+            layout = layoutText("hello world " * 20, (100, 100, 400, 300))
+            # mark the start of each line
+            for x, y in layout.origins:
+                oval(x - 5, y - 5, 10, 10)
+            # print the text that does not fit in the box
+            print(layout.overflow)
+        """
+        if isinstance(txt, FormattedString):
+            txt = txt.copy()
+        elif not isinstance(txt, (str, FormattedString)):
+            raise TypeError("expected 'str' or 'FormattedString', got '%s'" % type(txt).__name__)
+        if align is None:
+            align = "left"
+        elif align not in self._dummyContext._textAlignMap.keys():
+            raise DrawBotError("align must be %s" % (", ".join(self._dummyContext._textAlignMap.keys())))
+        return self._dummyContext.layoutText(txt, box, align)
+
+    def textFlow(
+        self,
+        txt: FormattedString | str,
+        align: Literal["left", "center", "right", "justified"] | None = None,
+    ) -> TextFlow:
+        """
+        Flow a long text through a sequence of boxes, on one or more pages.
+
+        Returns a text flow object, call `textBox(box)` on it to draw the next part of the text in a box.
+        The text is typesetted only once, drawing text over many pages doesn't typeset the remaining text again for each page,
+        like `textBox(..)` with the returned overflow does.
+
+        A `box` could be a `(x, y, w, h)` or a bezierPath object.
+
+        The text flow object has the following attributes:
+
+        * `textBox(box)`: draws the next part of the text in the box and returns the `(location, length)` of the text in that box
+        * `layoutText(box)`: returns a layout object of the next part of the text in the box without drawing, see `layoutText(..)`
+        * `ranges`: a list of `(location, length)` of the text in each box
+        * `overflow`: the text that has not been drawn yet
+
+        The text flow object is `False` when all the text is drawn.
+        A box too small to fit any of the remaining text raises an error.
+
+        Optionally an alignment can be set.
+        Possible `align` values are: `"left"`, `"center"`, `"right"` and `"justified"`.
+
+        .. downloadcode:: textFlow.py
+
+            # a long text
+            t = "DrawBot is a powerful, free application for macOS that invites you to write simple Python scripts to generate two-dimensional graphics. " * 50
+            # set a font and a font size
+            font("Times-Italic", 30)
+            # flow the text through the boxes
+            flow = textFlow(t, align="justified")
+            while flow:
+                # create a new page
+                newPage(500, 500)
+                # draw the next part in two columns
+                flow.textBox((20, 20, 220, 460))
+                flow.textBox((260, 20, 220, 460))
+            # the range of the text in each column
+            print(flow.ranges)
+        """
+        if isinstance(txt, FormattedString):
+            txt = txt.copy()
+        elif not isinstance(txt, (str, FormattedString)):
+            raise TypeError("expected 'str' or 'FormattedString', got '%s'" % type(txt).__name__)
+        if align is None:
+            align = "left"
+        elif align not in self._dummyContext._textAlignMap.keys():
+            raise DrawBotError("align must be %s" % (", ".join(self._dummyContext._textAlignMap.keys())))
+        return TextFlow(self, txt, align)
+
+    def _textFlowBox(self, txt, box, align, start):
+        location, length = self._dummyContext.layoutText(txt, box, align, start).range
+        if not length and start < len(txt):
+            # the flow would never end
+            raise DrawBotError("The text flow box is too small to fit any text.")
+        self._requiresNewFirstPage = True
+        self._addInstruction("textBox", txt, box, align, start)
+        return location, length
+
     def textBox(
         self,
         txt: FormattedString | str,
@@ -2038,6 +2413,9 @@ class DrawBotDrawingTool:
             align = "left"
         elif align not in self._dummyContext._textAlignMap.keys():
             raise DrawBotError("align must be %s" % (", ".join(self._dummyContext._textAlignMap.keys())))
+        if isinstance(txt, FormattedString):
+            # the formatted string can be changed in place afterwards, with `+=` or `append(..)`
+            txt = txt.copy()
         self._requiresNewFirstPage = True
         self._addInstruction("textBox", txt, box, align)
         return self._dummyContext.clippedText(txt, box, align)
@@ -2057,16 +2435,12 @@ class DrawBotDrawingTool:
 
         Optionally an alignment can be set.
         Possible `align` values are: `"left"`, `"center"`, `"right"` and `"justified"`.
+
+        The text is hyphenated when `hyphenation(True)` is set, like the text drawn by `textBox(..)`.
         """
         if not isinstance(txt, (str, FormattedString)):
             raise TypeError("expected 'str' or 'FormattedString', got '%s'" % type(txt).__name__)
-        path, (x, y) = self._dummyContext._getPathForFrameSetter(box)
-        attrString = self._dummyContext.attributedString(txt, align=align)
-        setter = newFramesetterWithAttributedString(attrString)
-        box = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
-        ctLines = CoreText.CTFrameGetLines(box)
-        origins = CoreText.CTFrameGetLineOrigins(box, (0, len(ctLines)), None)
-        return [(x + o.x, y + o.y) for o in origins]
+        return self._dummyContext.layoutText(txt, box, align).origins
 
     def textBoxCharacterBounds(
         self, txt: FormattedString | str, box: BoundingBox, align: str | None = None
@@ -2078,39 +2452,12 @@ class DrawBotDrawingTool:
 
         Optionally an alignment can be set.
         Possible `align` values are: `"left"`, `"center"`, `"right"` and `"justified"`.
+
+        The text is hyphenated when `hyphenation(True)` is set, like the text drawn by `textBox(..)`.
         """
         if not isinstance(txt, (str, FormattedString)):
             raise TypeError("expected 'str' or 'FormattedString', got '%s'" % type(txt).__name__)
-
-        CharactersBounds = namedtuple("CharactersBounds", ["bounds", "baselineOffset", "formattedSubString"])
-
-        bounds: list[tuple[BoundingBox | BezierPath, float, FormattedString | str]] = []
-        path, (x, y) = self._dummyContext._getPathForFrameSetter(box)
-        attrString = self._dummyContext.attributedString(txt, align=align)
-        setter = newFramesetterWithAttributedString(attrString)
-        box = CoreText.CTFramesetterCreateFrame(setter, (0, 0), path, None)
-        ctLines = CoreText.CTFrameGetLines(box)
-        origins = CoreText.CTFrameGetLineOrigins(box, (0, len(ctLines)), None)
-        for i, (originX, originY) in enumerate(origins):
-            ctLine = ctLines[i]
-            ctRuns = CoreText.CTLineGetGlyphRuns(ctLine)
-            for ctRun in ctRuns:
-                runRange = CoreText.CTRunGetStringRange(ctRun)
-                runPos = CoreText.CTRunGetPositions(ctRun, (0, 1), None)[0]
-                runW, runH, ascent, descent = CoreText.CTRunGetTypographicBounds(ctRun, (0, 0), None, None, None)
-                bounds.append(
-                    CharactersBounds(
-                        (
-                            x + originX + runPos.x,
-                            y + originY + runPos.y - ascent,
-                            runW,
-                            runH + ascent,
-                        ),
-                        ascent,
-                        txt[runRange.location : runRange.location + runRange.length],
-                    )
-                )
-        return bounds
+        return self._dummyContext.layoutText(txt, box, align).characterBounds
 
     # images
     def image(
@@ -2466,18 +2813,14 @@ class DrawBotDrawingTool:
         Optionally a string with `supportsCharacters` can be provided,
         the list of available installed fonts will be filtered by
         support of these characters,
+        The character coverage of the installed fonts is indexed a few font files at each call with `supportsCharacters`,
+        once all fonts are indexed the index answers.
         """
         if supportsCharacters is not None:
             if len(supportsCharacters) == 0:
                 raise DrawBotError("supportsCharacters must contain at least one character")
-            characterSet = AppKit.NSCharacterSet.characterSetWithCharactersInString_(supportsCharacters)
-            fontAttributes = {CoreText.NSFontCharacterSetAttribute: characterSet}
-            fontDescriptor = CoreText.CTFontDescriptorCreateWithAttributes(fontAttributes)
-            descriptions = fontDescriptor.matchingFontDescriptorsWithMandatoryKeys_(None)
-            if descriptions is not None:
-                return [str(description[CoreText.NSFontNameAttribute]) for description in descriptions]
-            else:
-                return []  # No font was found that supports the requested characters
+            # the character coverage of all installed fonts is indexed incrementally
+            return getInstalledFontsCoverage().fontsForCharacters(supportsCharacters)
         return [str(f) for f in AppKit.NSFontManager.sharedFontManager().availableFonts()]
 
     def installFont(self, path: SomePath) -> str:
@@ -0,0 +1,210 @@
+from array import array
+
+# Every recorded drawing call is stored as an opcode: an interned
+# (callback, signature) pair shared by all instruction sets.
+# The signature describes how the numeric operands of the call are packed
+# into the `array("d")` buffer of an instruction set:
+#
+# * "f": a float
+# * "i": an int
+# * a tuple of "f"/"i": a tuple of numbers, most of the time a point
+#
+# A signature of None means the arguments are not plain numbers, they are
+# kept as a `(args, kwargs)` tuple in the object list of the instruction set.
+
+_maxPackedInt = 2**53
+
+_opcodes = []
+_opcodeIndex = dict()
+
+
+class _Opcode:
+    __slots__ = ("callback", "signature", "size", "decode")
+
+    def __init__(self, callback, signature):
+        self.callback = callback
+        self.signature = signature
+        self.size = 0
+        self.decode = None
+        if signature is not None:
+            self.size = sum(1 if isinstance(kind, str) else len(kind) for kind in signature)
+            self.decode = _makeDecoder(signature, self.size)
+
+
+def _internOpcode(callback, signature):
+    key = callback, signature
+    code = _opcodeIndex.get(key)
+    if code is None:
+        code = len(_opcodes)
+        _opcodes.append(_Opcode(callback, signature))
+        _opcodeIndex[key] = code
+    return code
+
+
+def _numberKind(value):
+    valueType = type(value)
+    if valueType is float:
+        return "f"
+    if valueType is int and -_maxPackedInt <= value <= _maxPackedInt:
+        return "i"
+    return None
+
+
+def _getSignature(args, kwargs):
+    if kwargs:
+        return None
+    signature = []
+    for arg in args:
+        kind = _numberKind(arg)
+        if kind is None:
+            if type(arg) is not tuple or not arg:
+                return None
+            kind = tuple(_numberKind(value) for value in arg)
+            if None in kind:
+                return None
+        signature.append(kind)
+    return tuple(signature)
+
+
+def _makeDecoder(signature, size):
+    if all(kind == "f" for kind in signature):
+        # the common case: only floats
+        def decode(numbers, index):
+            return tuple(numbers[index : index + size])
+
+        return decode
+
+    def decode(numbers, index):
+        args = []
+        for kind in signature:
+            if kind == "f":
+                args.append(numbers[index])
+                index += 1
+            elif kind == "i":
+                args.append(int(numbers[index]))
+                index += 1
+            else:
+                values = numbers[index : index + len(kind)]
+                args.append(tuple(value if k == "f" else int(value) for k, value in zip(kind, values)))
+                index += len(kind)
+        return tuple(args)
+
+    return decode
+
+
+def _flatten(args):
+    for arg in args:
+        if type(arg) is tuple:
+            yield from arg
+        else:
+            yield arg
+
+
+class InstructionSet:
+    """
+    A compact log of all drawing instructions of a single page.
+
+    Numeric operands are packed in an `array("d")` buffer, all other
+    arguments are stored as objects.
+    """
+
+    __slots__ = ("_codes", "_numbers", "_objects", "_callbacks")
+
+    def __init__(self):
+        self._codes = array("I")
+        self._numbers = array("d")
+        self._objects = []
+        # all recorded callbacks, for a fast lookup
+        self._callbacks = set()
+
+    def _encode(self, callback, args, kwargs):
+        signature = _getSignature(args, kwargs)
+        code = _internOpcode(callback, signature)
+        if signature is None:
+            return code, None, (tuple(args), kwargs or None)
+        return code, _flatten(args), None
+
+    def append(self, callback, args=(), kwargs=None):
+        code, numbers, obj = self._encode(callback, args, kwargs)
+        self._codes.append(code)
+        self._callbacks.add(callback)
+        if numbers is None:
+            self._objects.append(obj)
+        else:
+            self._numbers.extend(numbers)
+
+    def prepend(self, callback, args=(), kwargs=None):
+        code, numbers, obj = self._encode(callback, args, kwargs)
+        self._codes.insert(0, code)
+        self._callbacks.add(callback)
+        if numbers is None:
+            self._objects.insert(0, obj)
+        else:
+            self._numbers[0:0] = array("d", numbers)
+
+    def hasCallback(self, callback):
+        return callback in self._callbacks
+
+    def getLastArguments(self, callback):
+        """
+        Return the positional arguments of the last call of the given callback, or None.
+        """
+        numbers = self._numbers
+        objects = self._objects
+        numberIndex = objectIndex = 0
+        result = None
+        for code in self._codes:
+            opcode = _opcodes[code]
+            if opcode.decode is None:
+                if opcode.callback == callback:
+                    result = objects[objectIndex][0]
+                objectIndex += 1
+            else:
+                if opcode.callback == callback:
+                    result = opcode.decode(numbers, numberIndex)
+                numberIndex += opcode.size
+        return result
+
+    def __len__(self):
+        return len(self._codes)
+
+    def __iter__(self):
+        numbers = self._numbers
+        objects = self._objects
+        numberIndex = objectIndex = 0
+        for code in self._codes:
+            opcode = _opcodes[code]
+            if opcode.decode is None:
+                args, kwargs = objects[objectIndex]
+                objectIndex += 1
+                yield opcode.callback, args, dict(kwargs or ())
+            else:
+                yield opcode.callback, opcode.decode(numbers, numberIndex), {}
+                numberIndex += opcode.size
+
+    def drawInContext(self, context, methods=None):
+        """
+        Replay all instructions in the given context.
+
+        Optionally a `methods` dict can be provided, caching the resolved context callbacks by opcode.
+        """
+        if methods is None:
+            methods = dict()
+        numbers = self._numbers
+        objects = self._objects
+        numberIndex = objectIndex = 0
+        for code in self._codes:
+            opcode = _opcodes[code]
+            method = methods.get(code)
+            if method is None:
+                method = methods[code] = getattr(context, opcode.callback)
+            if opcode.decode is None:
+                args, kwargs = objects[objectIndex]
+                objectIndex += 1
+                if kwargs:
+                    method(*args, **kwargs)
+                else:
+                    method(*args)
+            else:
+                method(*opcode.decode(numbers, numberIndex))
+                numberIndex += opcode.size
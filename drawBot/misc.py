@@ -3,6 +3,7 @@ import io
 import os
 import subprocess
 import sys
+from collections import OrderedDict
 
 import AppKit  # type: ignore
 from fontTools.misc.transform import Transform
@@ -382,16 +383,85 @@ def getExternalToolPath(root, toolName):
 # = caching tools =
 # =================
 
-_memoizeCache = dict()
+_lruCaches = []
 
 
 def clearMemoizeCache():
     # clears all memoized caches
     # this is intended as the usage of memoize is made per context
-    _memoizeCache.clear()
+    # persistent caches are kept, their keys change when an input file changes
+    for cache in _lruCaches:
+        if not cache.persistent:
+            cache.clear()
 
 
-def memoize(function):
+def getCacheStats():
+    """
+    Return a dictionary with the statistics of all named caches.
+    """
+    return {cache.name: cache.stats() for cache in _lruCaches if cache.name is not None}
+
+
+class LRUCache:
+    """
+    A cache with a maximum size, the least recently used item is removed when the cache is full.
+    All caches are cleared together with the memoize cache, except persistent caches.
+    """
+
+    def __init__(self, maxSize=1024, name=None, persistent=False):
+        self.maxSize = maxSize
+        self.name = name
+        self.persistent = persistent
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _lruCaches.append(self)
+
+    def get(self, key, default=None):
+        try:
+            value = self._items[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.maxSize:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._items.clear()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def stats(self):
+        return dict(
+            hits=self.hits, misses=self.misses, evictions=self.evictions, size=len(self._items), maxSize=self.maxSize
+        )
+
+
+def _fileKey(value):
+    # a path to an existing file is keyed together with its modification time and size
+    if isinstance(value, (str, os.PathLike)):
+        try:
+            stat = os.stat(value)
+        except (OSError, ValueError):
+            return value
+        return value, stat.st_mtime_ns, stat.st_size
+    return value
+
+
+def memoize(function=None, maxSize=1024, persistent=False):
     """
     Memoize a function's return value with the function's arguments.
     The next time a function is called with the same arguments, the cache is returned.
@@ -402,18 +472,36 @@ def memoize(function):
         # The first time this function is called the calculation will be made,
         # and and the result will be stored in the cache dict as [first, second]: returnValue
         # From then on, this value will be returned when the same argument is made to the addNumbers function
+
+    Each function has its own cache with a maximum size of `maxSize` results,
+    the least recently used result is removed when the cache is full.
+    The caches are cleared by `clearMemoizeCache()`, for each new drawing.
+
+    A `persistent` cache is kept across drawings, paths to existing files are keyed
+    with the modification time and size of the file:
+        @memoize(maxSize=256, persistent=True)
+        def readFont(path):
+            return TTFont(path)
     """
+    if function is None:
+        return functools.partial(memoize, maxSize=maxSize, persistent=persistent)
+
+    cache = LRUCache(maxSize=maxSize, name=function.__qualname__, persistent=persistent)
+    missing = object()
 
     @functools.wraps(function)
     def wrapper(*args):
-        key = (function, args)
-        if key in _memoizeCache:
-            return _memoizeCache[key]
+        if persistent:
+            key = tuple(_fileKey(arg) for arg in args)
         else:
+            key = args
+        result = cache.get(key, missing)
+        if result is missing:
             result = function(*args)
-            _memoizeCache[key] = result
-            return result
+            cache.set(key, result)
+        return result
 
+    wrapper.cache = cache
     return wrapper
 
 
@@ -0,0 +1,122 @@
+"""
+Simple timing benchmarks for exporting drawings.
+
+Run it with `python scripting/benchmarkExport.py`, the output folder is removed afterwards.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import drawBot
+from drawBot.context.tools.pathData import CLOSEPATH, LINETO, MOVETO, PathData, svgPathData
+from drawBot.misc import formatNumber
+
+LOREM = (
+    "DrawBot is a powerful, free application for macOS that invites you to write simple Python scripts "
+    "to generate two-dimensional graphics. The builtin graphics primitives support rectangles, ovals, "
+    "(bezier) paths, polygons, text objects and transparency. "
+)
+
+
+def makeTextDocument(pageCount=20):
+    drawBot.newDrawing()
+    for i in range(pageCount):
+        drawBot.newPage("A4")
+        drawBot.font("Times-Roman", 9)
+        overflow = LOREM * 40
+        for y in range(4):
+            overflow = drawBot.textBox(overflow, (40, 40 + y * 190, 515, 180), align="justified")
+        drawBot.text(f"{i + 1}", (drawBot.width() / 2, 20), align="center")
+
+
+def timeit(title, func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    print(f"{title:<40} {min(times):8.3f} sec")
+    return min(times)
+
+
+def benchmarkSaveImages(root, extensions=(".pdf", ".png", ".svg")):
+    makeTextDocument()
+    paths = [os.path.join(root, "benchmark" + ext) for ext in extensions]
+
+    def saveImage():
+        for path in paths:
+            drawBot.saveImage(path, multipage=True)
+
+    def saveImages():
+        drawBot.saveImages(paths, multipage=True)
+
+    separate = timeit("saveImage() per format", saveImage)
+    combined = timeit("saveImages() for all formats", saveImages)
+    print(f"{'speedup':<40} {separate / combined:8.2f}x")
+
+
+def benchmarkWorkers(root, workers=4):
+    makeTextDocument(pageCount=80)
+    path = os.path.join(root, "benchmark.png")
+
+    def serial():
+        drawBot.saveImage(path, multipage=True)
+
+    def parallel():
+        drawBot.saveImage(path, multipage=True, workers=workers)
+
+    serialTime = timeit("saveImage() png", serial)
+    parallelTime = timeit(f"saveImage() png with {workers} workers", parallel)
+    print(f"{'speedup':<40} {serialTime / parallelTime:8.2f}x")
+
+
+def referenceSVGPathData(pathData):
+    # the previous element by element implementation
+    svg = ""
+    previousPoint = (0, 0)
+    for segmentType, points in pathData.elements():
+        if segmentType == MOVETO:
+            svg += "M%s,%s " % (formatNumber(points[0][0]), formatNumber(points[0][1]))
+        elif segmentType == CLOSEPATH:
+            svg += "Z "
+        else:
+            command = "l" if segmentType == LINETO else "c"
+            svg += (
+                command
+                + ",".join(
+                    "%s,%s" % (formatNumber(x - previousPoint[0]), formatNumber(y - previousPoint[1]))
+                    for x, y in points
+                )
+                + " "
+            )
+        if points:
+            previousPoint = points[-1]
+    return svg.strip()
+
+
+def benchmarkSVGPathData():
+    random.seed(0)
+    pathData = PathData()
+    for _ in range(500):
+        pathData.moveTo(random.randint(0, 1000), random.uniform(0, 1000))
+        for _ in range(40):
+            pathData.lineTo(random.uniform(0, 1000), random.randint(0, 1000))
+            pathData.curveTo(*[random.uniform(0, 1000) for _ in range(6)])
+        pathData.closePath()
+
+    referenceTime = timeit("svg path data, element by element", lambda: referenceSVGPathData(pathData))
+    resultTime = timeit("svgPathData()", lambda: svgPathData(pathData))
+    print(f"{'speedup':<40} {referenceTime / resultTime:8.2f}x")
+
+
+if __name__ == "__main__":
+    root = tempfile.mkdtemp()
+    try:
+        benchmarkSaveImages(root)
+        benchmarkWorkers(root)
+        benchmarkSVGPathData()
+    finally:
+        shutil.rmtree(root)
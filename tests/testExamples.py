@@ -175,7 +175,19 @@ skip = {
     "test_linkRect",  # skipping, we dont compare raw pdf data
 }
 expectedFailures = {}
-dontSaveImage = {"test_imageSize", "test_drawing"}
+dontSaveImage = {
+    "test_imageSize",
+    "test_drawing",
+    # no reference images yet, they are rendered on macOS
+    "test_bezierPathTransformMany",
+    "test_cacheStats",
+    "test_defineSymbol",
+    "test_formattedStringFromRuns",
+    "test_installHyphenationPatterns",
+    "test_layoutText",
+    "test_pageCacheStats",
+    "test_textFlow",
+}
 
 
 def _addExampleTests():
@@ -1,7 +1,9 @@
 import glob
+import gzip
 import os
 import random
 import sys
+import tempfile
 import unittest
 
 import AppKit  # type: ignore
@@ -18,7 +20,11 @@ from testSupport import (
 )
 
 import drawBot
+from drawBot.context.imageContext import PNGContext, _scriptRunsOnImport
 from drawBot.context.tools.gifTools import gifFrameCount
+from drawBot.context.tools.mp4Tools import _frameTimesFilter
+from drawBot.context.tools.pageCache import PageCache
+from drawBot.drawBotInstructions import InstructionSet
 from drawBot.misc import DrawBotError
 
 
@@ -258,6 +264,273 @@ class ExportTest(DrawBotBaseTest):
             "Cannot apply saveImage options to multiple output formats, expected 'str' or 'os.PathLike', got 'list'",
         )
 
+    def test_saveImages(self):
+        self.makeTestAnimation(3)
+        drawBot.text("Hello World", (10, 10))
+        with TempFolder() as tmpFolder:
+            paths = [os.path.join(tmpFolder.path, "saveImages" + ext) for ext in (".pdf", ".png", ".svg")]
+            with StdOutCollector(captureStdErr=True) as output:
+                drawBot.saveImages(paths, multipage=True)
+            self.assertEqual(output.lines(), [])
+            for path in paths:
+                base, ext = os.path.splitext(path)
+                expectedPath = base + "_expected" + ext
+                drawBot.saveImage(expectedPath, multipage=True)
+                if ext == ".pdf":
+                    self.assertPDFFilesEqual(path, expectedPath)
+                else:
+                    for index in range(1, 4):
+                        self.assertForFileExtension(ext[1:], f"{base}_{index}{ext}", f"{base}_expected_{index}{ext}")
+
+    def test_saveImages_singlePath(self):
+        self.makeTestDrawing()
+        with self.assertRaises(TypeError):
+            drawBot.saveImages("foo.pdf")
+
+    def test_saveImages_pageCache(self):
+        self.makeTestAnimation(3)
+        with TempFolder() as tmpFolder:
+            cachePath = os.path.join(tmpFolder.path, "cache")
+            pdfPath = os.path.join(tmpFolder.path, "pageCache.pdf")
+            pngPath = os.path.join(tmpFolder.path, "pageCache.png")
+            drawBot.saveImage(pdfPath, multipage=True, pageCache=cachePath)
+            self.assertEqual(drawBot.pageCacheStats(), dict(hits=0, misses=3, uncacheable=0))
+            # the pdf pages are reused, the png pages are drawn
+            drawBot.saveImages([pdfPath, pngPath], multipage=True, pageCache=cachePath)
+            self.assertEqual(drawBot.pageCacheStats(), dict(hits=3, misses=3, uncacheable=0))
+            drawBot.saveImages([pdfPath, pngPath], multipage=True, pageCache=cachePath)
+            self.assertEqual(drawBot.pageCacheStats(), dict(hits=6, misses=0, uncacheable=0))
+            expectedPdfPath = os.path.join(tmpFolder.path, "expected.pdf")
+            expectedPngPath = os.path.join(tmpFolder.path, "expected.png")
+            drawBot.saveImages([expectedPdfPath, expectedPngPath], multipage=True)
+            self.assertPDFFilesEqual(pdfPath, expectedPdfPath)
+            for index in range(1, 4):
+                self.assertForFileExtension(
+                    "png",
+                    os.path.join(tmpFolder.path, f"pageCache_{index}.png"),
+                    os.path.join(tmpFolder.path, f"expected_{index}.png"),
+                )
+
+    def test_saveImage_workers(self):
+        self.makeTestAnimation(5)
+        with TempFolder() as tmpFolder:
+            path = os.path.join(tmpFolder.path, "workers.png")
+            expectedPath = os.path.join(tmpFolder.path, "expected.png")
+            with StdOutCollector(captureStdErr=True) as output:
+                drawBot.saveImage(path, multipage=True, workers=2)
+            self.assertEqual(output.lines(), [])
+            drawBot.saveImage(expectedPath, multipage=True)
+            for index in range(1, 6):
+                self.assertImageFilesEqual(
+                    os.path.join(tmpFolder.path, f"workers_{index}.png"),
+                    os.path.join(tmpFolder.path, f"expected_{index}.png"),
+                )
+            self.assertFalse(os.path.exists(os.path.join(tmpFolder.path, "workers_6.png")))
+
+    def test_saveImage_workers_mainGuard(self):
+        self.assertTrue(_scriptRunsOnImport("from drawBot import *\nnewPage()\nsaveImage('a.png', workers=2)\n"))
+        self.assertTrue(_scriptRunsOnImport("for i in range(3):\n    newPage()\n"))
+        self.assertFalse(
+            _scriptRunsOnImport(
+                '"""doc"""\nimport drawBot\n\n\ndef draw():\n    drawBot.newPage()\n\n\n'
+                'if __name__ == "__main__":\n    draw()\n'
+            )
+        )
+
+    def test_saveImage_streamPages(self):
+        with TempFolder() as tmpFolder:
+            path = os.path.join(tmpFolder.path, "stream.png")
+            context = PNGContext()
+            context.prepareSaveImage(path, dict(multipage=True))
+            context.newPage(100, 100)
+            context.rect(10, 10, 80, 80)
+            context.newPage(100, 100)
+            # the first page is written as soon as the second page starts
+            self.assertTrue(os.path.exists(os.path.join(tmpFolder.path, "stream_1.png")))
+            self.assertFalse(os.path.exists(os.path.join(tmpFolder.path, "stream_2.png")))
+            context.saveImage(path, dict(multipage=True))
+            self.assertTrue(os.path.exists(os.path.join(tmpFolder.path, "stream_2.png")))
+
+    def test_saveImage_gif_workers(self):
+        self.makeTestAnimation(5)
+        with TempFolder() as tmpFolder:
+            path = os.path.join(tmpFolder.path, "workers.gif")
+            drawBot.saveImage(path, workers=2)
+            self.assertTrue(os.path.exists(path))
+
+    def test_saveImage_gif_removesTemporaryFrames(self):
+        self.makeTestAnimation(3)
+        with TempFolder() as tmpFolder, TempFolder() as tempRoot:
+            tempDir = tempfile.tempdir
+            tempfile.tempdir = tempRoot.path
+            try:
+                drawBot.saveImage(os.path.join(tmpFolder.path, "frames.gif"))
+                drawBot.saveImage(os.path.join(tmpFolder.path, "workers.gif"), workers=2)
+            finally:
+                tempfile.tempdir = tempDir
+            self.assertEqual(os.listdir(tempRoot.path), [])
+
+    def test_saveImage_pageCache(self):
+        for ext in (".png", ".svg", ".pdf"):
+            with TempFolder() as tmpFolder:
+                cachePath = os.path.join(tmpFolder.path, "cache")
+                path = os.path.join(tmpFolder.path, "pageCache" + ext)
+                self.makeTestAnimation(4)
+                drawBot.saveImage(path, multipage=True, pageCache=cachePath)
+                self.assertEqual(drawBot.pageCacheStats(), dict(hits=0, misses=4, uncacheable=0))
+                expectedPath = os.path.join(tmpFolder.path, "expected" + ext)
+                drawBot.saveImage(expectedPath, multipage=True)
+                drawBot.saveImage(path, multipage=True, pageCache=cachePath)
+                self.assertEqual(drawBot.pageCacheStats(), dict(hits=4, misses=0, uncacheable=0))
+                if ext == ".pdf":
+                    self.assertPDFFilesEqual(path, expectedPath)
+                else:
+                    for index in range(1, 5):
+                        self.assertForFileExtension(
+                            ext[1:],
+                            os.path.join(tmpFolder.path, f"pageCache_{index}{ext}"),
+                            os.path.join(tmpFolder.path, f"expected_{index}{ext}"),
+                        )
+                # change a single page
+                drawBot.newPage(500, 500)
+                drawBot.linkURL("https://www.drawbot.com", (10, 10, 100, 100))
+                drawBot.saveImage(path, multipage=True, pageCache=cachePath)
+                self.assertEqual(drawBot.pageCacheStats(), dict(hits=4, misses=0, uncacheable=1))
+
+    def test_pageCache_bezierPathKey(self):
+        with TempFolder() as tmpFolder:
+            pageCache = PageCache(os.path.join(tmpFolder.path, "cache"), "PDFContext", {}, ".pdf")
+            path = drawBot.BezierPath()
+            path.rect(10, 10, 50, 50)
+            instructionSet = InstructionSet()
+            instructionSet.append("drawPath", (path,))
+            key = pageCache.getKey(instructionSet)
+            self.assertIsNotNone(key)
+            # building the NSBezierPath doesn't change the key
+            path.getNSBezierPath()
+            self.assertEqual(pageCache.getKey(instructionSet), key)
+            path.lineTo((100, 100))
+            self.assertNotEqual(pageCache.getKey(instructionSet), key)
+
+    def test_instructionSet_hasCallback(self):
+        instructionSet = InstructionSet()
+        instructionSet.append("rect", (10, 10, 50, 50))
+        self.assertTrue(instructionSet.hasCallback("rect"))
+        self.assertFalse(instructionSet.hasCallback("newPage"))
+        instructionSet.prepend("newPage", (100, 100))
+        self.assertTrue(instructionSet.hasCallback("newPage"))
+        self.assertFalse(instructionSet.hasCallback("linkURL"))
+
+    def test_pageCache_hyphenationPatternsKey(self):
+        with TempFolder() as tmpFolder:
+            cachePath = os.path.join(tmpFolder.path, "cache")
+            patternPath = os.path.join(tmpFolder.path, "hyph-test.tex")
+            with open(patternPath, "w") as f:
+                f.write("\\patterns{ .hy1p he2n }")
+            drawBot.installHyphenationPatterns("en", patternPath)
+            try:
+                contextKey = PageCache(cachePath, "PDFContext", {}, ".pdf")._contextKey
+                self.assertEqual(PageCache(cachePath, "PDFContext", {}, ".pdf")._contextKey, contextKey)
+                # editing the installed pattern file changes the key
+                with open(patternPath, "w") as f:
+                    f.write("\\patterns{ .hy1p he2n hena4 }")
+                self.assertNotEqual(PageCache(cachePath, "PDFContext", {}, ".pdf")._contextKey, contextKey)
+            finally:
+                drawBot.uninstallHyphenationPatterns("en")
+
+    def test_saveImage_svgPathOptions(self):
+        drawBot.newDrawing()
+        drawBot.newPage(100, 100)
+        drawBot.polygon((10.123, 10), (90, 10), (50, 80.5))
+        with TempFile(suffix=".svg") as tmp:
+            drawBot.saveImage(tmp.path)
+            with open(tmp.path) as f:
+                self.assertIn('d="M10.12,10 l79.88,0 l-40,70.5 Z"', f.read())
+            drawBot.saveImage(tmp.path, svgPathPrecision=1, svgPathRelative=False)
+            with open(tmp.path) as f:
+                self.assertIn('d="M10.1,10 L90,10 L50,80.5 Z"', f.read())
+
+    def test_saveImage_svgz(self):
+        self.makeTestAnimation(3)
+        with TempFolder() as tmpFolder:
+            svgPath = os.path.join(tmpFolder.path, "streamed.svg")
+            drawBot.saveImage(svgPath, multipage=True)
+            drawBot.saveImage(svgPath + "z", multipage=True)
+            drawBot.saveImage(os.path.join(tmpFolder.path, "single.svgz"))
+            for index in range(1, 4):
+                with open(os.path.join(tmpFolder.path, f"streamed_{index}.svg"), "rb") as f:
+                    svgData = f.read()
+                with gzip.open(os.path.join(tmpFolder.path, f"streamed_{index}.svgz"), "rb") as f:
+                    self.assertEqual(f.read(), svgData)
+            with gzip.open(os.path.join(tmpFolder.path, "single.svgz"), "rb") as f:
+                self.assertEqual(f.read(), svgData)
+
+    def test_symbols(self):
+        path = drawBot.BezierPath()
+        path.oval(-10, -10, 20, 20)
+        path.star((0, 0), 12, 10, 5)
+
+        def drawGrid(useSymbols):
+            drawBot.newDrawing()
+            drawBot.newPage(500, 500)
+            drawBot.fill(1, 0, 0)
+            drawBot.stroke(0)
+            dot = drawBot.defineSymbol(path)
+            for x in range(0, 500, 25):
+                for y in range(0, 500, 25):
+                    if useSymbols:
+                        drawBot.placeSymbol(dot, (1, 0, 0, 1, x, y))
+                    else:
+                        with drawBot.savedState():
+                            drawBot.translate(x, y)
+                            drawBot.drawPath(path)
+
+        with TempFolder() as tmpFolder:
+            for ext in (".pdf", ".svg"):
+                pathsPath = os.path.join(tmpFolder.path, "paths" + ext)
+                symbolsPath = os.path.join(tmpFolder.path, "symbols" + ext)
+                drawGrid(False)
+                drawBot.saveImage(pathsPath)
+                drawGrid(True)
+                drawBot.saveImage(symbolsPath)
+                self.assertLess(os.path.getsize(symbolsPath) * 4, os.path.getsize(pathsPath))
+            with open(symbolsPath) as f:
+                svg = f.read()
+            self.assertEqual(svg.count("<symbol "), 1)
+            self.assertEqual(svg.count("<use "), 400)
+            symbolsPNGPath = os.path.join(tmpFolder.path, "symbols.png")
+            pathsPNGPath = os.path.join(tmpFolder.path, "paths.png")
+            drawBot.saveImage(symbolsPNGPath)
+            drawGrid(False)
+            drawBot.saveImage(pathsPNGPath)
+            self.assertImageFilesEqual(symbolsPNGPath, pathsPNGPath)
+        symbol = drawBot.defineSymbol(path)
+        drawBot.newDrawing()
+        drawBot.placeSymbol(symbol)
+        with TempFile(suffix=".pdf") as tmp:
+            with self.assertRaises(DrawBotError):
+                drawBot.saveImage(tmp.path)
+
+    def test_symbols_svg_multipage(self):
+        path = drawBot.BezierPath()
+        path.oval(-10, -10, 20, 20)
+        drawBot.newDrawing()
+        drawBot.newPage(100, 100)
+        drawBot.shadow((2, -2), 4, (0, 0, 0, 0.5))
+        drawBot.linearGradient((-10, 0), (10, 0), [(1, 0, 0), (0, 0, 1)])
+        dot = drawBot.defineSymbol(path)
+        drawBot.placeSymbol(dot, (1, 0, 0, 1, 50, 50))
+        drawBot.newPage(100, 100)
+        drawBot.placeSymbol(dot, (1, 0, 0, 1, 50, 50))
+        with TempFolder() as tmpFolder:
+            drawBot.saveImage(os.path.join(tmpFolder.path, "symbols.svg"), multipage=True)
+            for pageNumber in (1, 2):
+                with open(os.path.join(tmpFolder.path, "symbols_%s.svg" % pageNumber)) as f:
+                    svg = f.read()
+                self.assertEqual(svg.count("<symbol "), 1)
+                self.assertEqual(svg.count("<filter "), 2)
+                self.assertEqual(svg.count("<linearGradient "), 2)
+
     def test_saveImage_png_multipage(self):
         self.makeTestDrawing()
         with StdOutCollector(captureStdErr=True) as output:
@@ -279,6 +552,25 @@ class ExportTest(DrawBotBaseTest):
             self._saveImageAndReturnSize(".mp4", ffmpegCodec="mpeg4")
         self.assertEqual(output.lines(), [])
 
+    def test_saveImage_mp4_frameDurations(self):
+        drawBot.newDrawing()
+        for i in range(4):
+            drawBot.newPage(100, 100)
+            drawBot.frameDuration(2 / 25 if i % 2 else 1 / 25)
+            drawBot.rect(i * 10, 10, 20, 20)
+        with TempFolder() as tmpFolder:
+            path = os.path.join(tmpFolder.path, "frameDurations.mp4")
+            with StdOutCollector(captureStdErr=True) as output:
+                drawBot.saveImage(path)
+            self.assertEqual(output.lines(), [])
+            self.assertTrue(os.path.getsize(path) > 0)
+
+    def test_mp4_frameTimesFilter(self):
+        self.assertEqual(
+            _frameTimesFilter([0.5, 0.5, 1.0]),
+            "settb=1/60000,setpts='round((between(N,0,1)*(0+(N-0)*0.5)+between(N,2,2)*(1.0+(N-2)*1.0)+gte(N,3)*2.0)/TB)'",
+        )
+
     def test_saveImage_mp4_imageResolution(self):
         self.makeTestDrawing()
         with StdOutCollector(captureStdErr=True) as output:
@@ -1,6 +1,7 @@
 import io
 import os
 import pathlib
+import random
 import sys
 import tempfile
 import unittest
@@ -10,7 +11,20 @@ from fontTools.ttLib import TTFont
 from testSupport import StdOutCollector, testDataDir
 
 import drawBot
-from drawBot.misc import DrawBotError, validateLanguageCode
+from drawBot.context.baseContext import (
+    BaseContext,
+    getCGPathCacheStats,
+    getHyphenationCacheStats,
+    getTextAttributesCacheStats,
+    getTextLayoutCacheStats,
+    makeTextBox,
+    makeTextBoxes,
+)
+from drawBot.context.tools import fontIndex, glyphOutlines, variation
+from drawBot.context.tools.coverageIndex import CoverageIndex, FontCoverage
+from drawBot.context.tools.hyphenator import Hyphenator, getHyphenator, loadPatterns, parsePatterns
+from drawBot.context.tools.pathData import CLOSEPATH, LINETO, MOVETO, PathData, svgPathData
+from drawBot.misc import DrawBotError, LRUCache, clearMemoizeCache, formatNumber, memoize, validateLanguageCode
 from drawBot.scriptTools import ScriptRunner
 
 
@@ -142,6 +156,142 @@ class MiscTest(unittest.TestCase):
         with self.assertRaises(TypeError):
             drawBot.polygon((1, 2), (3, 4), closed=False, foo=123)
 
+    def test_bezierPath_pathData(self):
+        path = drawBot.BezierPath()
+        path.moveTo((0, 0))
+        path.lineTo((100, 0))
+        path.curveTo((100, 50), (50, 100), (0, 100))
+        path.closePath()
+        self.assertEqual(path.points, ((0, 0), (100, 0), (100, 50), (50, 100), (0, 100)))
+        self.assertEqual(path.onCurvePoints, ((0, 0), (100, 0), (0, 100)))
+        self.assertEqual(path.offCurvePoints, ((100, 50), (50, 100)))
+        self.assertEqual(path.controlPointBounds(), (0, 0, 100, 100))
+        # the NSBezierPath is build on request and contains the same elements
+        nsBezierPath = path.getNSBezierPath()
+        self.assertEqual(nsBezierPath.elementCount(), 4)
+        (x, y), (w, h) = nsBezierPath.bounds()
+        self.assertEqual([round(v, 5) for v in path.bounds()], [round(v, 5) for v in (x, y, x + w, y + h)])
+        # changes to the NSBezierPath are kept
+        nsBezierPath.moveToPoint_((200, 200))
+        nsBezierPath.lineToPoint_((200, 300))
+        self.assertEqual(path.points[-2:], ((200, 200), (200, 300)))
+        copy = path.copy()
+        copy.translate(10, 20)
+        self.assertEqual(copy.points[0], (10, 20))
+        self.assertEqual(path.points[0], (0, 0))
+        path.scale(2, center=(50, 50))
+        self.assertEqual(path.points[0], (-50, -50))
+        contours = path.contours
+        self.assertEqual(len(contours), 2)
+        self.assertFalse(contours[0].open)
+        self.assertTrue(contours[1].open)
+        self.assertIsNone(drawBot.BezierPath().bounds())
+
+    def test_bezierPath_copyOnWrite(self):
+        path = drawBot.BezierPath()
+        path.rect(0, 0, 100, 100)
+        version = path._version
+        copy = path.copy()
+        # the copy shares the geometry until one of both changes
+        self.assertIs(copy._getPathData(), path._getPathData())
+        self.assertEqual(path._version, version)
+        copy.translate(10, 10)
+        self.assertIsNot(copy._getPathData(), path._getPathData())
+        self.assertEqual(path.points[0], (0, 0))
+        self.assertEqual(copy.points[0], (10, 10))
+        copy2 = path.copy()
+        path.lineTo((50, 50))
+        self.assertGreater(path._version, version)
+        self.assertEqual(len(copy2.points), 4)
+        self.assertEqual(len(path.points), 5)
+        # changes to the NSBezierPath are not visible in copies
+        copy3 = path.copy()
+        path.getNSBezierPath().lineToPoint_((60, 60))
+        self.assertEqual(len(path.points), 6)
+        self.assertEqual(len(copy3.points), 5)
+        copy4 = path.copy()
+        path.getNSBezierPath().lineToPoint_((70, 70))
+        self.assertEqual(len(copy4.points), 6)
+
+    def test_bezierPath_cgPathCache(self):
+        path = drawBot.BezierPath()
+        path.oval(0, 0, 100, 100)
+        stats = getCGPathCacheStats()
+        cgPath = path._getCGPath()
+        self.assertIs(path._getCGPath(), cgPath)
+        self.assertIs(path.copy()._getCGPath(), cgPath)
+        self.assertEqual(getCGPathCacheStats(), dict(hits=stats["hits"] + 2, misses=stats["misses"] + 1))
+        path.translate(10, 10)
+        self.assertIsNot(path._getCGPath(), cgPath)
+        # the result of a CGPath operation keeps the CGPath
+        stroked = path.expandStroke(10)
+        stroked._getCGPath()
+        self.assertEqual(getCGPathCacheStats(), dict(hits=stats["hits"] + 4, misses=stats["misses"] + 2))
+
+    def test_svgPathData(self):
+        pathData = PathData()
+        pathData.moveTo(10, 10.5)
+        pathData.lineTo(20.001, 10.5)
+        pathData.curveTo(30, 10.5, 40.123, 20, 40.123, 30)
+        pathData.closePath()
+        self.assertEqual(svgPathData(pathData), "M10,10.5 l10.0,0 c10.0,0,20.12,9.5,20.12,19.5 Z")
+        self.assertEqual(svgPathData(pathData, precision=1), "M10,10.5 l10.0,0 c10.0,0,20.1,9.5,20.1,19.5 Z")
+        self.assertEqual(svgPathData(pathData, relative=False), "M10,10.5 L20.0,10.5 C30,10.5,40.12,20,40.12,30 Z")
+        self.assertEqual(svgPathData(pathData, precision=None, relative=False).split()[1], "L20.001,10.5")
+        self.assertEqual(svgPathData(PathData()), "")
+
+    def test_svgPathData_reference(self):
+        def referenceSVGPath(pathData):
+            # the previous element by element implementation
+            svg = ""
+            previousPoint = (0, 0)
+            for segmentType, points in pathData.elements():
+                if segmentType == MOVETO:
+                    svg += "M%s,%s " % (formatNumber(points[0][0]), formatNumber(points[0][1]))
+                elif segmentType == CLOSEPATH:
+                    svg += "Z "
+                else:
+                    command = "l" if segmentType == LINETO else "c"
+                    svg += (
+                        command
+                        + ",".join(
+                            "%s,%s" % (formatNumber(x - previousPoint[0]), formatNumber(y - previousPoint[1]))
+                            for x, y in points
+                        )
+                        + " "
+                    )
+                if points:
+                    previousPoint = points[-1]
+            return svg.strip()
+
+        random.seed(0)
+        pathData = PathData()
+        for _ in range(50):
+            pathData.moveTo(random.randint(0, 1000), random.uniform(0, 1000))
+            for _ in range(40):
+                pathData.lineTo(random.uniform(0, 1000), random.randint(0, 1000))
+                pathData.curveTo(*[random.uniform(0, 1000) for _ in range(6)])
+            pathData.closePath()
+        self.assertEqual(svgPathData(pathData), referenceSVGPath(pathData))
+
+    def test_bezierPath_transformMany(self):
+        path = drawBot.BezierPath()
+        path.rect(0, 0, 10, 10)
+        path.svgID = "tile"
+        matrices = [(1, 0, 0, 1, i * 20, 0) for i in range(3)] + [(2, 0, 0, 2, 0, 0)]
+        tiles = drawBot.BezierPath.transformMany(path, matrices)
+        self.assertEqual(len(tiles), 4)
+        for tile, matrix in zip(tiles, matrices):
+            expected = path.copy()
+            expected.transform(matrix)
+            self.assertEqual(tile.points, expected.points)
+            self.assertEqual(tile.svgID, "tile")
+        self.assertEqual(path.points[0], (0, 0))
+        rotated = drawBot.BezierPath.transformMany(tiles[:2], [(0, 1, -1, 0, 0, 0)] * 2, center=(5, 5))
+        self.assertEqual(rotated[0].controlPointBounds(), (0, 0, 10, 10))
+        with self.assertRaises(DrawBotError):
+            drawBot.BezierPath.transformMany(tiles, matrices[:2])
+
     def test_image_imageResolution(self):
         path = os.path.join(testDataDir, "drawbot.png")
         dpi = drawBot.imageResolution(path)
@@ -266,6 +416,24 @@ class MiscTest(unittest.TestCase):
         self.assertEqual(drawBot.height(), 500)
         self.assertEqual(drawBot.pageCount(), 2)
 
+    def test_instructionSet(self):
+        drawBot.newDrawing()
+        drawBot.rect(10, 20.5, 30, 40)
+        drawBot.moveTo((1.5, 2))
+        drawBot.fill(None)
+        drawBot.openTypeFeatures(liga=False)
+        (page,) = drawBot.pages()
+        self.assertEqual(
+            list(page._instructionSet),
+            [
+                ("newPage", (1000, 1000), {}),
+                ("rect", (10, 20.5, 30, 40), {}),
+                ("moveTo", ((1.5, 2),), {}),
+                ("fill", (None, None, None, 1), {}),
+                ("openTypeFeatures", (), {"resetFeatures": False, "liga": False}),
+            ],
+        )
+
     def test_font_install(self):
         fontPath = os.path.join(testDataDir, "MutatorSans.ttf")
         drawBot.newDrawing()
@@ -299,6 +467,54 @@ class MiscTest(unittest.TestCase):
             },
         )
 
+    def test_formattedString_iadd(self):
+        fs = drawBot.FormattedString("a", fontSize=20)
+        original = fs
+        fs += "b"
+        fs += drawBot.FormattedString("c")
+        self.assertIs(fs, original)
+        self.assertEqual(str(fs), "abc")
+        # drawing records a copy, changes afterwards are not drawn
+        drawBot.newDrawing()
+        drawBot.textBox(fs, (0, 0, 100, 100))
+        fs += "d"
+        callback, args, kwargs = list(drawBot._drawBotDrawingTool._instructionsStack[-1])[-1]
+        self.assertEqual(callback, "textBox")
+        self.assertEqual(str(args[0]), "abc")
+
+    def test_formattedString_fromRuns(self):
+        runs = [
+            ("a", dict(fontSize=20)),
+            ("b", dict(fill=(1, 0, 0))),
+            ("c", dict(fontSize=20)),
+            ("d", dict(fontSize=20)),
+        ]
+        fs = drawBot.FormattedString.fromRuns(runs, font="Helvetica")
+        expected = drawBot.FormattedString()
+        expected.append("a", font="Helvetica", fontSize=20)
+        expected.append("b", fontSize=10, fill=(1, 0, 0))
+        expected.append("cd", fontSize=20, fill=(0, 0, 0))
+        self.assertEqual(str(fs), "abcd")
+        self.assertTrue(fs.getNSObject().isEqualToAttributedString_(expected.getNSObject()))
+        self.assertEqual(fs.textProperties(), expected.textProperties())
+        with self.assertRaises(TypeError):
+            drawBot.FormattedString.fromRuns([("a", dict(foo=1))])
+
+    def test_formattedString_attributesCache(self):
+        drawBot.newDrawing()
+        fs = drawBot.FormattedString()
+        stats = getTextAttributesCacheStats()
+        for i in range(10):
+            fs.append("a", font="Helvetica", fontSize=20, fill=(1, 0, 0))
+            fs.append("b", fill=(0, 0, 1))
+        newStats = getTextAttributesCacheStats()
+        self.assertEqual(newStats["attributes"]["hits"], stats["attributes"]["hits"] + 18)
+        self.assertEqual(newStats["attributes"]["misses"], stats["attributes"]["misses"] + 2)
+        # different colors share the same font
+        self.assertEqual(newStats["fonts"]["misses"], stats["fonts"]["misses"] + 1)
+        expected = drawBot.FormattedString("a", font="Helvetica", fontSize=20, fill=(1, 0, 0))
+        self.assertTrue(fs[:1].getNSObject().isEqualToAttributedString_(expected.getNSObject()))
+
     def test_formattedString_issue337(self):
         # https://github.com/typemytype/drawbot/issues/337
         drawBot.newDrawing()
@@ -375,6 +591,419 @@ class MiscTest(unittest.TestCase):
             [str(i.formattedSubString) for i in bounds], ["hello hello ", "foo foo ", "bar bar ", "world world "]
         )
 
+    def test_layoutText(self):
+        drawBot.newDrawing()
+        txt = "hello foo bar world " * 10
+        box = (10, 10, 300, 30)
+        stats = getTextLayoutCacheStats()
+        layout = drawBot.layoutText(txt, box)
+        self.assertEqual(layout.origins, drawBot.textBoxBaselines(txt, box))
+        self.assertEqual(layout.overflow, drawBot.textOverflow(txt, box))
+        self.assertEqual(
+            [i.bounds for i in layout.characterBounds], [i.bounds for i in drawBot.textBoxCharacterBounds(txt, box)]
+        )
+        self.assertEqual(len(layout.lines), 2)
+        # the text is typesetted once and reused by all other functions
+        newStats = getTextLayoutCacheStats()
+        self.assertEqual(newStats["misses"] - stats["misses"], 1)
+        self.assertEqual(newStats["hits"] - stats["hits"], 3)
+        # a formatted string changed in place is typesetted again
+        fs = drawBot.FormattedString(txt)
+        overflow = str(drawBot.textOverflow(fs, box))
+        fs += "more"
+        self.assertEqual(str(drawBot.textOverflow(fs, box)), overflow + "more")
+        # a bezier path box
+        path = drawBot.BezierPath()
+        path.rect(*box)
+        self.assertEqual(drawBot.layoutText(txt, path).origins, layout.origins)
+
+    def test_textFlow(self):
+        drawBot.newDrawing()
+        txt = "hello foo bar world " * 100
+        box = (10, 10, 200, 100)
+        flow = drawBot.textFlow(txt)
+        while flow:
+            drawBot.newPage(220, 120)
+            flow.textBox(box)
+        self.assertEqual(drawBot.pageCount(), len(flow.ranges))
+        self.assertEqual(flow.overflow, "")
+        # the ranges follow each other and cover the whole text
+        location = 0
+        for start, length in flow.ranges:
+            self.assertEqual(start, location)
+            self.assertGreater(length, 0)
+            location += length
+        self.assertEqual(location, len(txt))
+        # the same as drawing the overflow of the previous text box
+        lengths = []
+        overflow = txt
+        while overflow:
+            newOverflow = drawBot.textOverflow(overflow, box)
+            lengths.append(len(overflow) - len(newOverflow))
+            overflow = newOverflow
+        self.assertEqual([length for _, length in flow.ranges], lengths)
+        with tempfile.TemporaryDirectory() as tempDir:
+            drawBot.saveImage(os.path.join(tempDir, "textFlow.pdf"))
+        # a box without room for a single character
+        flow = drawBot.textFlow(txt)
+        with self.assertRaises(DrawBotError):
+            flow.textBox((10, 10, 1, 1))
+        self.assertEqual(flow.ranges, [])
+
+    def test_textFlow_hyphenation(self):
+        drawBot.newDrawing()
+        drawBot.hyphenation(True)
+        txt = "Typography is the art and technique of arranging type to make written language legible. " * 20
+        flow = drawBot.textFlow(txt, align="justified")
+        layout = flow.layoutText((10, 10, 100, 100))
+        self.assertEqual(layout.range[0], 0)
+        while flow:
+            drawBot.newPage(120, 120)
+            flow.textBox((10, 10, 100, 100))
+        self.assertEqual(flow.ranges[0], layout.range)
+        self.assertEqual(sum(length for _, length in flow.ranges), len(txt))
+
+    def test_characterBounds_hyphenation(self):
+        drawBot.newDrawing()
+        drawBot.hyphenation(True)
+        txt = "Typography is the art and technique of arranging type to make written language legible. " * 5
+        box = (10, 10, 100, 300)
+        layout = drawBot.layoutText(txt, box)
+        location, length = layout.range
+        # the runs map back to the text without the inserted hyphens
+        substrings = [str(substring) for _, _, substring in drawBot.textBoxCharacterBounds(txt, box)]
+        self.assertEqual("".join(substrings), txt[location : location + length])
+        self.assertTrue(any(not substring.endswith((" ", ".")) for substring in substrings))
+
+    def test_hyphenation_incremental(self):
+        drawBot.newDrawing()
+        drawBot.hyphenation(True)
+        txt = "Typography is the art and technique of arranging type to make written language legible. " * 50
+        box = (10, 10, 100, 200)
+        overflow = drawBot.textOverflow(txt, box)
+        self.assertTrue(txt.endswith(overflow))
+        self.assertLess(len(overflow), len(txt))
+        # only the visible text is hyphenated, the overflow is kept as is
+        attrString = drawBot._drawBotDrawingTool._dummyContext.attributedString(txt)
+        path = drawBot.BezierPath()
+        path.rect(*box)
+        hyphenated = drawBot._drawBotDrawingTool._dummyContext.hyphenateAttributedString(attrString, path._getCGPath())
+        self.assertIn("-", hyphenated.string())
+        self.assertTrue(hyphenated.string().endswith(overflow))
+        # hyphenation points of words are reused
+        stats = getHyphenationCacheStats()
+        drawBot.textOverflow(txt, (10, 10, 120, 200))
+        self.assertGreater(getHyphenationCacheStats()["hits"], stats["hits"])
+
+    def test_memoize(self):
+        calls = []
+
+        @memoize(maxSize=2)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual(double(1), 2)
+        self.assertEqual(double(1), 2)
+        self.assertEqual(calls, [1])
+        double(2)
+        double(3)
+        # the least recently used result is removed
+        double(1)
+        self.assertEqual(calls, [1, 2, 3, 1])
+        self.assertEqual(double.cache.stats(), dict(hits=1, misses=4, evictions=2, size=2, maxSize=2))
+        clearMemoizeCache()
+        self.assertEqual(len(double.cache), 0)
+
+    def test_memoizePersistent(self):
+        calls = []
+
+        @memoize(persistent=True)
+        def readFile(path):
+            calls.append(path)
+            with open(path) as f:
+                return f.read()
+
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, "test.txt")
+            with open(path, "w") as f:
+                f.write("foo")
+            self.assertEqual(readFile(path), "foo")
+            # kept across drawings
+            clearMemoizeCache()
+            self.assertEqual(readFile(path), "foo")
+            self.assertEqual(len(calls), 1)
+            # a changed file is read again
+            with open(path, "w") as f:
+                f.write("foobar")
+            self.assertEqual(readFile(path), "foobar")
+            self.assertEqual(len(calls), 2)
+
+    def test_cacheStats(self):
+        from drawBot.misc import _lruCaches
+
+        cache = LRUCache(maxSize=1, name="testCache")
+        # don't keep the test cache registered for the other tests
+        self.addCleanup(_lruCaches.remove, cache)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("b")
+        cache.get("a")
+        stats = drawBot.cacheStats()
+        self.assertEqual(stats["testCache"], dict(hits=1, misses=1, evictions=1, size=1, maxSize=1))
+        for name in ("textLayout", "textAttributes", "hyphenation", "getNSFontFromNameOrPath", "cgPath", "pageCache"):
+            self.assertIn(name, stats)
+        drawBot.newDrawing()
+        drawBot.text("hello", (10, 10))
+        drawBot.text("hello", (10, 10))
+        self.assertGreater(drawBot.cacheStats()["getNSFontFromNameOrPath"]["hits"], 0)
+
+    def test_openTypeFeatureWarning_cachedFont(self):
+        from drawBot.misc import warnings
+
+        for i in range(2):
+            warnings.resetWarnings()
+            drawBot.newDrawing()
+            with StdOutCollector(captureStdErr=True) as output:
+                drawBot.font("Times")
+                drawBot.openTypeFeatures(kern=True)
+                drawBot.text("hello", (10, 10))
+            self.assertEqual(
+                output.lines(), ["*** DrawBot warning: OpenType feature 'kern' not available for 'Times' ***"]
+            )
+
+    def test_openTypeFeatureWarning_cachedAttributes(self):
+        from drawBot.misc import warnings
+
+        for i in range(2):
+            warnings.resetWarnings()
+            with StdOutCollector(captureStdErr=True) as output:
+                # the second formatted string gets its attributes from the cache
+                drawBot.FormattedString("hello", font="Times", openTypeFeatures=dict(kern=True))
+            self.assertEqual(
+                output.lines(), ["*** DrawBot warning: OpenType feature 'kern' not available for 'Times' ***"]
+            )
+
+    def test_makeTextBoxes(self):
+        context = BaseContext()
+        context.fontSize(20)
+        context.lineHeight(30)
+        for align in (None, "center", "right"):
+            attributedString = context.attributedString("hello", align=align)
+            # the single line fast path gives the same box
+            self.assertEqual(
+                makeTextBox(attributedString, (10, 20), align=align, plainText=True),
+                makeTextBoxes(attributedString, (10, 20), align=align, plainText=True)[0],
+            )
+        self.assertIsNone(makeTextBox(context.attributedString(""), (10, 20), align=None, plainText=True))
+        attributedString = context.attributedString("hello\nworld\nfoo")
+        textBoxes = makeTextBoxes(attributedString, (10, 20), align=None, plainText=True)
+        self.assertEqual([substring for substring, box in textBoxes], ["hello", "world", "foo"])
+        boxYs = [box[1] for substring, box in textBoxes]
+        self.assertAlmostEqual(boxYs[0] - boxYs[1], 30)
+        self.assertAlmostEqual(boxYs[1] - boxYs[2], 30)
+
+    def test_hyphenatorPatterns(self):
+        data = parsePatterns(
+            "% comment\n\\patterns{ .hy1p he2n hena4 hen5at 1na n2at 1tio 2io o2n }\n\\hyphenation{ ta-ble }"
+        )
+        self.assertEqual(data["patterns"][".hyp"], b"\x00\x00\x00\x01\x00")
+        self.assertEqual(data["exceptions"], {"table": (2,)})
+        hyphenator = Hyphenator(**data)
+        self.assertEqual(hyphenator.hyphenate("hyphenation"), "hy-phen-ation")
+        self.assertEqual(hyphenator.hyphenate("Table"), "Ta-ble")
+        self.assertEqual(hyphenator.positions("on"), ())
+        data = parsePatterns("UTF-8\nLEFTHYPHENMIN 1\nRIGHTHYPHENMIN 3\nNOHYPHEN -\n.hy1p\n1tio\n")
+        self.assertEqual(data["leftMin"], 1)
+        self.assertEqual(data["rightMin"], 3)
+        self.assertEqual(sorted(data["patterns"]), [".hyp", "tio"])
+
+    def test_installHyphenationPatterns(self):
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, "hyph-test.tex")
+            # a single break point no english dictionary would give: "hyphena-tion"
+            patterns = "\\patterns{ .hyphena1t }"
+            with open(path, "w") as f:
+                f.write(patterns)
+            drawBot.installHyphenationPatterns("en", path)
+            try:
+                self.assertIsNotNone(getHyphenator("en-US"))
+                # the compiled patterns are reused
+                self.assertEqual(loadPatterns(path), parsePatterns(patterns))
+                drawBot.newDrawing()
+                drawBot.language("en")
+                drawBot.hyphenation(True)
+                drawBot.fontSize(30)
+                # room for "hyphena-" but not for the whole word
+                width = drawBot.textSize("hyphena-")[0] + 2
+                box = (0, 0, width, 200)
+                drawBot.textBox("hyphenation", box)
+                context = drawBot._drawBotDrawingTool._dummyContext
+                boxPath = drawBot.BezierPath()
+                boxPath.rect(*box)
+                hyphenated = context.hyphenateAttributedString(
+                    context.attributedString("hyphenation"), boxPath._getCGPath()
+                )
+                self.assertTrue(hyphenated.string().startswith("hyphena-"))
+            finally:
+                drawBot.uninstallHyphenationPatterns("en")
+            self.assertIsNone(getHyphenator("en"))
+        with self.assertRaises(DrawBotError):
+            drawBot.installHyphenationPatterns("en", "/not/a/pattern/file.dic")
+
+    def test_fontIndex(self):
+        ttfPath = os.path.join(testDataDir, "MutatorSans.ttf")
+        ttcPath = os.path.join(testDataDir, "MutatorSans.ttc")
+        with tempfile.TemporaryDirectory() as tempDir:
+            indexFolder = fontIndex.fontIndexFolder
+            fontIndex.fontIndexFolder = tempDir
+            try:
+                fontIndex._getFontRecords.cache_clear()
+                fontInfo = fontIndex.getFontInfo(ttfPath)
+                self.assertEqual(len(os.listdir(tempDir)), 1)
+                self.assertEqual(fontInfo["psName"], "MutatorMathTest-LightCondensed")
+                # only the names are read up front, other values when requested
+                self.assertEqual(sorted(fontInfo._record), ["psName", "psNames"])
+                self.assertEqual(fontInfo["aatFeatures"], [])
+                self.assertNotIn("glyphOrder", fontInfo._record)
+                self.assertEqual(fontInfo["featureTags"], ["kern", "rvrn"])
+                self.assertEqual([axis[0] for axis in fontInfo["axes"]], ["wdth", "wght"])
+                self.assertEqual(fontInfo["namedInstances"][1], {"wdth": 0.0, "wght": 1000.0})
+                self.assertEqual(fontInfo["glyphOrder"], TTFont(ttfPath).getGlyphOrder())
+                self.assertEqual(
+                    fontIndex.unicodesFromRanges(fontInfo["cmapRanges"]), sorted(TTFont(ttfPath).getBestCmap())
+                )
+                # a next run reads the index file
+                fontIndex._getFontRecords.cache_clear()
+                self.assertEqual(fontIndex.getFontInfo(ttfPath), fontInfo)
+                fontIndex.setFontInfoValue(ttfPath, 0, "test", [1, 2])
+                fontIndex._getFontRecords.cache_clear()
+                self.assertEqual(fontIndex.getFontInfo(ttfPath)["test"], [1, 2])
+                self.assertEqual(fontIndex.getFontInfo(ttcPath, 1)["psName"], "MutatorMathTest-LightWide")
+                self.assertEqual(
+                    fontIndex.findFontInfo(ttcPath, "MutatorMathTest-BoldWide"), fontIndex.getFontInfo(ttcPath, 3)
+                )
+                self.assertIsNone(fontIndex.findFontInfo(ttcPath, "foo"))
+                with self.assertRaises(IndexError):
+                    fontIndex.getFontInfo(ttcPath, 4)
+            finally:
+                fontIndex.fontIndexFolder = indexFolder
+                fontIndex._getFontRecords.cache_clear()
+
+    def test_coverageIndex(self):
+        ttfPath = os.path.join(testDataDir, "MutatorSans.ttf")
+        ttcPath = os.path.join(testDataDir, "MutatorSans.ttc")
+        coverageIndex = CoverageIndex.fromFontFiles([ttcPath, ttfPath, os.path.join(testDataDir, "nonExisting.ttf")])
+        # the first font of the ttf and the ttc have the same name
+        self.assertEqual(
+            coverageIndex.fontNames,
+            [
+                "MutatorMathTest-LightCondensed",
+                "MutatorMathTest-LightWide",
+                "MutatorMathTest-BoldCondensed",
+                "MutatorMathTest-BoldWide",
+            ],
+        )
+        self.assertEqual(coverageIndex.fontsForCharacters("ABC"), coverageIndex.fontNames)
+        self.assertEqual(coverageIndex.fontsForCharacters("a"), [])
+        self.assertTrue(coverageIndex.fontContainsCharacters("MutatorMathTest-BoldWide", "AB"))
+        self.assertFalse(coverageIndex.fontContainsCharacters("MutatorMathTest-BoldWide", "A\U0001f004"))
+        cmap = TTFont(ttfPath).getBestCmap()
+        coverage = FontCoverage.fromRanges(fontIndex.getFontInfo(ttfPath)["cmapRanges"])
+        self.assertEqual(len(coverage), len(cmap))
+        for value in range(0x300):
+            self.assertEqual(chr(value) in coverage, value in cmap)
+        # the cmap of an indexed font file is not read again
+        fontIndex._getFontRecords.cache_clear()
+        coverageIndex = CoverageIndex()
+        self.assertFalse(coverageIndex.addFontFile(ttfPath))
+        self.assertEqual(coverageIndex.fontNames, ["MutatorMathTest-LightCondensed"])
+
+    def test_fontContainsCharacters(self):
+        drawBot.newDrawing()
+        drawBot.font(os.path.join(testDataDir, "MutatorSans.ttf"))
+        self.assertTrue(drawBot.fontContainsCharacters("ABC"))
+        self.assertFalse(drawBot.fontContainsCharacters("a"))
+        self.assertIn("Helvetica", drawBot.installedFonts("Aa"))
+        self.assertNotIn("Helvetica", drawBot.installedFonts("\U0001f004"))
+
+    def test_variationFontCache(self):
+        drawBot.newDrawing()
+        fontPath = os.path.join(testDataDir, "MutatorSans.ttf")
+        txt = drawBot.FormattedString(font=fontPath, fontSize=20)
+        txt.append("A", fontVariations=dict(wght=500))
+        stats = drawBot.cacheStats()["variationFonts"]
+        # the same location clipped to the axis range
+        txt.append("A", fontVariations=dict(wght=2000), fontSize=20)
+        txt.append("A", fontVariations=dict(wght=3000), fontSize=20)
+        self.assertEqual(drawBot.cacheStats()["variationFonts"]["hits"], stats["hits"] + 1)
+        # appendGlyph shares the cache
+        txt.fontVariations(wght=500)
+        txt.appendGlyph("A")
+        txt.appendGlyph("B")
+        self.assertGreaterEqual(drawBot.cacheStats()["variationFonts"]["hits"], stats["hits"] + 2)
+
+        font = drawBot.context.baseContext.getNSFontFromNameOrPath(fontPath, 20, 0)
+        self.assertIs(
+            variation.getVariationFont(font, dict(wght=500), 20),
+            variation.getVariationFont(font, dict(wght=500), 20),
+        )
+        # axis values are only rounded on request
+        self.assertIsNot(
+            variation.getVariationFont(font, dict(wght=500.2), 20),
+            variation.getVariationFont(font, dict(wght=499.9), 20),
+        )
+        self.assertEqual(variation.quantizeVariations(dict(wght=500.2, wdth=12), 10), dict(wght=500, wdth=10))
+        txt = drawBot.FormattedString(font=fontPath, fontSize=20)
+        self.assertEqual(txt.fontVariations(wght=499.9, quantization=10)["wght"], 500)
+        # the rounded location is recorded, equal rounded locations give the same drawing instructions
+        drawBot.newDrawing()
+        drawBot.font(fontPath)
+        self.assertEqual(drawBot.fontVariations(wght=500.2, quantization=10)["wght"], 500)
+        drawBot.fontVariations(wght=499.9, quantization=10)
+        instructionSet = drawBot._drawBotDrawingTool._instructionsStack[-1]
+        recorded = [kwargs for callback, args, kwargs in instructionSet if callback == "fontVariations"]
+        self.assertEqual(recorded, [dict(resetVariations=False, wght=500), dict(resetVariations=False, wght=500)])
+
+    def test_glyphOutlines(self):
+        # the fontTools reader of glyph outlines, it doesn't use AppKit
+        fontPath = os.path.join(testDataDir, "MutatorSans.ttf")
+        glyphID = TTFont(fontPath).getGlyphID("A")
+        outline = glyphOutlines.getGlyphOutline(fontPath, glyphID)
+        self.assertEqual(outline.bounds(), (20.0, 0.0, 376.0, 700.0))
+        self.assertIs(glyphOutlines.getGlyphOutline(fontPath, glyphID), outline)
+        boldOutline = glyphOutlines.getGlyphOutline(fontPath, glyphID, location=dict(wght=1000))
+        self.assertEqual(boldOutline.bounds(), (-10.0, 0.0, 730.0, 800.0))
+        # a font of a collection
+        ttcPath = os.path.join(testDataDir, "MutatorSans.ttc")
+        ttcGlyphID = TTFont(ttcPath, fontNumber=3).getGlyphID("A")
+        self.assertEqual(
+            glyphOutlines.getGlyphOutline(ttcPath, ttcGlyphID, fontNumber=3).bounds(), (20.0, 0.0, 1270.0, 800.0)
+        )
+        # an outline in font units, placed at a font size and a position
+        pathData = PathData()
+        pathData.moveTo(0, 0)
+        pathData.lineTo(5, 5)
+        glyphOutlines.placeGlyphOutline(pathData, outline, 100, glyphOutlines.getUnitsPerEm(fontPath), 10, 20)
+        self.assertEqual(pathData.bounds(), (0.0, 0.0, 47.6, 90.0))
+        self.assertEqual(len(pathData), len(outline) + 2)
+        # the cached outline itself doesn't change
+        self.assertEqual(outline.bounds(), (20.0, 0.0, 376.0, 700.0))
+        glyphOutlines.placeGlyphOutline(pathData, PathData(), 100, 1000, 10, 20)
+        self.assertEqual(len(pathData), len(outline) + 2)
+        glyphOutlines.clearGlyphOutlines()
+        self.assertIsNot(glyphOutlines.getGlyphOutline(fontPath, glyphID), outline)
+
+        drawBot.newDrawing()
+        hits = drawBot.cacheStats()["glyphOutlines"]["hits"]
+        path = drawBot.BezierPath()
+        path.text("A", font=fontPath, fontSize=1000)
+        self.assertEqual(path.bounds(), (20.0, 0.0, 376.0, 700.0))
+        path = drawBot.BezierPath()
+        path.text("A", font=fontPath, fontSize=100, offset=(10, 20))
+        self.assertEqual(path.bounds(), (12.0, 20.0, 47.6, 90.0))
+        self.assertEqual(drawBot.cacheStats()["glyphOutlines"]["hits"], hits + 1)
+
     def test_reloadFont(self):
         src = pathlib.Path(__file__).resolve().parent / "data" / "MutatorSans.ttf"
         assert src.exists()